@@ -1,18 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.security import HTTPDigest, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.core.deps import get_db
-from app.core.security import verify_digest_auth, generate_digest_challenge
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.security import StaleNonceError, verify_digest_auth, generate_digest_challenge
+from app.db.session import get_async_db
 from app.services import user_service
 from app.schemas.user import UserResponse
 
 router = APIRouter(prefix="/api/sonicos/auth", tags=["auth"])
 security = HTTPDigest()
 
+async def authenticate(credentials: HTTPAuthorizationCredentials, db: AsyncSession):
+    """
+    The user behind the credentials, or a 401 carrying a fresh challenge
+    (marked stale when only the nonce needs replacing, so clients retry
+    without prompting for the password again).
+    """
+    try:
+        user = await verify_digest_auth(credentials, db)
+        stale = False
+    except StaleNonceError:
+        user = None
+        stale = True
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": await generate_digest_challenge(stale=stale)}
+        )
+    return user
+
 @router.post("/", response_model=UserResponse)
 async def login(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Login endpoint using RFC-7616 HTTP Digest Access Authentication.
@@ -20,16 +40,11 @@ async def login(
     if not credentials:
         response = Response(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            headers={"WWW-Authenticate": generate_digest_challenge()}
+            headers={"WWW-Authenticate": await generate_digest_challenge()}
         )
         return response
 
-    user = verify_digest_auth(credentials, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
+    user = await authenticate(credentials, db)
 
     if not user.is_admin:
         raise HTTPException(
@@ -37,36 +52,30 @@ async def login(
             detail="Only administrators are allowed"
         )
 
-    # Check if another admin is already logged in
-    if user_service.is_another_admin_logged_in(db, user.id):
+    # Create the session unless another admin is already logged in
+    session_id = await user_service.login_admin_session(db, user.id)
+    if session_id is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Another administrator is currently logged in"
         )
 
-    # Create session
-    session = user_service.create_session(db, user.id)
     return UserResponse(
         id=user.id,
         username=user.username,
         is_admin=user.is_admin,
-        session_id=session.id
+        session_id=session_id
     )
 
 @router.delete("/")
 async def logout(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Logout endpoint to terminate the current session.
     """
-    user = verify_digest_auth(credentials, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
+    user = await authenticate(credentials, db)
 
-    user_service.terminate_session(db, user.id)
+    await user_service.terminate_session(db, user.id)
     return {"detail": "Successfully logged out"} 
\ No newline at end of file
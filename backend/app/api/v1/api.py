@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, security
+from app.api.v1.endpoints import auth, security, logs, metrics, events, appliances, fleet
 
 api_router = APIRouter()
 
@@ -8,4 +8,9 @@ async def root():
     return {"message": "SonicWall API"}
 
 api_router.include_router(auth.router)
-api_router.include_router(security.router) 
\ No newline at end of file
+api_router.include_router(security.router)
+api_router.include_router(logs.router)
+api_router.include_router(metrics.router)
+api_router.include_router(events.router)
+api_router.include_router(appliances.router)
+api_router.include_router(fleet.router) 
\ No newline at end of file
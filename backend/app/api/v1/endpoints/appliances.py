@@ -0,0 +1,44 @@
+from typing import List
+from anyio import from_thread
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.deps import check_auth
+from app.db.session import get_db
+from app.schemas.appliance import ApplianceCreate, ApplianceResponse
+from app.services import appliance_service
+
+router = APIRouter(
+    prefix="/appliances",
+    tags=["appliances"],
+    dependencies=[Depends(check_auth)]
+)
+
+@router.get("", response_model=List[ApplianceResponse])
+def list_appliances(db: Session = Depends(get_db)):
+    """List the registered firewalls (credentials are never returned)."""
+    return appliance_service.list_appliances(db)
+
+# Registry writes use the sync session, so these routes run in the
+# threadpool and hand the session manager refresh back to the event loop
+
+@router.post("", response_model=ApplianceResponse, status_code=status.HTTP_201_CREATED)
+def create_appliance(appliance: ApplianceCreate, db: Session = Depends(get_db)):
+    """Register a firewall; it is available to fleet queries immediately."""
+    try:
+        created = appliance_service.create_appliance(db, appliance)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Appliance {appliance.name} already exists"
+        )
+    from_thread.run(appliance_service.refresh_appliances)
+    return created
+
+@router.delete("/{name}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_appliance(name: str, db: Session = Depends(get_db)):
+    """Remove a firewall from the registry and log out of it."""
+    if not appliance_service.delete_appliance(db, name):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Appliance not found")
+    from_thread.run(appliance_service.refresh_appliances)
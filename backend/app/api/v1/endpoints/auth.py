@@ -1,55 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
 from app.core.deps import get_sonicwall_client
 from app.clients.sonicwall import SonicWallClient
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# The management session is shared by every request and owned by
+# SonicWallSessionManager, which logs in on demand, re-authenticates when
+# the firewall expires it and logs out at shutdown. These endpoints never
+# start or end it themselves.
+
 @router.post("/login")
 async def login(client: SonicWallClient = Depends(get_sonicwall_client)):
     """
-    Authenticate with the SonicWall device and start a management session.
+    Check that a management session with the SonicWall device is available,
+    starting the shared one if needed.
     
     Returns:
         dict: Authentication success message
         
     Raises:
-        HTTPException: If authentication fails
+        HTTPException: If authentication fails (raised by the dependency)
     """
-    try:
-        auth_success = await client.authenticate()
-        if not auth_success:
-            raise HTTPException(
-                status_code=401,
-                detail="Authentication failed"
-            )
-        return {"message": "Successfully authenticated"}
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Authentication error: {str(e)}"
-        )
+    return {"message": "Successfully authenticated"}
 
 @router.delete("/logout")
-async def logout(client: SonicWallClient = Depends(get_sonicwall_client)):
+async def logout():
     """
-    End the current management session.
+    Kept for API compatibility. The shared management session stays open
+    for other requests and is closed when the application shuts down.
     
     Returns:
         dict: Logout success message
-        
-    Raises:
-        HTTPException: If session termination fails
     """
-    try:
-        logout_success = await client.close_session()
-        if not logout_success:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to terminate session"
-            )
-        return {"message": "Successfully logged out"}
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Logout error: {str(e)}"
-        ) 
\ No newline at end of file
+    return {"message": "Successfully logged out"}
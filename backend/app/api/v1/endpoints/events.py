@@ -0,0 +1,71 @@
+import asyncio
+import json
+from typing import AsyncIterator, FrozenSet, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.deps import check_auth
+from app.services.event_broker import event_broker
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+    dependencies=[Depends(check_auth)]
+)
+
+def _split(value: Optional[str], upper: bool = False) -> FrozenSet[str]:
+    if not value:
+        return frozenset()
+    return frozenset((v.strip().upper() if upper else v.strip()) for v in value.split(",") if v.strip())
+
+async def _sse_stream(request: Request, **filters: FrozenSet[str]) -> AsyncIterator[str]:
+    # Subscribed only once the body is streamed, so a response that is
+    # never iterated leaves no queue behind in the broker
+    subscription = event_broker.subscribe(**filters)
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.EVENT_STREAM_KEEPALIVE
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                break
+            lagged = subscription.take_lagged()
+            if lagged:
+                yield f"event: lagged\ndata: {json.dumps({'dropped': lagged})}\n\n"
+            yield f"id: {event.id}\nevent: {event.type}\ndata: {event.payload}\n\n"
+    finally:
+        event_broker.unsubscribe(subscription)
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    types: Optional[str] = Query(None, description="Comma-separated: log, status"),
+    severity: Optional[str] = Query(None, description="Log severities, e.g. ALERT,NOTICE"),
+    category: Optional[str] = Query(None, description="Log categories"),
+    section: Optional[str] = Query(None, description="Status sections, e.g. services,gateway_av")
+):
+    """
+    Server-sent events for newly ingested logs (`log`) and status changes
+    (`status`), filtered server-side. Events come from the background
+    collectors, so open streams add no load on the firewall. A consumer
+    that falls behind loses the oldest events and receives a `lagged`
+    event with the number dropped.
+    """
+    stream = _sse_stream(
+        request,
+        types=_split(types),
+        severities=_split(severity, upper=True),
+        categories=_split(category),
+        sections=_split(section)
+    )
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
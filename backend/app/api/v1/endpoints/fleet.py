@@ -0,0 +1,53 @@
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from app.clients.session_manager import sonicwall_sessions
+from app.clients.sonicwall import STATUS_METHODS
+from app.core.config import settings
+from app.core.deps import check_auth
+from app.schemas.appliance import FleetResult
+from app.services.appliance_service import registered_appliances
+from app.services.fleet_service import fan_out
+
+router = APIRouter(
+    prefix="/fleet",
+    tags=["fleet"],
+    dependencies=[Depends(check_auth)]
+)
+
+async def _stream_results(appliances, section: str) -> AsyncIterator[str]:
+    async for result in fan_out(
+        sonicwall_sessions,
+        appliances,
+        section,
+        concurrency=settings.FLEET_CONCURRENCY,
+        timeout=settings.FLEET_TIMEOUT
+    ):
+        yield FleetResult(**result).model_dump_json(exclude_none=True) + "\n"
+
+@router.get("/{section}")
+async def get_fleet_status(
+    section: str,
+    appliances: Optional[str] = Query(None, description="Comma-separated names; all registered if omitted")
+):
+    """
+    Read one status section (e.g. gateway_av for signature database age)
+    from every appliance at once. Results are streamed as NDJSON, one
+    FleetResult per line in completion order, so an unreachable site only
+    delays its own line.
+    """
+    if section not in STATUS_METHODS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown section: {section}")
+
+    registered = [name for name in await registered_appliances() if name]
+    selected = registered
+    if appliances:
+        selected = [name.strip() for name in appliances.split(",") if name.strip()]
+        unknown = set(selected) - set(registered)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown appliances: {', '.join(sorted(unknown))}"
+            )
+
+    return StreamingResponse(_stream_results(selected, section), media_type="application/x-ndjson")
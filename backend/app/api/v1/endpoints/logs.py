@@ -0,0 +1,140 @@
+import json
+from datetime import datetime
+from typing import Iterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from app.core.config import settings
+from app.core.deps import check_auth
+from app.core.encoding import json_default
+from app.db.session import SessionLocal
+from app.schemas.logs import LogPage
+from app.services.log_export import EXPORT_FORMATS, export_rows, gzip_stream, parquet_available
+from app.services.log_query import (
+    InvalidLogQuery,
+    LogQuery,
+    build_log_select,
+    encode_cursor,
+    iter_log_rows
+)
+
+router = APIRouter(
+    prefix="/logs",
+    tags=["logs"],
+    dependencies=[Depends(check_auth)]
+)
+
+MAX_PAGE_SIZE = 1000
+
+def _stream_page(statement: Select, fields: List[str], limit: int) -> Iterator[str]:
+    """
+    Write a LogPage as it is read from the database. The session is opened
+    here rather than via Depends so it stays open while the body streams.
+    """
+    next_cursor = None
+    with SessionLocal() as db:
+        yield '{"items":['
+        previous = None
+        for index, row in enumerate(iter_log_rows(db, statement, batch_size=min(limit + 1, MAX_PAGE_SIZE))):
+            if index == limit:
+                next_cursor = encode_cursor(previous)
+                break
+            item = json.dumps({name: row[name] for name in fields}, default=json_default)
+            yield f",{item}" if index else item
+            previous = row
+    yield f'],"next_cursor":{json.dumps(next_cursor)}}}'
+
+def _stream_export(statement: Select, fields: List[str], export_format: str, compress: bool) -> Iterator[bytes]:
+    with SessionLocal() as db:
+        rows = iter_log_rows(db, statement, batch_size=settings.LOG_EXPORT_CHUNK_SIZE)
+        chunks = export_rows(rows, fields, export_format, settings.LOG_EXPORT_CHUNK_SIZE)
+        if compress:
+            chunks = gzip_stream(chunks)
+        yield from chunks
+
+async def get_log_query(
+    time_range: Optional[str] = Query(None, alias="range", description="1h, 24h, 7d or 30d"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    severity: Optional[str] = Query(None, description="Comma-separated, e.g. ALERT,NOTICE"),
+    category: Optional[str] = Query(None, description="Comma-separated categories"),
+    appliance: Optional[str] = None,
+    src_ip: Optional[str] = None,
+    dst_ip: Optional[str] = None,
+    port: Optional[int] = Query(None, description="Matches source or destination port"),
+    application: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Full-text search over message and notes"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return")
+) -> LogQuery:
+    """Log filters shared by the query and export endpoints."""
+    try:
+        return LogQuery.from_params(
+            time_range=time_range,
+            start=start,
+            end=end,
+            fields=fields,
+            severities=severity,
+            categories=category,
+            appliance=appliance,
+            src_ip=src_ip,
+            dst_ip=dst_ip,
+            port=port,
+            application=application,
+            search=q
+        )
+    except InvalidLogQuery as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("", response_model=LogPage)
+async def list_logs(
+    query: LogQuery = Depends(get_log_query),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)
+):
+    """
+    Query stored firewall logs, newest first, with keyset pagination.
+    Pass `next_cursor` back as `cursor` to fetch the following page.
+    """
+    try:
+        statement = build_log_select(query, cursor).limit(limit + 1)
+    except InvalidLogQuery as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return StreamingResponse(
+        _stream_page(statement, query.fields, limit),
+        media_type="application/json"
+    )
+
+@router.get("/export")
+async def export_logs(
+    query: LogQuery = Depends(get_log_query),
+    export_format: str = Query("csv", alias="format", description="csv, ndjson or parquet"),
+    gzip: bool = Query(False, description="Gzip the stream as it is written")
+):
+    """
+    Export every log matching the filters as CSV, NDJSON or Parquet.
+    Rows are streamed from a server-side cursor in chunks, so memory use
+    doesn't grow with the size of the export.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown export format: {export_format}"
+        )
+    if export_format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export requires pyarrow"
+        )
+
+    media_type, extension = EXPORT_FORMATS[export_format]
+    filename = f"logs.{extension}" + (".gz" if gzip else "")
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        _stream_export(build_log_select(query), query.fields, export_format, gzip),
+        media_type=media_type,
+        headers=headers
+    )
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.deps import check_auth
+from app.db.session import get_db
+from app.schemas.metrics import MetricSeries
+from app.services.log_query import TIME_RANGES, as_utc
+from app.services.metrics_service import (
+    GRANULARITIES,
+    METRIC_KINDS,
+    choose_granularity,
+    get_metric_series
+)
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(check_auth)]
+)
+
+@router.get("/{metric}", response_model=MetricSeries)
+def read_metric(
+    metric: str,
+    time_range: Optional[str] = Query("24h", alias="range", description="1h, 24h, 7d or 30d"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: Optional[str] = Query(None, description="1m, 1h or 1d; picked from the range if omitted"),
+    appliance: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Time series for a dashboard metric, read from the pre-aggregated
+    rollups rather than raw logs. Without `granularity` the finest rollup
+    that keeps the series within METRICS_MAX_POINTS buckets is used; a
+    requested granularity that would exceed it is rejected.
+    """
+    if metric not in METRIC_KINDS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown metric: {metric}")
+    if granularity is not None and granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown granularity: {granularity}"
+        )
+
+    start = as_utc(start)
+    end = as_utc(end) or datetime.now(timezone.utc)
+    if start is None:
+        if time_range not in TIME_RANGES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown time range: {time_range}"
+            )
+        start = end - TIME_RANGES[time_range]
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+
+    # Explicit requests get the same bound as the automatic choice
+    allowed = choose_granularity(start, end, settings.METRICS_MAX_POINTS)
+    buckets = (end - start) / GRANULARITIES[granularity or allowed][0]
+    if granularity is None:
+        granularity = allowed
+    elif granularity != allowed and buckets > settings.METRICS_MAX_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=(
+                f"Granularity {granularity} exceeds {settings.METRICS_MAX_POINTS} points "
+                f"for this range; use {allowed} or a shorter range"
+            )
+        )
+    points = get_metric_series(db, metric, start, end, granularity, appliance)
+    return MetricSeries(metric=metric, granularity=granularity, start=start, end=end, points=points)
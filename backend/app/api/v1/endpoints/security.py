@@ -1,13 +1,22 @@
-from fastapi import APIRouter, Depends
-from app.clients.sonicwall import SonicWallClient
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.deps import get_sonicwall_client, check_auth
+from app.db.session import get_db
+from app.services import security_service
+from app.services.log_query import as_utc
+from app.services.status_history import HISTORY_SECTIONS, get_status_history
+from app.schemas.status_history import StatusHistoryResponse
 from app.schemas.security import (
     SecurityServicesStatus,
     GatewayAntiVirusStatus,
     IntrusionPreventionStatus,
     BotnetStatus,
     AntiSpywareStatus,
-    ContentFilteringStatus
+    ContentFilteringStatus,
+    SecurityOverview
 )
 
 router = APIRouter(
@@ -16,44 +25,74 @@ router = APIRouter(
     dependencies=[Depends(check_auth)]
 )
 
+# Status reads are served from the background collector's snapshots; the
+# firewall is only contacted (via get_sonicwall_client) before the first poll.
+
+@router.get("/overview", response_model=SecurityOverview)
+async def get_security_overview():
+    """
+    Get every security status section in one call.
+    Sections are read concurrently; per-section errors and timings are
+    reported under `sections`.
+    """
+    return await security_service.get_security_overview(get_sonicwall_client)
+
 @router.get("/services/status", response_model=SecurityServicesStatus)
-async def get_security_services_status(
-    client: SonicWallClient = Depends(get_sonicwall_client)
-):
+async def get_security_services_status():
     """Get the status of all security services."""
-    return await client.get_security_services_status()
+    return await security_service.read_status("services", get_sonicwall_client)
 
 @router.get("/gateway-av/status", response_model=GatewayAntiVirusStatus)
-async def get_gateway_av_status(
-    client: SonicWallClient = Depends(get_sonicwall_client)
-):
+async def get_gateway_av_status():
     """Get Gateway Anti-Virus status."""
-    return await client.get_gateway_av_status()
+    return await security_service.read_status("gateway_av", get_sonicwall_client)
 
 @router.get("/ips/status", response_model=IntrusionPreventionStatus)
-async def get_intrusion_prevention_status(
-    client: SonicWallClient = Depends(get_sonicwall_client)
-):
+async def get_intrusion_prevention_status():
     """Get Intrusion Prevention status."""
-    return await client.get_intrusion_prevention_status()
+    return await security_service.read_status("ips", get_sonicwall_client)
 
 @router.get("/botnet/status", response_model=BotnetStatus)
-async def get_botnet_status(
-    client: SonicWallClient = Depends(get_sonicwall_client)
-):
+async def get_botnet_status():
     """Get Botnet Filter status."""
-    return await client.get_botnet_status()
+    return await security_service.read_status("botnet", get_sonicwall_client)
 
 @router.get("/anti-spyware/status", response_model=AntiSpywareStatus)
-async def get_anti_spyware_status(
-    client: SonicWallClient = Depends(get_sonicwall_client)
-):
+async def get_anti_spyware_status():
     """Get Anti-Spyware status."""
-    return await client.get_anti_spyware_status()
+    return await security_service.read_status("anti_spyware", get_sonicwall_client)
 
 @router.get("/content-filtering/status", response_model=ContentFilteringStatus)
-async def get_content_filtering_status(
-    client: SonicWallClient = Depends(get_sonicwall_client)
-):
+async def get_content_filtering_status():
     """Get Content Filtering status."""
-    return await client.get_content_filtering_status() 
\ No newline at end of file
+    return await security_service.read_status("content_filtering", get_sonicwall_client)
+
+# History paths use the same section names as the status paths above
+HISTORY_PATHS = {section.replace("_", "-"): section for section in HISTORY_SECTIONS}
+
+@router.get("/{section_path}/history", response_model=StatusHistoryResponse)
+def get_status_history_endpoint(
+    section_path: str,
+    appliance: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    field: Optional[str] = Query(None, description="Only changes to this field, e.g. signature_database"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Recorded changes of a status section, newest first. A change is stored
+    only when the polled status differs from the previous one, so e.g.
+    `/ips/history?field=signature_database&limit=1` gives the time of the
+    last IPS signature update.
+    """
+    section = HISTORY_PATHS.get(section_path)
+    if section is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No history for: {section_path}")
+    start, end = as_utc(start), as_utc(end)
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+
+    appliance = appliance or settings.SONICWALL_HOST
+    changes = get_status_history(db, appliance, section, start, end, field, limit)
+    return StatusHistoryResponse(appliance=appliance, section=section, changes=changes)
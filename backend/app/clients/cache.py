@@ -0,0 +1,134 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from app.core.metrics import CACHE_REQUESTS
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    fetched_at: float  # time.monotonic() of the upstream fetch
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache for SonicOS reporting responses.
+
+    - Entries are fresh for a per-endpoint TTL (keyed by the first element
+      of the cache key, e.g. "botnet").
+    - Expired entries are still served for `stale_ttl` seconds while a
+      single background refresh runs (stale-while-revalidate).
+    - Concurrent misses for the same key share one upstream call.
+    - Failed fetches (None) are never cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 30.0,
+        ttls: Optional[Dict[str, float]] = None,
+        stale_ttl: float = 300.0
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def ttl_for(self, key: Hashable) -> float:
+        endpoint = key[0] if isinstance(key, tuple) else key
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the cached entry regardless of age, without fetching."""
+        return self._entries.get(key)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries."""
+        self._entries[key] = CacheEntry(value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or everything when no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        endpoint = key[0] if isinstance(key, tuple) else key
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = entry.age()
+            ttl = self.ttl_for(key)
+            if age < ttl:
+                CACHE_REQUESTS.labels(endpoint, "hit").inc()
+                return entry.value
+            if age < ttl + self.stale_ttl:
+                CACHE_REQUESTS.labels(endpoint, "stale").inc()
+                self._refresh(key, fetch)
+                return entry.value
+
+        CACHE_REQUESTS.labels(endpoint, "miss").inc()
+        # Shield the shared task so one cancelled caller doesn't cancel it
+        # for everyone else waiting on the same key
+        return await asyncio.shield(self._refresh(key, fetch))
+
+    async def refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Fetch upstream now (joining any in-flight load) and store the result."""
+        return await asyncio.shield(self._refresh(key, fetch))
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, fetch))
+            self._inflight[key] = task
+        return task
+
+    async def _load(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+            if value is not None:
+                self.put(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+def cached(endpoint: str):
+    """
+    Serve a SonicWallClient method through the client's ResponseCache.
+    Clients without a cache call straight through; `refresh=True` skips the
+    cached value but still stores the new one. While the client's circuit
+    breaker is open, the last cached value is served whatever its age.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, refresh: bool = False, **kwargs):
+            cache: Optional[ResponseCache] = getattr(self, "cache", None)
+            if cache is None:
+                return await method(self, *args, **kwargs)
+            key = (endpoint, *args, *sorted(kwargs.items()))
+            fetch = lambda: method(self, *args, **kwargs)
+            if refresh:
+                CACHE_REQUESTS.labels(endpoint, "refresh").inc()
+                return await cache.refresh(key, fetch)
+            breaker = getattr(self, "breaker", None)
+            if breaker is not None and breaker.is_open:
+                entry = cache.get_entry(key)
+                if entry is not None:
+                    CACHE_REQUESTS.labels(endpoint, "circuit_open").inc()
+                    return entry.value
+            return await cache.get_or_fetch(key, fetch)
+        return wrapper
+    return decorator
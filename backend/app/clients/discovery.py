@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Candidate paths for reporting endpoints whose location differs between
+# SonicOS firmware versions, in probing order
+ENDPOINT_CANDIDATES: Dict[str, List[str]] = {
+    "content_filtering": [
+        "/api/sonicos/content-filtering/status",
+        "/api/sonicos/reporting/content-filtering",
+        "/api/sonicos/cfs/status",
+        "/api/sonicos/security-services/content-filtering"
+    ],
+    "geo_ip": [
+        "/api/sonicos/reporting/geo-ip/status",
+        "/api/sonicos/geo-ip/status"
+    ],
+}
+
+# Status codes meaning "this path doesn't exist on this firmware"; anything
+# else (5xx, timeouts) is treated as transient and never remembered
+NOT_AVAILABLE_STATUSES = {400, 404, 405, 501}
+
+
+class EndpointDiscovery:
+    """
+    Remembers which candidate path answers for a capability, per appliance
+    and firmware version, so probing happens once instead of on every call.
+
+    Positive results are optionally persisted to a JSON file so they survive
+    restarts. Capabilities with no working path are remembered in memory for
+    `negative_ttl` seconds before being probed again.
+    """
+
+    def __init__(self, store_path: str = "", negative_ttl: float = 3600.0):
+        self.store_path = store_path
+        self.negative_ttl = negative_ttl
+        self._paths: Dict[str, str] = {}
+        self._unavailable: Dict[str, float] = {}
+        self._load()
+
+    @staticmethod
+    def _key(appliance: str, firmware: str, capability: str) -> str:
+        return f"{appliance}|{firmware}|{capability}"
+
+    def lookup(self, appliance: str, firmware: str, capability: str) -> Tuple[Optional[str], bool]:
+        """
+        Return (path, known_unavailable) for a capability.
+        A None path with known_unavailable False means it must be probed.
+        """
+        key = self._key(appliance, firmware, capability)
+        path = self._paths.get(key)
+        if path is not None:
+            return path, False
+        checked_at = self._unavailable.get(key)
+        if checked_at is not None and time.monotonic() - checked_at < self.negative_ttl:
+            return None, True
+        return None, False
+
+    def remember(self, appliance: str, firmware: str, capability: str, path: Optional[str]) -> None:
+        """Record the working path, or None when no candidate answered."""
+        key = self._key(appliance, firmware, capability)
+        if path is None:
+            self._paths.pop(key, None)
+            self._unavailable[key] = time.monotonic()
+        else:
+            self._unavailable.pop(key, None)
+            if self._paths.get(key) == path:
+                return
+            self._paths[key] = path
+        self._save()
+
+    def forget(self, appliance: str, firmware: str, capability: str) -> None:
+        key = self._key(appliance, firmware, capability)
+        self._unavailable.pop(key, None)
+        if self._paths.pop(key, None) is not None:
+            self._save()
+
+    def _load(self) -> None:
+        if not self.store_path or not os.path.exists(self.store_path):
+            return
+        try:
+            with open(self.store_path) as f:
+                self._paths = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable endpoint cache %s", self.store_path)
+
+    def _save(self) -> None:
+        if not self.store_path:
+            return
+        tmp_path = f"{self.store_path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._paths, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.store_path)
+        except OSError:
+            logger.warning("Could not persist endpoint cache to %s", self.store_path)
+
+
+endpoint_discovery = EndpointDiscovery(
+    store_path=settings.SONICWALL_ENDPOINT_CACHE_FILE,
+    negative_ttl=settings.SONICWALL_ENDPOINT_RETRY_INTERVAL
+)
@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# SonicOS log priority -> dashboard severity (see SONICWALL_API.md)
+PRIORITY_TO_SEVERITY = {
+    "ALERT": "ALERT",
+    "CRITICAL": "ALERT",
+    "ERROR": "ALERT",
+    "WARNING": "NOTICE",
+    "NOTICE": "NOTICE",
+    "INFO": "INFORMATION",
+    "INFORMATION": "INFORMATION",
+    None: "INFORMATION"
+}
+
+LOG_TIME_FORMAT = "UTC %m/%d/%Y %H:%M:%S"    # "time" field of log entries
+QUERY_TIME_FORMAT = "%Y-%m-%d-%H-%M-%S"      # startTime/endTime parameters
+
+# Log entry fields copied as-is; trailing underscores are dropped
+LOG_FIELDS = {
+    "category": "category",
+    "src_int_": "src_int",
+    "dst_int_": "dst_int",
+    "src_ip": "src_ip",
+    "src_port": "src_port",
+    "dst_ip": "dst_ip",
+    "dst_port": "dst_port",
+    "ip_protocol": "ip_protocol",
+    "user_name": "user_name",
+    "application": "application",
+    "notes": "notes",
+    "message": "message",
+}
+
+
+def parse_log_time(value: Optional[str]) -> Optional[datetime]:
+    """Parse "UTC MM/DD/YYYY HH:MM:SS[.fff]" into a timezone-aware datetime."""
+    if not value:
+        return None
+    value = value.split(".", 1)[0]
+    try:
+        return datetime.strptime(value, LOG_TIME_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def format_query_time(value: datetime) -> str:
+    """Format a datetime for the startTime/endTime query parameters (UTC)."""
+    return value.astimezone(timezone.utc).strftime(QUERY_TIME_FORMAT)
+
+
+def normalize_log_entry(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Convert a raw log entry into the stored form in a single pass: parsed
+    timestamp, severity from priority, and renamed fields. Entries without
+    a numeric id or a parseable time are dropped (None).
+    """
+    try:
+        log_id = int(entry.get("id"))
+    except (TypeError, ValueError):
+        logger.warning("Skipping log entry with invalid id %r", entry.get("id"))
+        return None
+    timestamp = parse_log_time(entry.get("time"))
+    if timestamp is None:
+        return None
+
+    priority = entry.get("priority")
+    event = {
+        "id": log_id,
+        "timestamp": timestamp,
+        "priority": priority,
+        "severity": PRIORITY_TO_SEVERITY.get(
+            priority.upper() if priority else None, "INFORMATION"
+        ),
+    }
+    for source, target in LOG_FIELDS.items():
+        event[target] = entry.get(source)
+    return event
+
+
+@dataclass
+class LogCheckpoint:
+    """
+    High-water mark of log collection for one appliance.
+
+    Ids seen within the overlap window are kept so the overlapping part of
+    the next window can be deduplicated; older ids are pruned, keeping
+    memory proportional to the overlap rather than the whole history.
+    """
+    high_water: Optional[datetime] = None
+    recent_ids: Dict[int, datetime] = field(default_factory=dict)
+
+    def accept(self, event: Dict[str, Any]) -> bool:
+        """Record an event, returning False if it was already collected."""
+        if event["id"] in self.recent_ids:
+            return False
+        self.recent_ids[event["id"]] = event["timestamp"]
+        if self.high_water is None or event["timestamp"] > self.high_water:
+            self.high_water = event["timestamp"]
+        return True
+
+    def prune(self, overlap: timedelta) -> None:
+        if self.high_water is not None:
+            self.prune_before(self.high_water - overlap)
+
+    def prune_before(self, horizon: datetime) -> None:
+        """Forget ids of events older than `horizon`."""
+        self.recent_ids = {
+            log_id: timestamp
+            for log_id, timestamp in self.recent_ids.items()
+            if timestamp >= horizon
+        }
+
+    def copy(self) -> "LogCheckpoint":
+        return LogCheckpoint(high_water=self.high_water, recent_ids=dict(self.recent_ids))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "high_water": self.high_water.isoformat() if self.high_water else None,
+            "recent_ids": {str(k): v.isoformat() for k, v in self.recent_ids.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LogCheckpoint":
+        high_water = data.get("high_water")
+        return cls(
+            high_water=datetime.fromisoformat(high_water) if high_water else None,
+            recent_ids={
+                int(k): datetime.fromisoformat(v)
+                for k, v in data.get("recent_ids", {}).items()
+            },
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LogCheckpoint":
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path: str) -> None:
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,131 @@
+import asyncio
+import random
+import time
+from typing import Optional
+
+# Statuses the firewall returns when it is busy or briefly unavailable
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Only requests without side effects are retried
+RETRYABLE_METHODS = {"GET", "HEAD"}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a firewall whose circuit is open."""
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for retry `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after(value: Optional[str], cap: float) -> Optional[float]:
+    """Seconds from a numeric Retry-After header, capped."""
+    try:
+        return min(cap, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Adaptive token-bucket rate limiter for one firewall.
+
+    Requests wait for a token; tokens refill at `rate` per second up to
+    `capacity`. When the firewall signals overload the rate is halved (down
+    to `min_rate`), and each healthy response adds back a tenth of the
+    configured rate, so our own traffic backs off while the box is busy.
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float, min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _fill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self.max_rate <= 0:
+            return
+        # Waiters queue on the lock, so tokens are handed out in order
+        async with self._lock:
+            self._fill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._fill()
+            self.tokens -= 1
+
+    def penalize(self) -> None:
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def reward(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class CircuitBreaker:
+    """
+    Fails fast after `failure_threshold` consecutive failed requests. After
+    `reset_timeout` seconds one trial request is let through (half-open):
+    success closes the circuit, failure opens it again. Callers that get a
+    trial must record its outcome or release() it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be rejected."""
+        state = self.state
+        return state == self.OPEN or (state == self.HALF_OPEN and self._trial_running)
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """
+        End a trial that finished without an outcome (cancelled, or failed
+        for a reason unrelated to the firewall's health), so the next call
+        can try again instead of the circuit staying rejected forever.
+        """
+        self._trial_running = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._trial_running = False
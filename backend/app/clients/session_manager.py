@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+from app.clients.sonicwall import ApplianceConfig, SonicWallClient
+
+logger = logging.getLogger(__name__)
+
+
+class SonicWallSessionManager:
+    """
+    Process-wide owner of the SonicWall management sessions, one client per
+    appliance.
+
+    Each appliance's client is shared by every request. It logs in on first
+    use, re-authenticates transparently when the firewall expires the
+    session, and is logged out once when the application shuts down.
+    Callers that don't name an appliance get the one configured through
+    SONICWALL_* settings.
+    """
+
+    def __init__(self, default: Optional[ApplianceConfig] = None):
+        default = default or ApplianceConfig.from_settings()
+        self.default_appliance = default.name
+        self._configs: Dict[str, ApplianceConfig] = {default.name: default}
+        self._clients: Dict[str, SonicWallClient] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def appliances(self) -> List[str]:
+        return list(self._configs)
+
+    def get_config(self, appliance: Optional[str] = None) -> Optional[ApplianceConfig]:
+        return self._configs.get(appliance or self.default_appliance)
+
+    async def get_client(self, appliance: Optional[str] = None) -> Optional[SonicWallClient]:
+        """
+        Return the shared client for `appliance` with a live management
+        session, or None if the appliance is unknown or rejected the login.
+        """
+        name = appliance or self.default_appliance
+        client = self._clients.get(name)
+        if client is None:
+            async with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    config = self._configs.get(name)
+                    if config is None:
+                        return None
+                    client = self._clients[name] = SonicWallClient(config)
+
+        if not await client.ensure_authenticated():
+            return None
+        return client
+
+    async def update(self, configs: Iterable[ApplianceConfig]) -> None:
+        """
+        Replace the registered appliances (the default one is kept).
+        Clients of removed or reconfigured appliances are logged out.
+        """
+        configs = {config.name: config for config in configs}
+        configs.setdefault(self.default_appliance, self._configs[self.default_appliance])
+        async with self._lock:
+            stale = [
+                self._clients.pop(name) for name in list(self._clients)
+                if configs.get(name) != self._configs.get(name)
+            ]
+            self._configs = configs
+        for client in stale:
+            await self._close_client(client)
+
+    async def release(self, appliance: str) -> None:
+        """Log out of one appliance, e.g. when another worker takes it over."""
+        async with self._lock:
+            client = self._clients.pop(appliance, None)
+        if client is not None:
+            await self._close_client(client)
+
+    async def _close_client(self, client: SonicWallClient) -> None:
+        try:
+            await client.close_session()
+        finally:
+            await client.aclose()
+
+    async def close(self) -> None:
+        """Log out of every management session."""
+        async with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await self._close_client(client)
+            except Exception:
+                logger.exception("Closing SonicWall session failed")
+
+
+sonicwall_sessions = SonicWallSessionManager()
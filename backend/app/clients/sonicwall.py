@@ -1,21 +1,301 @@
-import uuid
+import time
+import asyncio
+import logging
 import hashlib
-import requests
-from typing import Dict, Optional
+import httpx
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional
 from urllib.parse import urlparse
 from app.core.config import settings
-import urllib3
+from app.core.logging_config import redact_headers, truncate_body
+from app.core.tracing import start_span
+from app.core.metrics import (
+    AUTHENTICATIONS,
+    POOL_IN_USE,
+    POOL_MAX,
+    REAUTHENTICATIONS,
+    UPSTREAM_LATENCY,
+    track_circuit
+)
+from app.clients.cache import ResponseCache, cached
+from app.clients.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    TokenBucket,
+    RETRYABLE_METHODS,
+    RETRYABLE_STATUSES,
+    backoff_delay,
+    retry_after
+)
+from app.clients.logs import LogCheckpoint, normalize_log_entry, format_query_time
+from app.clients.discovery import (
+    EndpointDiscovery,
+    endpoint_discovery,
+    ENDPOINT_CANDIDATES,
+    NOT_AVAILABLE_STATUSES
+)
 import os
 
-# Disable SSL warnings when verify=False
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+logger = logging.getLogger(__name__)
+
+# Reporting status calls, keyed by the section name used across the API
+STATUS_METHODS = {
+    "services": "get_security_services_status",
+    "gateway_av": "get_gateway_av_status",
+    "ips": "get_intrusion_prevention_status",
+    "botnet": "get_botnet_status",
+    "anti_spyware": "get_anti_spyware_status",
+    "content_filtering": "get_content_filtering_status",
+    "connections": "get_connection_status",
+}
+
+@dataclass(frozen=True)
+class ApplianceConfig:
+    """Connection details for one firewall."""
+
+    name: str
+    host: str
+    port: int = 443
+    username: str = ""
+    password: str = ""
+    verify_ssl: bool = False
+
+    @classmethod
+    def from_settings(cls) -> "ApplianceConfig":
+        """The appliance configured through SONICWALL_* settings."""
+        return cls(
+            name=settings.SONICWALL_HOST,
+            host=settings.SONICWALL_HOST,
+            port=settings.SONICWALL_PORT,
+            username=settings.SONICWALL_USERNAME,
+            password=settings.SONICWALL_PASSWORD,
+            verify_ssl=settings.SONICWALL_VERIFY_SSL
+        )
 
 class SonicWallClient:
-    def __init__(self):
-        self.base_url = f"https://{settings.SONICWALL_HOST}:{settings.SONICWALL_PORT}"
-        self.session = requests.Session()
-        self.session.verify = settings.SONICWALL_VERIFY_SSL
+    def __init__(
+        self,
+        appliance: Optional[ApplianceConfig] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.appliance = appliance or ApplianceConfig.from_settings()
+        self.base_url = f"https://{self.appliance.host}:{self.appliance.port}"
+        # Pooled keep-alive connections, so concurrent calls overlap on the
+        # event loop instead of blocking it
+        self.session = httpx.AsyncClient(
+            verify=self.appliance.verify_ssl,
+            timeout=httpx.Timeout(settings.SONICWALL_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.SONICWALL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SONICWALL_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.SONICWALL_KEEPALIVE_EXPIRY
+            ),
+            transport=transport
+        )
         self._auth_headers = {}
+        self._auth_lock = asyncio.Lock()
+        self._auth_generation = 0
+        self._authenticated = False
+        self._last_used = 0.0
+        self._firmware_version: Optional[str] = None
+        self._firmware_failed_at: Optional[float] = None
+        self.discovery: EndpointDiscovery = endpoint_discovery
+        # Per-appliance protection of the firewall from our own traffic
+        self.limiter = TokenBucket(settings.SONICWALL_RATE_LIMIT, settings.SONICWALL_RATE_BURST)
+        self.breaker = CircuitBreaker(
+            settings.SONICWALL_BREAKER_THRESHOLD,
+            settings.SONICWALL_BREAKER_RESET_TIMEOUT
+        )
+        POOL_MAX.labels(self.appliance.name).set(settings.SONICWALL_MAX_CONNECTIONS)
+        track_circuit(self.appliance.name, lambda: self.breaker.state)
+        self.cache: Optional[ResponseCache] = None
+        if settings.SONICWALL_CACHE_ENABLED:
+            self.cache = ResponseCache(
+                max_entries=settings.SONICWALL_CACHE_MAX_ENTRIES,
+                default_ttl=settings.SONICWALL_CACHE_DEFAULT_TTL,
+                ttls=settings.SONICWALL_CACHE_TTLS,
+                stale_ttl=settings.SONICWALL_CACHE_STALE_TTL
+            )
+
+    @property
+    def is_authenticated(self) -> bool:
+        """True while the management session is believed to be alive."""
+        if not self._authenticated:
+            return False
+        idle_timeout = settings.SONICWALL_SESSION_IDLE_TIMEOUT
+        return not idle_timeout or time.monotonic() - self._last_used < idle_timeout
+
+    async def ensure_authenticated(self) -> bool:
+        """
+        Make sure a management session exists, logging in only if needed.
+        Concurrent callers share a single login.
+        """
+        if self.is_authenticated:
+            return True
+        return await self._reauthenticate(self._auth_generation)
+
+    async def _reauthenticate(self, seen_generation: int) -> bool:
+        """
+        Log in again unless another caller already did so since
+        `seen_generation` was observed.
+        """
+        async with self._auth_lock:
+            if self._auth_generation != seen_generation and self.is_authenticated:
+                return True
+            # A firewall known to be down isn't sent a full digest handshake,
+            # including by callers that queued behind a login that failed
+            if self.breaker.state == CircuitBreaker.OPEN:
+                return False
+            return await self.authenticate()
+
+    async def _timed_request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """One upstream request, recorded in the latency and pool metrics."""
+        appliance = self.appliance.name
+        status = "error"
+        started = time.perf_counter()
+        POOL_IN_USE.labels(appliance).inc()
+        try:
+            with start_span(
+                f"sonicwall {method} {path}",
+                {"sonicwall.appliance": appliance, "http.method": method, "sonicwall.endpoint": path},
+                client=True
+            ) as span:
+                response = await self.session.request(
+                    method,
+                    f"{self.base_url}{path}",
+                    headers=self._auth_headers,
+                    **kwargs
+                )
+                span.set_attribute("http.status_code", response.status_code)
+            status = str(response.status_code)
+            return response
+        finally:
+            POOL_IN_USE.labels(appliance).dec()
+            UPSTREAM_LATENCY.labels(appliance, path, method, status).observe(time.perf_counter() - started)
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Send a request on the management session, re-authenticating once
+        if the firewall reports the session as expired.
+        """
+        generation = self._auth_generation
+        response = await self._timed_request(method, path, **kwargs)
+        if response.status_code == 401:
+            REAUTHENTICATIONS.labels(self.appliance.name).inc()
+            if await self._reauthenticate(generation):
+                response = await self._timed_request(method, path, **kwargs)
+        self._last_used = time.monotonic()
+        return response
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the rate limiter and circuit breaker.
+        Idempotent requests are retried with exponential backoff and jitter
+        when the firewall is busy (500/503 and friends) or unreachable.
+        Raises CircuitOpenError while the firewall is considered unhealthy.
+        """
+        trial = self.breaker.state == CircuitBreaker.HALF_OPEN
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.appliance.name}")
+        try:
+            return await self._request_with_retries(method, path, **kwargs)
+        finally:
+            # Cancellation or an unexpected error records no outcome
+            if trial:
+                self.breaker.release()
+
+    async def _request_with_retries(self, method: str, path: str, **kwargs) -> httpx.Response:
+        retries = settings.SONICWALL_RETRIES if method.upper() in RETRYABLE_METHODS else 0
+        for attempt in range(retries + 1):
+            await self.limiter.acquire()
+            try:
+                response = await self._send(method, path, **kwargs)
+            except httpx.TransportError:
+                if attempt == retries:
+                    self.breaker.record_failure()
+                    raise
+                delay = None
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    self.limiter.reward()
+                    self.breaker.record_success()
+                    return response
+                self.limiter.penalize()
+                if attempt == retries:
+                    self.breaker.record_failure()
+                    return response
+                delay = retry_after(response.headers.get("Retry-After"), settings.SONICWALL_RETRY_BACKOFF_MAX)
+            if delay is None:
+                delay = backoff_delay(attempt, settings.SONICWALL_RETRY_BACKOFF, settings.SONICWALL_RETRY_BACKOFF_MAX)
+            await asyncio.sleep(delay)
+
+    def _log_response(self, label: str, response: httpx.Response, level: int = logging.DEBUG) -> None:
+        """
+        Log a response with redacted headers and a truncated body. Nothing
+        is formatted (not even the body decoded) unless `level` is enabled.
+        """
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                "%s response from %s: HTTP %d headers=%s body=%s",
+                label,
+                self.appliance.name,
+                response.status_code,
+                redact_headers(response.headers),
+                truncate_body(response.text)
+            )
+
+    async def get_firmware_version(self) -> str:
+        """
+        Firmware version of the appliance, fetched once per login. A failed
+        lookup answers "unknown" without asking again for
+        SONICWALL_FIRMWARE_RETRY_INTERVAL seconds.
+        """
+        if self._firmware_version is None:
+            failed_at = self._firmware_failed_at
+            if failed_at is not None and time.monotonic() - failed_at < settings.SONICWALL_FIRMWARE_RETRY_INTERVAL:
+                return "unknown"
+            try:
+                response = await self._request("GET", "/api/sonicos/version")
+                response.raise_for_status()
+                self._firmware_version = str(response.json().get("firmware_version") or "unknown")
+                self._firmware_failed_at = None
+            except Exception as e:
+                logger.warning("Error getting firmware version: %s", e)
+                self._firmware_failed_at = time.monotonic()
+                return "unknown"
+        return self._firmware_version
+
+    async def _get_discovered(self, capability: str) -> Optional[httpx.Response]:
+        """
+        GET a capability whose path depends on the firmware version.
+        The working path is probed once per appliance and firmware and then
+        reused; it is re-probed if it stops answering.
+        """
+        appliance = urlparse(self.base_url).netloc
+        firmware = await self.get_firmware_version()
+        path, unavailable = self.discovery.lookup(appliance, firmware, capability)
+        if unavailable:
+            return None
+
+        if path is not None:
+            response = await self._request("GET", path)
+            if response.status_code not in NOT_AVAILABLE_STATUSES:
+                return response
+            self.discovery.forget(appliance, firmware, capability)
+
+        for candidate in ENDPOINT_CANDIDATES[capability]:
+            logger.debug("Probing %s endpoint %s", capability, candidate)
+            response = await self._request("GET", candidate)
+            if response.status_code in NOT_AVAILABLE_STATUSES:
+                continue
+            if response.is_success:
+                self.discovery.remember(appliance, firmware, capability, candidate)
+            return response
+
+        self.discovery.remember(appliance, firmware, capability, None)
+        return None
 
     def _generate_cnonce(self) -> str:
         """Generate a client nonce."""
@@ -77,241 +357,354 @@ class SonicWallClient:
     async def authenticate(self) -> bool:
         """
         Perform digest authentication with the SonicWall device.
-        Returns True if authentication is successful.
+        Returns True if authentication is successful. The handshake goes
+        through the rate limiter, and an unreachable firewall counts as a
+        circuit breaker failure.
         """
         auth_endpoint = "/api/sonicos/auth"
-        
-        try:
-            print(f"Step 1: Getting authentication challenge from {self.base_url}{auth_endpoint}")
-            # Step 1: Get the authentication challenge
-            response = self.session.get(
-                f"{self.base_url}{auth_endpoint}",
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json"
-                }
-            )
-
-            if response.status_code != 401:
-                print(f"Unexpected status code: {response.status_code}")
-                print(f"Response headers: {response.headers}")
-                print(f"Response body: {response.text}")
-                raise Exception(f"Expected 401 response with auth challenge, got {response.status_code}")
-
-            # Get WWW-Authenticate header
-            auth_header = response.headers.get('WWW-Authenticate')
-            if not auth_header:
-                raise Exception("No WWW-Authenticate header in response")
-
-            print("Got WWW-Authenticate header:", auth_header)
-
-            # Parse authentication parameters
-            auth_params = self._parse_auth_header(auth_header)
-            print("Parsed auth parameters:", auth_params)
-
-            # Calculate digest response
-            auth_string = self._calculate_response(
-                auth_params,
-                settings.SONICWALL_USERNAME,
-                settings.SONICWALL_PASSWORD,
-                "POST",
-                auth_endpoint
-            )
+        self._authenticated = False
+        self._firmware_version = None
+        self._firmware_failed_at = None
 
-            print("Step 2: Sending authentication response")
-            # Step 2: Send authentication response
-            headers = {
-                "Authorization": auth_string,
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "Connection": "keep-alive",
-                "X-SONICOS-API-VERSION": settings.SONICWALL_API_VERSION
-            }
-
-            auth_response = self.session.post(
-                f"{self.base_url}{auth_endpoint}",
-                headers=headers,
-                json={}  # Empty JSON body
-            )
-
-            print(f"Auth response status: {auth_response.status_code}")
-            print(f"Auth response headers: {auth_response.headers}")
-            print(f"Auth response body: {auth_response.text}")
-
-            if auth_response.status_code != 200:
-                raise Exception(f"Authentication failed: {auth_response.status_code}")
-
-            # Store authentication headers for future requests
-            self._auth_headers = headers
-
-            print("Step 3: Starting management session")
-            # Step 3: Start management session
-            management_response = self.session.post(
-                f"{self.base_url}/api/sonicos/start-management",
-                headers=self._auth_headers,
-                data=None  # No body at all
-            )
-
-            print(f"Management response status: {management_response.status_code}")
-            print(f"Management response headers: {management_response.headers}")
-            print(f"Management response body: {management_response.text}")
+        with start_span("sonicwall authenticate", {"sonicwall.appliance": self.appliance.name}) as auth_span:
+            try:
+                logger.debug("Step 1: Getting authentication challenge from %s%s", self.base_url, auth_endpoint)
+                # Step 1: Get the authentication challenge
+                await self.limiter.acquire()
+                with start_span("sonicwall auth challenge", client=True):
+                    response = await self.session.get(
+                        f"{self.base_url}{auth_endpoint}",
+                        headers={
+                            "Accept": "application/json",
+                            "Content-Type": "application/json"
+                        }
+                    )
+
+                if response.status_code != 401:
+                    self._log_response("Auth challenge", response, level=logging.WARNING)
+                    raise Exception(f"Expected 401 response with auth challenge, got {response.status_code}")
+
+                # Get WWW-Authenticate header
+                auth_header = response.headers.get('WWW-Authenticate')
+                if not auth_header:
+                    raise Exception("No WWW-Authenticate header in response")
+
+                # Parse authentication parameters
+                auth_params = self._parse_auth_header(auth_header)
+                # The nonce and opaque values are never logged
+                logger.debug(
+                    "Got digest challenge: realm=%s algorithm=%s qop=%s",
+                    auth_params.get("realm"), auth_params.get("algorithm"), auth_params.get("qop")
+                )
 
-            if management_response.status_code != 200:
-                raise Exception("Failed to start management session")
+                # Calculate digest response
+                auth_string = self._calculate_response(
+                    auth_params,
+                    self.appliance.username,
+                    self.appliance.password,
+                    "POST",
+                    auth_endpoint
+                )
 
-            return True
+                logger.debug("Step 2: Sending authentication response")
+                # Step 2: Send authentication response
+                headers = {
+                    "Authorization": auth_string,
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                    "Connection": "keep-alive",
+                    "X-SONICOS-API-VERSION": settings.SONICWALL_API_VERSION
+                }
 
-        except Exception as e:
-            print(f"Authentication error: {str(e)}")
-            return False
+                await self.limiter.acquire()
+                with start_span("sonicwall auth response", client=True):
+                    auth_response = await self.session.post(
+                        f"{self.base_url}{auth_endpoint}",
+                        headers=headers,
+                        json={}  # Empty JSON body
+                    )
+
+                self._log_response("Auth", auth_response)
+
+                if auth_response.status_code != 200:
+                    raise Exception(f"Authentication failed: {auth_response.status_code}")
+
+                # Store authentication headers for future requests
+                self._auth_headers = headers
+
+                logger.debug("Step 3: Starting management session")
+                # Step 3: Start management session
+                await self.limiter.acquire()
+                with start_span("sonicwall start management", client=True):
+                    management_response = await self.session.post(
+                        f"{self.base_url}/api/sonicos/start-management",
+                        headers=self._auth_headers  # No body at all
+                    )
+
+                self._log_response("Start management", management_response)
+
+                if management_response.status_code != 200:
+                    raise Exception("Failed to start management session")
+
+                self._authenticated = True
+                self._auth_generation += 1
+                self.breaker.record_success()
+                self._last_used = time.monotonic()
+                logger.info("Authenticated to %s", self.appliance.name)
+                AUTHENTICATIONS.labels(self.appliance.name, "success").inc()
+                auth_span.set_attribute("sonicwall.authenticated", True)
+                return True
 
+            except Exception as e:
+                if isinstance(e, httpx.TransportError):
+                    self.breaker.record_failure()
+                AUTHENTICATIONS.labels(self.appliance.name, "failure").inc()
+                logger.warning("Authentication to %s failed: %s", self.appliance.name, e)
+                auth_span.record_exception(e)
+                auth_span.set_attribute("sonicwall.authenticated", False)
+                return False
+
+    @cached("services")
     async def get_security_services_status(self) -> Optional[Dict]:
         """
         Get the status of security services.
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/sonicos/reporting/status/security-services",
-                headers=self._auth_headers
-            )
+            response = await self._request("GET", "/api/sonicos/reporting/status/security-services")
             response.raise_for_status()
             
-            print(f"Security Services Response: {response.text}")  # Debug logging
+            self._log_response("Security Services", response)
             
             # For this endpoint, the response is directly the data we want
             return response.json()
             
-        except requests.exceptions.RequestException as e:
-            print(f"Error getting security services status: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.warning("Error getting security services status: %s", e)
             return None
         except Exception as e:
-            print(f"Unexpected error getting security services status: {str(e)}")
+            logger.warning("Unexpected error getting security services status: %s", e)
             return None
 
+    @cached("gateway_av")
     async def get_gateway_av_status(self) -> Optional[Dict]:
         """
         Get Gateway Anti-Virus status.
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/sonicos/reporting/gateway-antivirus",
-                headers=self._auth_headers
-            )
+            response = await self._request("GET", "/api/sonicos/reporting/gateway-antivirus")
             response.raise_for_status()
             
-            print(f"Gateway AV Response: {response.text}")  # Debug logging
+            self._log_response("Gateway AV", response)
             
             # Return the response directly as it contains the data we want
             return response.json()
             
         except Exception as e:
-            print(f"Error getting Gateway AV status: {str(e)}")
+            logger.warning("Error getting Gateway AV status: %s", e)
             return None
 
+    @cached("ips")
     async def get_intrusion_prevention_status(self) -> Optional[Dict]:
         """
         Get Intrusion Prevention status.
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/sonicos/reporting/intrusion-prevention",
-                headers=self._auth_headers
-            )
+            response = await self._request("GET", "/api/sonicos/reporting/intrusion-prevention")
             response.raise_for_status()
             
-            print(f"IPS Response: {response.text}")  # Debug logging
+            self._log_response("IPS", response)
             
             # Return the response directly as it contains the data we want
             return response.json()
             
         except Exception as e:
-            print(f"Error getting Intrusion Prevention status: {str(e)}")
+            logger.warning("Error getting Intrusion Prevention status: %s", e)
             return None
 
+    @cached("botnet")
     async def get_botnet_status(self) -> Optional[Dict]:
         """
         Get Botnet Filter status.
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/sonicos/reporting/botnet/status",
-                headers=self._auth_headers
-            )
+            response = await self._request("GET", "/api/sonicos/reporting/botnet/status")
             response.raise_for_status()
             
-            print(f"Botnet Response: {response.text}")  # Debug logging
+            self._log_response("Botnet", response)
             
             # Return the response directly as it contains the data we want
             return response.json()
             
         except Exception as e:
-            print(f"Error getting Botnet status: {str(e)}")
+            logger.warning("Error getting Botnet status: %s", e)
+            return None
+
+    @cached("connections")
+    async def get_connection_status(self) -> Optional[List[Dict]]:
+        """
+        Get firewall connection counts (one entry per connection pool).
+        """
+        try:
+            response = await self._request("GET", "/api/sonicos/reporting/firewall/connection-status")
+            response.raise_for_status()
+
+            self._log_response("Connection Status", response)
+
+            return response.json()
+
+        except Exception as e:
+            logger.warning("Error getting connection status: %s", e)
             return None
 
     async def close_session(self) -> bool:
         """Close the management session."""
+        if not self._authenticated:
+            return True
         try:
-            response = self.session.delete(
+            response = await self.session.delete(
                 f"{self.base_url}/api/sonicos/auth",
                 headers=self._auth_headers
             )
             return response.status_code == 200
         except Exception as e:
-            print(f"Error closing session: {str(e)}")
+            logger.warning("Error closing session: %s", e)
             return False
+        finally:
+            self._authenticated = False
+
+    async def aclose(self) -> None:
+        """Release the pooled HTTP connections."""
+        await self.session.aclose()
 
+    @cached("anti_spyware")
     async def get_anti_spyware_status(self) -> Optional[Dict]:
         """
         Get Anti-Spyware status.
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/sonicos/reporting/anti-spyware",
-                headers=self._auth_headers
-            )
+            response = await self._request("GET", "/api/sonicos/reporting/anti-spyware")
             response.raise_for_status()
             
-            print(f"Anti-Spyware Response: {response.text}")  # Debug logging
+            self._log_response("Anti-Spyware", response)
             
             # Return the response directly as it contains the data we want
             return response.json()
             
         except Exception as e:
-            print(f"Error getting Anti-Spyware status: {str(e)}")
+            logger.warning("Error getting Anti-Spyware status: %s", e)
             return None
 
+    @cached("content_filtering")
     async def get_content_filtering_status(self) -> Optional[Dict]:
         """
         Get Content Filtering status.
         """
-        # List of possible endpoints to try
-        endpoints = [
-            "/api/sonicos/content-filtering/status",
-            "/api/sonicos/reporting/content-filtering",
-            "/api/sonicos/cfs/status",
-            "/api/sonicos/security-services/content-filtering"
-        ]
+        try:
+            response = await self._get_discovered("content_filtering")
+            if response is None:
+                logger.info("No content filtering endpoint available on %s", self.appliance.name)
+                return None
+            response.raise_for_status()
 
-        for endpoint in endpoints:
-            try:
-                print(f"Trying endpoint: {endpoint}")
-                response = self.session.get(
-                    f"{self.base_url}{endpoint}",
-                    headers=self._auth_headers
-                )
-                response.raise_for_status()
-                
-                print(f"Content Filtering Response: {response.text}")  # Debug logging
-                
-                # Return the response directly as it contains the data we want
-                return response.json()
-                
-            except requests.exceptions.RequestException as e:
-                print(f"Error with endpoint {endpoint}: {str(e)}")
-                continue
-            except Exception as e:
-                print(f"Unexpected error with endpoint {endpoint}: {str(e)}")
-                continue
-        
-        print("All content filtering endpoints failed")
-        return None 
\ No newline at end of file
+            self._log_response("Content Filtering", response)
+
+            # Return the response directly as it contains the data we want
+            return response.json()
+
+        except Exception as e:
+            logger.warning("Error getting Content Filtering status: %s", e)
+            return None
+
+    @cached("geo_ip")
+    async def get_geo_ip_status(self) -> Optional[Dict]:
+        """
+        Get Geo-IP filter status.
+        """
+        try:
+            response = await self._get_discovered("geo_ip")
+            if response is None:
+                logger.info("No Geo-IP endpoint available on %s", self.appliance.name)
+                return None
+            response.raise_for_status()
+
+            self._log_response("Geo-IP", response)
+
+            return response.json()
+
+        except Exception as e:
+            logger.warning("Error getting Geo-IP status: %s", e)
+            return None
+
+    async def iter_log_pages(
+        self,
+        start: datetime,
+        end: datetime,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Yield raw log pages for a time window, one page in memory at a time.
+        Stops after the first short page.
+        """
+        page_size = page_size or settings.SONICWALL_LOG_PAGE_SIZE
+        page_index = 0
+        while True:
+            response = await self._request(
+                "GET",
+                "/api/sonicos/reporting/log/view",
+                params={
+                    "startTime": format_query_time(start),
+                    "endTime": format_query_time(end),
+                    "pageSize": page_size,
+                    "pageIndex": page_index,
+                    "sortBy": "timestamp",
+                    "sortOrder": "asc",
+                    "type": settings.SONICWALL_LOG_TYPES
+                }
+            )
+            response.raise_for_status()
+            page = response.json() or []
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            page_index += 1
+
+    async def stream_logs(
+        self,
+        checkpoint: LogCheckpoint,
+        end: Optional[datetime] = None,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream normalized, deduplicated log events collected since the
+        checkpoint's high-water mark, advancing the checkpoint as it goes
+        (callers that must not advance it before storing the events pass a
+        copy).
+
+        The window starts SONICWALL_LOG_OVERLAP seconds before the high-water
+        mark so late-arriving events are not missed; events already seen in
+        the overlap are skipped by id.
+        """
+        overlap = timedelta(seconds=settings.SONICWALL_LOG_OVERLAP)
+        end = end or datetime.now(timezone.utc)
+        if checkpoint.high_water is not None:
+            start = checkpoint.high_water - overlap
+        else:
+            start = end - timedelta(seconds=settings.SONICWALL_LOG_INITIAL_LOOKBACK)
+
+        async for page in self.iter_log_pages(start, end, page_size):
+            oldest = None
+            for entry in page:
+                event = normalize_log_entry(entry)
+                if event is None:
+                    continue
+                if oldest is None or event["timestamp"] < oldest:
+                    oldest = event["timestamp"]
+                if checkpoint.accept(event):
+                    yield event
+            # Pages are in ascending time order, so ids older than this page
+            # (less the overlap) can't be seen again; pruning per page keeps
+            # a long catch-up window from holding every id in memory
+            if oldest is not None:
+                checkpoint.prune_before(oldest - overlap)
+        checkpoint.prune(overlap)
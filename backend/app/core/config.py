@@ -5,6 +5,15 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+def parse_mapping(value: str) -> Dict[str, float]:
+    """Parse "name=number,name=number" settings into a dict."""
+    mapping = {}
+    for item in value.split(","):
+        if "=" in item:
+            key, number = item.split("=", 1)
+            mapping[key.strip()] = float(number)
+    return mapping
+
 class Settings:
     def __init__(self):
         self.PROJECT_NAME: str = "SonicWall API"
@@ -20,6 +29,16 @@ class Settings:
         self.POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
         self.POSTGRES_DB: str = os.getenv("POSTGRES_DB", "sonicwall")
         self.SQLALCHEMY_DATABASE_URI: str = f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
+        self.ASYNC_SQLALCHEMY_DATABASE_URI: str = f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
+
+        # Async (asyncpg) connection pool used by async routes: pooled
+        # connections, extra connections allowed under load, seconds to wait
+        # for one, and prepared statements cached per connection (0 disables,
+        # needed behind PgBouncer in transaction mode)
+        self.DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+        self.DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
         
         # Security
         self.SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
@@ -42,6 +61,148 @@ class Settings:
         self.SONICWALL_PASSWORD: str = os.getenv("SONICWALL_PASSWORD", "")
         self.SONICWALL_VERIFY_SSL: bool = os.getenv("SONICWALL_VERIFY_SSL", "false").lower() == "true"
         self.SONICWALL_API_VERSION: str = os.getenv("SONICWALL_API_VERSION", "7.0")
+        # Seconds of inactivity after which the shared management session is
+        # assumed to have timed out on the firewall (0 disables the check)
+        self.SONICWALL_SESSION_IDLE_TIMEOUT: int = int(os.getenv("SONICWALL_SESSION_IDLE_TIMEOUT", "240"))
+        # HTTP transport (connection pool and keep-alive)
+        self.SONICWALL_TIMEOUT: float = float(os.getenv("SONICWALL_TIMEOUT", "30"))
+        self.SONICWALL_MAX_CONNECTIONS: int = int(os.getenv("SONICWALL_MAX_CONNECTIONS", "10"))
+        self.SONICWALL_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("SONICWALL_MAX_KEEPALIVE_CONNECTIONS", "10"))
+        self.SONICWALL_KEEPALIVE_EXPIRY: float = float(os.getenv("SONICWALL_KEEPALIVE_EXPIRY", "60"))
+
+        # Per-firewall rate limit (requests/second, 0 disables) and burst,
+        # retries of busy/unreachable responses (backoff in seconds), and
+        # the circuit breaker: consecutive failures before failing fast and
+        # seconds before a trial request
+        self.SONICWALL_RATE_LIMIT: float = float(os.getenv("SONICWALL_RATE_LIMIT", "5"))
+        self.SONICWALL_RATE_BURST: float = float(os.getenv("SONICWALL_RATE_BURST", "10"))
+        self.SONICWALL_RETRIES: int = int(os.getenv("SONICWALL_RETRIES", "3"))
+        self.SONICWALL_RETRY_BACKOFF: float = float(os.getenv("SONICWALL_RETRY_BACKOFF", "0.5"))
+        self.SONICWALL_RETRY_BACKOFF_MAX: float = float(os.getenv("SONICWALL_RETRY_BACKOFF_MAX", "10"))
+        self.SONICWALL_BREAKER_THRESHOLD: int = int(os.getenv("SONICWALL_BREAKER_THRESHOLD", "5"))
+        self.SONICWALL_BREAKER_RESET_TIMEOUT: float = float(os.getenv("SONICWALL_BREAKER_RESET_TIMEOUT", "30"))
+
+        # Response cache for reporting endpoints (TTLs in seconds)
+        self.SONICWALL_CACHE_ENABLED: bool = os.getenv("SONICWALL_CACHE_ENABLED", "true").lower() == "true"
+        self.SONICWALL_CACHE_MAX_ENTRIES: int = int(os.getenv("SONICWALL_CACHE_MAX_ENTRIES", "256"))
+        self.SONICWALL_CACHE_DEFAULT_TTL: float = float(os.getenv("SONICWALL_CACHE_DEFAULT_TTL", "30"))
+        self.SONICWALL_CACHE_STALE_TTL: float = float(os.getenv("SONICWALL_CACHE_STALE_TTL", "300"))
+        self.SONICWALL_CACHE_TTLS: Dict[str, float] = parse_mapping(os.getenv(
+            "SONICWALL_CACHE_TTLS",
+            "services=600,gateway_av=300,ips=300,botnet=300,anti_spyware=300,content_filtering=60"
+        ))
+
+        # Endpoint discovery: optional JSON file remembering which path works
+        # per appliance/firmware, and how long to wait before re-probing an
+        # endpoint no candidate path answered for
+        self.SONICWALL_ENDPOINT_CACHE_FILE: str = os.getenv("SONICWALL_ENDPOINT_CACHE_FILE", "")
+        self.SONICWALL_ENDPOINT_RETRY_INTERVAL: float = float(os.getenv("SONICWALL_ENDPOINT_RETRY_INTERVAL", "3600"))
+        # Seconds before a failed firmware version lookup is retried
+        self.SONICWALL_FIRMWARE_RETRY_INTERVAL: float = float(os.getenv("SONICWALL_FIRMWARE_RETRY_INTERVAL", "300"))
+
+        # Log collection (/api/sonicos/reporting/log/view); windows overlap
+        # by SONICWALL_LOG_OVERLAP seconds and the first run looks back
+        # SONICWALL_LOG_INITIAL_LOOKBACK seconds
+        self.SONICWALL_LOG_PAGE_SIZE: int = int(os.getenv("SONICWALL_LOG_PAGE_SIZE", "1000"))
+        self.SONICWALL_LOG_TYPES: str = os.getenv("SONICWALL_LOG_TYPES", "INFORMATION,NOTICE,ALERT")
+        self.SONICWALL_LOG_OVERLAP: int = int(os.getenv("SONICWALL_LOG_OVERLAP", "60"))
+        self.SONICWALL_LOG_INITIAL_LOOKBACK: int = int(os.getenv("SONICWALL_LOG_INITIAL_LOOKBACK", "3600"))
+        self.SONICWALL_LOG_POLL_INTERVAL: float = float(os.getenv("SONICWALL_LOG_POLL_INTERVAL", "300"))
+
+        # Log persistence; method is "copy" (COPY via a staging table) or
+        # "insert" (multi-row INSERT)
+        self.LOG_COLLECTION_ENABLED: bool = os.getenv("LOG_COLLECTION_ENABLED", "false").lower() == "true"
+        self.LOG_WRITE_BATCH_SIZE: int = int(os.getenv("LOG_WRITE_BATCH_SIZE", "5000"))
+        self.LOG_WRITE_FLUSH_INTERVAL: float = float(os.getenv("LOG_WRITE_FLUSH_INTERVAL", "5"))
+        self.LOG_WRITE_METHOD: str = os.getenv("LOG_WRITE_METHOD", "copy")
+
+        # Log storage is partitioned by day; partitions older than the
+        # retention period are dropped (0 keeps everything)
+        self.LOG_RETENTION_DAYS: int = int(os.getenv("LOG_RETENTION_DAYS", "90"))
+        self.LOG_PARTITION_DAYS_AHEAD: int = int(os.getenv("LOG_PARTITION_DAYS_AHEAD", "2"))
+        self.LOG_PARTITION_MAINTENANCE_INTERVAL: float = float(os.getenv("LOG_PARTITION_MAINTENANCE_INTERVAL", "3600"))
+
+        # Rows fetched and encoded per chunk when exporting logs
+        self.LOG_EXPORT_CHUNK_SIZE: int = int(os.getenv("LOG_EXPORT_CHUNK_SIZE", "10000"))
+
+        # Metric rollups (1m/1h/1d) maintained as logs and status snapshots
+        # are ingested; series requests pick the finest granularity that
+        # returns at most METRICS_MAX_POINTS buckets
+        self.METRICS_ROLLUP_ENABLED: bool = os.getenv("METRICS_ROLLUP_ENABLED", "true").lower() == "true"
+        self.METRICS_MAX_POINTS: int = int(os.getenv("METRICS_MAX_POINTS", "1000"))
+
+        # Keep every change of the polled services, gateway AV, IPS and
+        # anti-spyware status (one row per change, not per poll)
+        self.STATUS_HISTORY_ENABLED: bool = os.getenv("STATUS_HISTORY_ENABLED", "true").lower() == "true"
+
+        # Server-sent event stream: events buffered per subscriber before the
+        # oldest are dropped, and seconds between keep-alive comments
+        self.EVENT_STREAM_QUEUE_SIZE: int = int(os.getenv("EVENT_STREAM_QUEUE_SIZE", "1000"))
+        self.EVENT_STREAM_KEEPALIVE: float = float(os.getenv("EVENT_STREAM_KEEPALIVE", "15"))
+
+        # Fleet-wide queries: appliances read at once and seconds allowed
+        # per appliance before it is reported as timed out
+        self.FLEET_CONCURRENCY: int = int(os.getenv("FLEET_CONCURRENCY", "10"))
+        self.FLEET_TIMEOUT: float = float(os.getenv("FLEET_TIMEOUT", "15"))
+        # Seconds the appliance registry is reused before fleet queries reload it
+        self.APPLIANCE_REGISTRY_TTL: float = float(os.getenv("APPLIANCE_REGISTRY_TTL", "60"))
+
+        # Where collection runs: "inprocess" polls from the API process,
+        # "worker" leaves it to `python -m app.worker` processes that shard
+        # appliances between them (intervals in seconds)
+        self.COLLECTION_MODE: str = os.getenv("COLLECTION_MODE", "inprocess")
+        self.WORKER_HEARTBEAT_INTERVAL: float = float(os.getenv("WORKER_HEARTBEAT_INTERVAL", "10"))
+        self.WORKER_HEARTBEAT_TIMEOUT: float = float(os.getenv("WORKER_HEARTBEAT_TIMEOUT", "30"))
+
+        # Users (with their digest HA1) cached for API authentication;
+        # entries expire after USER_CACHE_TTL seconds (0 disables caching)
+        # and are dropped as soon as Postgres reports the user changed
+        self.USER_CACHE_TTL: float = float(os.getenv("USER_CACHE_TTL", "60"))
+        self.USER_CACHE_MAX_ENTRIES: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
+
+        # Sessions known to be valid are trusted for SESSION_CACHE_TTL
+        # seconds; last_activity is written in batches every
+        # SESSION_ACTIVITY_FLUSH_INTERVAL seconds
+        self.SESSION_CACHE_TTL: float = float(os.getenv("SESSION_CACHE_TTL", "5"))
+        self.SESSION_CACHE_MAX_ENTRIES: int = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "4096"))
+        self.SESSION_ACTIVITY_FLUSH_INTERVAL: float = float(os.getenv("SESSION_ACTIVITY_FLUSH_INTERVAL", "30"))
+
+        # Expired sessions are marked inactive every SESSION_SWEEP_INTERVAL
+        # seconds (0 disables), at most SESSION_SWEEP_BATCH_SIZE per statement
+        self.SESSION_SWEEP_INTERVAL: float = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+        self.SESSION_SWEEP_BATCH_SIZE: int = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "5000"))
+
+        # Digest nonces: seconds a nonce can be reused (with increasing
+        # nonce-counts), how many the in-process store remembers, and where
+        # they live: "memory" (per process) or "database" (shared by all
+        # API processes, needed when requests are load-balanced)
+        self.AUTH_NONCE_LIFETIME: float = float(os.getenv("AUTH_NONCE_LIFETIME", "300"))
+        self.AUTH_NONCE_MAX_ENTRIES: int = int(os.getenv("AUTH_NONCE_MAX_ENTRIES", "10000"))
+        self.AUTH_NONCE_BACKEND: str = os.getenv("AUTH_NONCE_BACKEND", "memory")
+
+        # Background status collector (intervals and jitter in seconds)
+        self.SONICWALL_POLL_ENABLED: bool = os.getenv("SONICWALL_POLL_ENABLED", "true").lower() == "true"
+        self.SONICWALL_POLL_INTERVAL: float = float(os.getenv("SONICWALL_POLL_INTERVAL", "30"))
+        self.SONICWALL_POLL_JITTER: float = float(os.getenv("SONICWALL_POLL_JITTER", "5"))
+        self.SONICWALL_POLL_INTERVALS: Dict[str, float] = parse_mapping(os.getenv(
+            "SONICWALL_POLL_INTERVALS",
+            "services=300,content_filtering=60"
+        ))
+
+        # Logging: root level, per-module overrides
+        # ("app.clients.sonicwall=DEBUG,sqlalchemy.engine=WARNING") and the
+        # longest response body written to debug logs
+        self.LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+        self.LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+        self.LOG_BODY_MAX: int = int(os.getenv("LOG_BODY_MAX", "512"))
+
+        # Tracing (needs the optional OpenTelemetry SDK): "none", "file"
+        # (one JSON span per line in TRACING_FILE) or "otlp" (OTLP/HTTP to
+        # TRACING_OTLP_ENDPOINT, or the exporter's default)
+        self.TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none")
+        self.TRACING_FILE: str = os.getenv("TRACING_FILE", "traces.jsonl")
+        self.TRACING_OTLP_ENDPOINT: str = os.getenv("TRACING_OTLP_ENDPOINT", "")
+        self.TRACING_SERVICE_NAME: str = os.getenv("TRACING_SERVICE_NAME", "sonicwall-api")
 
     @property
     def CORS_ORIGINS(self) -> list:
@@ -1,6 +1,6 @@
-from typing import AsyncGenerator
 from fastapi import Depends, HTTPException, status, Request
 from app.clients.sonicwall import SonicWallClient
+from app.clients.session_manager import sonicwall_sessions
 
 async def check_auth(request: Request):
     """Check if request has valid authentication."""
@@ -12,16 +12,12 @@ async def check_auth(request: Request):
             headers={"WWW-Authenticate": "Digest"}
         )
 
-async def get_sonicwall_client() -> AsyncGenerator[SonicWallClient, None]:
-    """Get an authenticated SonicWall client."""
-    client = SonicWallClient()
-    try:
-        auth_success = await client.authenticate()
-        if not auth_success:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication failed"
-            )
-        yield client
-    finally:
-        await client.close_session() 
\ No newline at end of file
+async def get_sonicwall_client() -> SonicWallClient:
+    """Get the shared, authenticated SonicWall client."""
+    client = await sonicwall_sessions.get_client()
+    if client is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed"
+        )
+    return client 
\ No newline at end of file
@@ -0,0 +1,9 @@
+from datetime import datetime
+from typing import Any
+
+
+def json_default(value: Any) -> str:
+    """`default=` for json.dumps: datetimes as ISO 8601, anything else is an error."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Unserializable value: {value!r}")
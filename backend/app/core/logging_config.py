@@ -0,0 +1,47 @@
+import logging
+from typing import Dict, Mapping, Optional
+from app.core.config import settings
+
+REDACTED_HEADERS = {"authorization", "cookie", "set-cookie", "www-authenticate"}
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def parse_levels(value: str) -> Dict[str, str]:
+    """Parse "app.clients=DEBUG,sqlalchemy.engine=WARNING" into a dict."""
+    levels = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level: Optional[str] = None, module_levels: Optional[Mapping[str, str]] = None) -> None:
+    """
+    Set the root level and per-module overrides (LOG_LEVEL and LOG_LEVELS).
+    Handlers are only installed if nothing else (e.g. uvicorn) has.
+    """
+    root = logging.getLogger()
+    if not root.handlers:
+        logging.basicConfig(format=LOG_FORMAT)
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+    levels = parse_levels(settings.LOG_LEVELS) if module_levels is None else module_levels
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+
+def truncate_body(text: str, limit: Optional[int] = None) -> str:
+    """Cap logged response bodies; content-filter payloads run to megabytes."""
+    limit = settings.LOG_BODY_MAX if limit is None else limit
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} more characters]"
+
+
+def redact_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Headers safe to log: credentials and digest challenges are masked."""
+    return {
+        name: "<redacted>" if name.lower() in REDACTED_HEADERS else value
+        for name, value in headers.items()
+    }
@@ -0,0 +1,130 @@
+import time
+from typing import Callable
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Firewall client
+UPSTREAM_LATENCY = Histogram(
+    "sonicwall_upstream_request_seconds",
+    "Latency of requests to the firewall",
+    ["appliance", "endpoint", "method", "status"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+AUTHENTICATIONS = Counter(
+    "sonicwall_authentications_total",
+    "Digest logins to the firewall",
+    ["appliance", "result"]
+)
+REAUTHENTICATIONS = Counter(
+    "sonicwall_reauthentications_total",
+    "Logins forced by the firewall expiring the session (HTTP 401)",
+    ["appliance"]
+)
+CACHE_REQUESTS = Counter(
+    "sonicwall_cache_requests_total",
+    "Cached reporting reads by outcome (hit, stale, miss, refresh, circuit_open)",
+    ["endpoint", "result"]
+)
+POOL_IN_USE = Gauge(
+    "sonicwall_pool_connections_in_use",
+    "Requests currently holding a pooled connection",
+    ["appliance"]
+)
+POOL_MAX = Gauge(
+    "sonicwall_pool_connections_max",
+    "Size of the connection pool",
+    ["appliance"]
+)
+CIRCUIT_STATE = Gauge(
+    "sonicwall_circuit_state",
+    "Circuit breaker state: 0 closed, 1 half-open, 2 open",
+    ["appliance"]
+)
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+# API and database
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template, until the response body is sent",
+    ["method", "route", "status"]
+)
+DB_LATENCY = Histogram(
+    "db_query_seconds",
+    "Database statement latency by statement type",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+)
+DB_ERRORS = Counter(
+    "db_query_errors_total",
+    "Database statements that raised, by statement type",
+    ["operation"]
+)
+
+
+def track_circuit(appliance: str, state: Callable[[], str]) -> None:
+    """Report a breaker's state, read at scrape time."""
+    CIRCUIT_STATE.labels(appliance).set_function(lambda: CIRCUIT_STATES[state()])
+
+
+def _operation(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement executed on `engine` and count the ones that fail."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        DB_LATENCY.labels(_operation(statement)).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+        DB_ERRORS.labels(_operation(context.statement or "")).inc()
+
+
+class PrometheusMiddleware:
+    """
+    Record request latency per route template (not per raw path, so
+    /logs?cursor=... stays one series). Streaming responses are timed until
+    their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_LATENCY.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status)
+            ).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,25 +1,39 @@
+import asyncio
 import hashlib
-import os
-import time
+import hmac
 from typing import Optional
 from fastapi.security import HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services import nonce_store as nonces
 from app.services import user_service
+from app.services.user_cache import CachedUser, user_cache
 
 # Constants for digest auth
 REALM = "sonicwall_api"
 ALGORITHM = "SHA-256"
 QOP = "auth"
-NONCE_BYTES = 32
 
-def generate_nonce() -> str:
-    """Generate a random nonce for digest authentication."""
-    return hashlib.sha256(os.urandom(NONCE_BYTES)).hexdigest()
+class StaleNonceError(Exception):
+    """Credentials were valid but their nonce expired; challenge with stale=true."""
 
-def generate_digest_challenge() -> str:
+async def _nonce_store_call(method: str, *args):
+    """Call the nonce store, off the event loop when it is database-backed."""
+    store = nonces.nonce_store
+    if store.blocking:
+        return await asyncio.to_thread(getattr(store, method), *args)
+    return getattr(store, method)(*args)
+
+async def generate_nonce() -> str:
+    """Issue a nonce for digest authentication, valid for many requests."""
+    return await _nonce_store_call("issue")
+
+async def generate_digest_challenge(stale: bool = False) -> str:
     """Generate a digest authentication challenge."""
-    nonce = generate_nonce()
-    return f'Digest realm="{REALM}", nonce="{nonce}", algorithm={ALGORITHM}, qop="{QOP}"'
+    nonce = await generate_nonce()
+    challenge = f'Digest realm="{REALM}", nonce="{nonce}", algorithm={ALGORITHM}, qop="{QOP}"'
+    if stale:
+        challenge += ", stale=true"
+    return challenge
 
 def calculate_ha1(username: str, password: str) -> str:
     """Calculate HA1 = MD5(username:realm:password)"""
@@ -35,10 +49,30 @@ def calculate_response(ha1: str, nonce: str, nc: str, cnonce: str, qop: str, ha2
         f"{ha1}:{nonce}:{nc}:{cnonce}:{qop}:{ha2}".encode()
     ).hexdigest()
 
-def verify_digest_auth(credentials: HTTPAuthorizationCredentials, db: Session) -> Optional[dict]:
+async def get_auth_user(db: AsyncSession, username: Optional[str]) -> Optional[CachedUser]:
+    """The user with HA1 precomputed, from the user cache when possible."""
+    if not username:
+        return None
+    cached = user_cache.get(username)
+    if cached is not None:
+        return cached
+    user = await user_service.get_user_by_username(db, username)
+    if not user:
+        return None
+    return user_cache.put(CachedUser(
+        id=user.id,
+        username=user.username,
+        is_admin=user.is_admin,
+        ha1=calculate_ha1(user.username, user.password)
+    ))
+
+async def verify_digest_auth(credentials: HTTPAuthorizationCredentials, db: AsyncSession) -> Optional[CachedUser]:
     """
     Verify the digest authentication credentials.
     Returns the user if authentication is successful, None otherwise.
+    The nonce must have been issued by us and each request must carry a
+    higher nonce-count than the last; raises StaleNonceError when the
+    response is right but the nonce has expired.
     """
     if not credentials or not credentials.credentials:
         return None
@@ -48,21 +82,22 @@ def verify_digest_auth(credentials: HTTPAuthorizationCredentials, db: Session) -
         item.split("=", 1) for item in credentials.credentials[7:].split(",")
     )
     
-    # Clean up the parsed values
-    for key in auth_dict:
-        auth_dict[key] = auth_dict[key].strip().strip('"')
+    # Clean up the parsed keys and values
+    auth_dict = {
+        key.strip(): value.strip().strip('"')
+        for key, value in auth_dict.items()
+    }
 
-    # Get user from database
-    user = user_service.get_user_by_username(db, auth_dict.get("username"))
+    # Get user (and HA1) from the cache, falling back to the database
+    user = await get_auth_user(db, auth_dict.get("username"))
     if not user:
         return None
 
     # Calculate expected response
-    ha1 = calculate_ha1(user.username, user.password)
     ha2 = calculate_ha2(auth_dict.get("method", "GET"), auth_dict.get("uri", "/"))
     
     expected_response = calculate_response(
-        ha1,
+        user.ha1,
         auth_dict.get("nonce"),
         auth_dict.get("nc"),
         auth_dict.get("cnonce"),
@@ -70,7 +105,17 @@ def verify_digest_auth(credentials: HTTPAuthorizationCredentials, db: Session) -
         ha2
     )
 
-    if auth_dict.get("response") == expected_response:
-        return user
-    
-    return None 
\ No newline at end of file
+    if not hmac.compare_digest(auth_dict.get("response", "").encode(), expected_response.encode()):
+        return None
+
+    # Only a correct response may advance the nonce-count
+    try:
+        nc = int(auth_dict.get("nc", ""), 16)
+    except ValueError:
+        return None
+    result = await _nonce_store_call("use", auth_dict.get("nonce", ""), nc)
+    if result == nonces.STALE:
+        raise StaleNonceError()
+    if result != nonces.VALID:
+        return None
+    return user 
\ No newline at end of file
@@ -0,0 +1,158 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # Tracing is optional
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+# Longest SQL statement recorded on a span
+MAX_STATEMENT_LENGTH = 1000
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def set_status(self, status: Any) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+def configure_tracing() -> bool:
+    """
+    Install a tracer provider exporting to TRACING_EXPORTER ("file" or
+    "otlp"). Returns False, leaving tracing a no-op, when disabled or when
+    the OpenTelemetry SDK (or the OTLP exporter) isn't installed.
+    """
+    exporter_name = settings.TRACING_EXPORTER.lower()
+    if exporter_name == "none":
+        return False
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        if exporter_name == "file":
+            exporter = ConsoleSpanExporter(
+                out=open(settings.TRACING_FILE, "a"),
+                formatter=lambda span: span.to_json(indent=None) + "\n"
+            )
+        elif exporter_name == "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT or None)
+        else:
+            logger.warning("Unknown TRACING_EXPORTER %r, tracing disabled", settings.TRACING_EXPORTER)
+            return False
+    except ImportError:
+        logger.warning("TRACING_EXPORTER=%s needs the OpenTelemetry SDK/exporter packages", exporter_name)
+        return False
+
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return True
+
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, client: bool = False) -> Iterator[Any]:
+    """
+    Span around a block, as a child of the current span. Exceptions are
+    recorded on the span and re-raised. Without OpenTelemetry this yields
+    a span that ignores everything.
+    """
+    if trace is None:
+        yield _NoopSpan()
+        return
+    kind = SpanKind.CLIENT if client else SpanKind.INTERNAL
+    with trace.get_tracer(__name__).start_as_current_span(name, kind=kind, attributes=attributes) as span:
+        yield span
+
+
+def trace_engine(engine: Engine) -> None:
+    """Add a span for every statement executed on `engine`."""
+    if trace is None:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        span = trace.get_tracer(__name__).start_span(
+            f"db {operation}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.operation": operation,
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            }
+        )
+        conn.info.setdefault("query_spans", []).append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_spans"].pop().end()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        spans = context.connection.info.get("query_spans") if context.connection is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
+
+
+class TracingMiddleware:
+    """
+    Server span per API request, continuing a W3C traceparent sent by the
+    caller. The span is named after the route template once routing is done.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or trace is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        tracer = trace.get_tracer(__name__)
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=propagate.extract(headers),
+            kind=SpanKind.SERVER,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]}
+        ) as span:
+            started = time.perf_counter()
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    span.set_attribute("http.time_to_headers_ms", (time.perf_counter() - started) * 1000)
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{scope['method']} {route.path}")
+                    span.set_attribute("http.route", route.path)
@@ -0,0 +1,90 @@
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.models.log_event import LogEvent
+from app.models.metric_rollup import MetricRollup
+
+logger = logging.getLogger(__name__)
+
+# Daily partitions of log_events are named log_events_YYYYMMDD
+PARTITION_PREFIX = f"{LogEvent.__tablename__}_"
+PARTITION_DATE_FORMAT = "%Y%m%d"
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day.strftime(PARTITION_DATE_FORMAT)}"
+
+
+def create_log_partitions(engine: Engine, days: Iterable[date]) -> None:
+    """Create the daily partitions for `days` that don't exist yet."""
+    with engine.begin() as conn:
+        for day in days:
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(day)} "
+                f"PARTITION OF {LogEvent.__tablename__} "
+                f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') "
+                f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00')"
+            ))
+
+
+def ensure_log_partitions(engine: Engine, start: date, days_ahead: int = 2) -> None:
+    """Create the daily partitions from `start` through today + `days_ahead`."""
+    today = datetime.now(timezone.utc).date()
+    last = today + timedelta(days=days_ahead)
+    create_log_partitions(engine, (start + timedelta(days=n) for n in range((last - start).days + 1)))
+
+
+def list_log_partitions(engine: Engine) -> List[str]:
+    with engine.connect() as conn:
+        return list(conn.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ), {"parent": LogEvent.__tablename__}).scalars())
+
+
+def _partition_day(name: str) -> Optional[date]:
+    try:
+        return datetime.strptime(name[len(PARTITION_PREFIX):], PARTITION_DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def drop_expired_log_partitions(engine: Engine, retention_days: int) -> List[str]:
+    """
+    Drop whole daily partitions older than the retention period. This
+    replaces DELETE-based cleanup: no dead tuples, no vacuum debt.
+    """
+    cutoff = datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+    expired = [
+        name for name in list_log_partitions(engine)
+        if (day := _partition_day(name)) is not None and day < cutoff
+    ]
+    with engine.begin() as conn:
+        for name in expired:
+            conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    if expired:
+        logger.info("Dropped expired log partitions: %s", ", ".join(expired))
+    return expired
+
+
+def create_log_storage(engine: Engine, lookback_days: int = 1) -> None:
+    """
+    Create the partitioned log table, its indexes and current partitions,
+    plus the metric rollup table fed by the log writer.
+    """
+    LogEvent.__table__.create(engine, checkfirst=True)
+    MetricRollup.__table__.create(engine, checkfirst=True)
+    today = datetime.now(timezone.utc).date()
+    ensure_log_partitions(engine, today - timedelta(days=lookback_days))
+
+
+def maintain_log_partitions(engine: Engine, retention_days: int, days_ahead: int = 2) -> None:
+    """Pre-create upcoming partitions and drop expired ones."""
+    today = datetime.now(timezone.utc).date()
+    ensure_log_partitions(engine, today, days_ahead)
+    if retention_days > 0:
+        drop_expired_log_partitions(engine, retention_days)
@@ -1,6 +1,65 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
+from app.clients.session_manager import sonicwall_sessions
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.core.metrics import PrometheusMiddleware, render_metrics
+from app.core.tracing import TracingMiddleware, configure_tracing
+from app.db.session import async_engine, engine
+from app.services.appliance_service import refresh_appliances
+from app.services.collection_relay import RelayListener
+from app.services.event_broker import event_broker
+from app.services.session_cache import session_activity
+from app.services.session_sweeper import SessionSweeper
+from app.services.status_collector import status_collector
+from app.services.user_cache import UserChangeListener, user_cache
+from app.services.log_collector import log_collector
+
+configure_logging()
+configure_tracing()
+
+user_changes = UserChangeListener(async_engine, user_cache)
+session_sweeper = SessionSweeper(
+    engine,
+    interval=settings.SESSION_SWEEP_INTERVAL,
+    batch_size=settings.SESSION_SWEEP_BATCH_SIZE
+)
+collection_relay = RelayListener(async_engine, engine, status_collector, event_broker)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Register the firewalls stored in the appliance registry
+    await refresh_appliances()
+    # Drop cached users as soon as any process changes them
+    if settings.USER_CACHE_TTL > 0:
+        user_changes.start()
+    session_activity.start()
+    if settings.SESSION_SWEEP_INTERVAL > 0:
+        session_sweeper.start()
+    # Pre-warm status snapshots so API reads don't wait on the firewall,
+    # unless collection has been handed to app.worker processes
+    collect_here = settings.COLLECTION_MODE == "inprocess" and settings.SONICWALL_HOST
+    if settings.SONICWALL_POLL_ENABLED and collect_here:
+        status_collector.start()
+    if settings.LOG_COLLECTION_ENABLED and collect_here:
+        log_collector.start()
+    # Otherwise snapshots and live events come from the workers
+    if settings.COLLECTION_MODE == "worker":
+        collection_relay.start()
+    yield
+    # End open event streams so shutdown doesn't wait on them
+    event_broker.close()
+    await log_collector.stop()
+    await status_collector.stop()
+    await collection_relay.stop()
+    await user_changes.stop()
+    await session_sweeper.stop()
+    # Write the last batch of session activity
+    await session_activity.stop()
+    # Log out of the shared firewall management session
+    await sonicwall_sessions.close()
 
 app = FastAPI(
     title="SonicWall Management API",
@@ -8,7 +67,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -20,4 +80,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(api_router, prefix="/api/v1") 
\ No newline at end of file
+app.add_middleware(PrometheusMiddleware)
+app.add_middleware(TracingMiddleware)
+
+app.include_router(api_router, prefix="/api/v1")
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type) 
\ No newline at end of file
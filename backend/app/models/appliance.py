@@ -0,0 +1,28 @@
+from sqlalchemy import Boolean, Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+from app.clients.sonicwall import ApplianceConfig
+
+class Appliance(Base):
+    __tablename__ = "appliances"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    host = Column(String, nullable=False)
+    port = Column(Integer, nullable=False, default=443)
+    username = Column(String, nullable=False)
+    password = Column(String, nullable=False)  # Needed in clear for digest auth
+    verify_ssl = Column(Boolean, default=False)
+    enabled = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def to_config(self) -> ApplianceConfig:
+        return ApplianceConfig(
+            name=self.name,
+            host=self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            verify_ssl=bool(self.verify_ssl)
+        )
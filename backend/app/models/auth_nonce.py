@@ -0,0 +1,11 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+from app.db.base_class import Base
+
+class AuthNonce(Base):
+    __tablename__ = "auth_nonces"
+
+    # Digest nonces issued by any API process, with the highest nonce-count
+    # accepted so far, when nonces are shared through the database
+    nonce = Column(String, primary_key=True)
+    issued_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_nc = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,14 @@
+from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base_class import Base
+
+class CollectedStatus(Base):
+    __tablename__ = "collected_status"
+
+    # Latest status snapshot per appliance and section, written by
+    # collection workers for the API processes to serve
+    appliance = Column(String, primary_key=True)
+    section = Column(String, primary_key=True)                          # e.g. ips
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+    digest = Column(String(64), nullable=False)                         # status_digest() of data
+    data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
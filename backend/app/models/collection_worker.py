@@ -0,0 +1,16 @@
+from sqlalchemy import JSON, Column, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class CollectionWorker(Base):
+    __tablename__ = "collection_workers"
+
+    # Heartbeats of running `python -m app.worker` processes; the number of
+    # live rows decides how many appliances each worker claims
+    worker_id = Column(String, primary_key=True)
+    hostname = Column(String, nullable=False)
+    pid = Column(Integer, nullable=False)
+    appliances = Column(JSON().with_variant(ARRAY(String), "postgresql"), nullable=False, default=list)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    heartbeat_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
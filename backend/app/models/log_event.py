@@ -0,0 +1,37 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, text
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+# Document indexed for full-text search; queries must use the same expression
+# for the GIN index to apply
+SEARCH_DOCUMENT = "to_tsvector('english', coalesce(message, '') || ' ' || coalesce(notes, ''))"
+
+class LogEvent(Base):
+    __tablename__ = "log_events"
+    __table_args__ = (
+        Index("ix_log_events_timestamp_priority_category", "timestamp", "priority", "category"),
+        Index("ix_log_events_search", text(SEARCH_DOCUMENT), postgresql_using="gin"),
+        # Range-partitioned by day, see app.db.partitions
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
+    # SonicOS log ids are unique per appliance; the partition key has to be
+    # part of every unique constraint, so it is included in the primary key
+    appliance = Column(String, primary_key=True)
+    log_id = Column(BigInteger, primary_key=True)
+    timestamp = Column(DateTime(timezone=True), primary_key=True)
+    category = Column(String)
+    priority = Column(String)
+    severity = Column(String, nullable=False)
+    src_int = Column(String)
+    dst_int = Column(String)
+    src_ip = Column(String)
+    src_port = Column(Integer)
+    dst_ip = Column(String)
+    dst_port = Column(Integer)
+    ip_protocol = Column(String)
+    user_name = Column(String)
+    application = Column(String)
+    notes = Column(Text)
+    message = Column(Text)
+    ingested_at = Column(DateTime(timezone=True), server_default=func.now())
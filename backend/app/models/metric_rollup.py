@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, String
+from app.db.base_class import Base
+
+class MetricRollup(Base):
+    __tablename__ = "metric_rollups"
+    __table_args__ = (
+        Index("ix_metric_rollups_metric_granularity_bucket", "metric", "granularity", "bucket_start"),
+    )
+
+    appliance = Column(String, primary_key=True)
+    metric = Column(String, primary_key=True)        # e.g. threats_blocked
+    granularity = Column(String, primary_key=True)   # 1m, 1h or 1d
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    count = Column(BigInteger, nullable=False)       # events or samples in the bucket
+    total = Column(Float, nullable=False)            # sum of sample values
+    minimum = Column(Float)                          # gauges only
+    maximum = Column(Float)                          # gauges only
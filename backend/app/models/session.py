@@ -1,13 +1,20 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index, text
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Only active sessions are ever looked up by user or expiry, and
+        # they are a small fraction of the table
+        Index("ix_sessions_active_user_id", "user_id", "expires_at", postgresql_where=text("is_active")),
+        Index("ix_sessions_active_expires_at", "expires_at", postgresql_where=text("is_active")),
+    )
 
     id = Column(String, primary_key=True)  # UUID
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True), nullable=False)
-    last_activity = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now()) 
\ No newline at end of file
+    # Written in batches by the session activity writer, not on every update
+    last_activity = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,13 @@
+from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base_class import Base
+
+class StatusHistory(Base):
+    __tablename__ = "status_history"
+
+    # One row per change of a polled status section, not per poll
+    appliance = Column(String, primary_key=True)
+    section = Column(String, primary_key=True)                          # e.g. ips
+    observed_at = Column(DateTime(timezone=True), primary_key=True)    # poll that first saw this content
+    digest = Column(String(64), nullable=False)                         # status_digest() of data
+    data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
@@ -0,0 +1,28 @@
+from typing import Any, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class ApplianceBase(BaseModel):
+    name: str
+    host: str
+    port: int = 443
+    username: str
+    verify_ssl: bool = False
+    enabled: bool = True
+
+class ApplianceCreate(ApplianceBase):
+    password: str
+
+class ApplianceResponse(ApplianceBase):
+    id: int
+    created_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class FleetResult(BaseModel):
+    appliance: str
+    status: str  # ok, error or timeout
+    elapsed_ms: float
+    data: Optional[Any] = None
+    error: Optional[str] = None
@@ -0,0 +1,27 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class LogEventResponse(BaseModel):
+    # Every field is optional: only the columns requested via `fields` are returned
+    appliance: Optional[str] = None
+    log_id: Optional[int] = None
+    timestamp: Optional[datetime] = None
+    category: Optional[str] = None
+    priority: Optional[str] = None
+    severity: Optional[str] = None
+    src_int: Optional[str] = None
+    dst_int: Optional[str] = None
+    src_ip: Optional[str] = None
+    src_port: Optional[int] = None
+    dst_ip: Optional[str] = None
+    dst_port: Optional[int] = None
+    ip_protocol: Optional[str] = None
+    user_name: Optional[str] = None
+    application: Optional[str] = None
+    notes: Optional[str] = None
+    message: Optional[str] = None
+
+class LogPage(BaseModel):
+    items: list[LogEventResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,17 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class MetricPoint(BaseModel):
+    bucket_start: datetime
+    value: Optional[float] = None
+    count: int
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+class MetricSeries(BaseModel):
+    metric: str
+    granularity: str
+    start: datetime
+    end: datetime
+    points: List[MetricPoint]
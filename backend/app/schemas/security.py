@@ -1,4 +1,5 @@
 from typing import Optional, Any
+from datetime import datetime
 from pydantic import BaseModel
 
 class SecurityServicesStatus(BaseModel):
@@ -62,4 +63,20 @@ class ContentFilteringStatus(BaseModel):
     total_requests_today: Optional[int] = None
     total_blocked_today: Optional[int] = None
     categories: Optional[list[ContentFilteringCategory]] = None
-    extra: Optional[dict[str, Any]] = None
\ No newline at end of file
+    extra: Optional[dict[str, Any]] = None
+
+class SecurityOverviewSection(BaseModel):
+    status: str  # "ok" or "error"
+    elapsed_ms: float
+    fetched_at: Optional[datetime] = None  # Set when served from a background snapshot
+    error: Optional[str] = None
+
+class SecurityOverview(BaseModel):
+    services: Optional[SecurityServicesStatus] = None
+    gateway_av: Optional[GatewayAntiVirusStatus] = None
+    ips: Optional[IntrusionPreventionStatus] = None
+    botnet: Optional[BotnetStatus] = None
+    anti_spyware: Optional[AntiSpywareStatus] = None
+    content_filtering: Optional[ContentFilteringStatus] = None
+    sections: dict[str, SecurityOverviewSection]
+    elapsed_ms: float
@@ -0,0 +1,14 @@
+from typing import Any, Dict, List
+from datetime import datetime
+from pydantic import BaseModel
+
+class StatusChange(BaseModel):
+    observed_at: datetime
+    digest: str
+    changed: List[str]  # Fields that differ from the previous change
+    data: Dict[str, Any]
+
+class StatusHistoryResponse(BaseModel):
+    appliance: str
+    section: str
+    changes: List[StatusChange]
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.clients.session_manager import SonicWallSessionManager, sonicwall_sessions
+from app.clients.sonicwall import ApplianceConfig
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.appliance import Appliance
+from app.schemas.appliance import ApplianceCreate
+
+logger = logging.getLogger(__name__)
+
+# The registry table is created once per process; later reloads only query
+_registry_created = False
+# When the shared session manager was last loaded from the registry
+_refreshed_at: Optional[float] = None
+_refresh_lock = asyncio.Lock()
+
+def list_appliances(db: Session) -> List[Appliance]:
+    return db.query(Appliance).order_by(Appliance.name).all()
+
+def get_appliance(db: Session, name: str) -> Optional[Appliance]:
+    return db.query(Appliance).filter(Appliance.name == name).first()
+
+def create_appliance(db: Session, appliance: ApplianceCreate) -> Appliance:
+    db_appliance = Appliance(**appliance.dict())
+    db.add(db_appliance)
+    db.commit()
+    db.refresh(db_appliance)
+    return db_appliance
+
+def delete_appliance(db: Session, name: str) -> bool:
+    deleted = db.query(Appliance).filter(Appliance.name == name).delete()
+    db.commit()
+    return deleted > 0
+
+def load_appliance_configs() -> List[ApplianceConfig]:
+    """Connection details of every enabled appliance in the registry."""
+    global _registry_created
+    if not _registry_created:
+        Appliance.__table__.create(engine, checkfirst=True)
+        _registry_created = True
+    with SessionLocal() as db:
+        return [
+            appliance.to_config()
+            for appliance in db.query(Appliance).filter(Appliance.enabled == True)
+        ]
+
+async def refresh_appliances(sessions: SonicWallSessionManager = sonicwall_sessions) -> List[str]:
+    """
+    Reload the registry into the session manager. Returns the registered
+    appliance names; on database errors the current registration is kept.
+    """
+    global _refreshed_at
+    try:
+        configs = await asyncio.to_thread(load_appliance_configs)
+    except Exception:
+        logger.exception("Loading the appliance registry failed")
+        return sessions.appliances
+    await sessions.update(configs)
+    if sessions is sonicwall_sessions:
+        _refreshed_at = time.monotonic()
+    return sessions.appliances
+
+async def registered_appliances() -> List[str]:
+    """
+    Appliances registered with the shared session manager, reloaded from
+    the registry when older than APPLIANCE_REGISTRY_TTL seconds. Changes
+    made through this process's API are picked up at once.
+    """
+    async with _refresh_lock:
+        if _refreshed_at is None or time.monotonic() - _refreshed_at >= settings.APPLIANCE_REGISTRY_TTL:
+            await refresh_appliances()
+    return sonicwall_sessions.appliances
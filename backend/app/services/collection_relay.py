@@ -0,0 +1,259 @@
+"""
+Hands what collection workers gather to the API processes when
+COLLECTION_MODE=worker, through Postgres.
+
+Workers upsert every polled status section into collected_status and
+announce it with NOTIFY in the same transaction, so a snapshot is never
+announced before it can be read. New log events are announced with NOTIFY
+directly. Each API process LISTENs, copies status snapshots into its
+status collector (which API reads are served from) and publishes both to
+its event broker for the live streams.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.encoding import json_default
+from app.models.collected_status import CollectedStatus
+from app.services.event_broker import EventBroker
+from app.services.log_query import as_utc
+from app.services.status_collector import StatusCollector, StatusSnapshot
+
+logger = logging.getLogger(__name__)
+
+RELAY_CHANNEL = "collection_events"
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_PAYLOAD_LIMIT = 7900
+# Free-text log fields are shortened until an event fits
+TRUNCATED_FIELDS = ("message", "notes")
+
+_NOTIFY = text(f"SELECT pg_notify('{RELAY_CHANNEL}', :payload)")
+
+
+def create_relay_storage(engine: Engine) -> None:
+    CollectedStatus.__table__.create(engine, checkfirst=True)
+
+
+def store_snapshot(engine: Engine, appliance: str, section: str, snapshot: StatusSnapshot) -> None:
+    """Save the latest snapshot of a section and announce it on commit."""
+    statement = insert(CollectedStatus).values(
+        appliance=appliance,
+        section=section,
+        fetched_at=snapshot.fetched_at,
+        digest=snapshot.digest,
+        data=snapshot.data
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["appliance", "section"],
+        set_={
+            "fetched_at": statement.excluded.fetched_at,
+            "digest": statement.excluded.digest,
+            "data": statement.excluded.data,
+        }
+    )
+    payload = json.dumps({"type": "status", "appliance": appliance, "section": section})
+    with engine.begin() as conn:
+        conn.execute(statement)
+        conn.execute(_NOTIFY, {"payload": payload})
+
+
+def load_snapshots(
+    engine: Engine,
+    appliance: Optional[str] = None,
+    section: Optional[str] = None
+) -> List[CollectedStatus]:
+    statement = select(CollectedStatus)
+    if appliance is not None:
+        statement = statement.where(CollectedStatus.appliance == appliance)
+    if section is not None:
+        statement = statement.where(CollectedStatus.section == section)
+    with engine.connect() as conn:
+        return list(conn.execute(statement))
+
+
+def log_payload(data: Dict[str, Any]) -> Optional[str]:
+    """A log event as a NOTIFY payload, or None if it can't be made to fit."""
+    data = dict(data)
+    for limit in (None, 1000, 100, 0):
+        if limit is not None:
+            for name in TRUNCATED_FIELDS:
+                if isinstance(data.get(name), str):
+                    data[name] = data[name][:limit]
+        payload = json.dumps({"type": "log", "data": data}, default=json_default)
+        if len(payload.encode()) < NOTIFY_PAYLOAD_LIMIT:
+            return payload
+    return None
+
+
+class RelayBroker:
+    """
+    Stands in for the EventBroker in collection workers: log events
+    published by the collectors are sent to the API processes with NOTIFY,
+    batched every `flush_interval` seconds.
+    """
+
+    def __init__(self, engine: Engine, flush_interval: float = 1.0):
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self._pending: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        if event_type != "log":
+            # Status changes travel with their snapshots, see store_snapshot
+            return
+        payload = log_payload(data)
+        if payload is None:
+            logger.warning("Log event %s is too large to relay", data.get("id"))
+            return
+        self._pending.append(payload)
+
+    def _notify(self, payloads: List[str]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(_NOTIFY, [{"payload": payload} for payload in payloads])
+
+    async def flush(self) -> int:
+        payloads, self._pending = self._pending, []
+        if payloads:
+            await asyncio.to_thread(self._notify, payloads)
+        return len(payloads)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                # Live streams are best effort; the events are stored anyway
+                logger.exception("Relaying log events failed")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="collection-relay")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Relaying the last log events failed")
+
+
+class RelayListener:
+    """
+    LISTENs for what collection workers announce, on a connection held
+    from the async engine. Snapshots of `collector`'s appliance are copied
+    into it; status changes of every appliance and new log events are
+    published to `broker`. Snapshots are read with the sync `engine`.
+    Every snapshot is reloaded whenever listening (re)starts, since
+    announcements may have been missed in between.
+    """
+
+    def __init__(
+        self,
+        async_engine: Optional[AsyncEngine],
+        engine: Engine,
+        collector: StatusCollector,
+        broker: EventBroker,
+        retry_interval: float = 30.0
+    ):
+        self.async_engine = async_engine
+        self.engine = engine
+        self.collector = collector
+        self.broker = broker
+        self.retry_interval = retry_interval
+        # Digest last seen per (appliance, section)
+        self._digests: Dict[tuple, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def apply(self, row: CollectedStatus) -> None:
+        """Take in one stored snapshot, publishing it if its content changed."""
+        snapshot = StatusSnapshot(row.data, as_utc(row.fetched_at), row.digest)
+        key = (row.appliance, row.section)
+        previous = self._digests.get(key)
+        self._digests[key] = row.digest
+        if row.appliance == self.collector.appliance:
+            self.collector.put_snapshot(row.section, snapshot)
+        if previous != row.digest:
+            self.broker.publish("status", {
+                "appliance": row.appliance,
+                "section": row.section,
+                "fetched_at": snapshot.fetched_at,
+                "data": row.data,
+            })
+
+    async def reload(self) -> None:
+        for row in await asyncio.to_thread(load_snapshots, self.engine):
+            self.apply(row)
+
+    async def dispatch(self, payload: str) -> None:
+        """Handle one notification."""
+        message = json.loads(payload)
+        if message["type"] == "log":
+            data = message["data"]
+            if isinstance(data.get("timestamp"), str):
+                data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+            self.broker.publish("log", data)
+        elif message["type"] == "status":
+            rows = await asyncio.to_thread(
+                load_snapshots, self.engine, message["appliance"], message["section"]
+            )
+            for row in rows:
+                self.apply(row)
+
+    async def _listen(self) -> None:
+        await asyncio.to_thread(create_relay_storage, self.engine)
+        async with self.async_engine.connect() as conn:
+            connection = (await conn.get_raw_connection()).driver_connection
+            # None marks a lost connection
+            notifications: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+            def on_notify(connection, pid, channel, payload):
+                notifications.put_nowait(payload)
+
+            def on_terminate(connection):
+                notifications.put_nowait(None)
+
+            await connection.add_listener(RELAY_CHANNEL, on_notify)
+            connection.add_termination_listener(on_terminate)
+            logger.info("Listening for collection workers")
+            try:
+                # Only after LISTEN, so no change slips in between
+                await self.reload()
+                while (payload := await notifications.get()) is not None:
+                    try:
+                        await self.dispatch(payload)
+                    except Exception:
+                        logger.exception("Handling a collection worker notification failed")
+            finally:
+                # Never hand a LISTENing connection back to the pool
+                await conn.invalidate()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Collection relay unavailable, retrying in %ss", self.retry_interval, exc_info=True)
+            await asyncio.sleep(self.retry_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="collection-relay-listener")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,108 @@
+import asyncio
+import itertools
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Set
+from app.core.config import settings
+from app.core.encoding import json_default
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BrokerEvent:
+    id: int
+    type: str  # "log" or "status"
+    data: Dict[str, Any]
+    _payload: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def payload(self) -> str:
+        # Serialized once, however many subscribers receive the event
+        if self._payload is None:
+            self._payload = json.dumps(self.data, default=json_default)
+        return self._payload
+
+
+@dataclass(eq=False)
+class Subscription:
+    """
+    One subscriber's bounded queue plus its server-side filters. Empty
+    filters match everything. When the queue is full the oldest event is
+    dropped, so a slow consumer never holds up the publisher or the other
+    subscribers; the number of dropped events is reported as `lagged`.
+    """
+
+    queue: asyncio.Queue
+    types: FrozenSet[str] = frozenset()
+    severities: FrozenSet[str] = frozenset()
+    categories: FrozenSet[str] = frozenset()
+    sections: FrozenSet[str] = frozenset()
+    lagged: int = 0
+
+    def matches(self, event: BrokerEvent) -> bool:
+        if self.types and event.type not in self.types:
+            return False
+        if event.type == "log":
+            if self.severities and event.data.get("severity") not in self.severities:
+                return False
+            if self.categories and event.data.get("category") not in self.categories:
+                return False
+        if event.type == "status":
+            if self.sections and event.data.get("section") not in self.sections:
+                return False
+        return True
+
+    def offer(self, event: Optional[BrokerEvent]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.lagged += 1
+        self.queue.put_nowait(event)
+
+    def take_lagged(self) -> int:
+        lagged, self.lagged = self.lagged, 0
+        return lagged
+
+
+class EventBroker:
+    """
+    In-process fan-out of newly ingested log events and status changes.
+    The collectors publish once and every open stream reads from its own
+    queue, so subscribers add no upstream polling.
+    """
+
+    def __init__(self, queue_size: int = 1000):
+        self.queue_size = queue_size
+        self._subscriptions: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, **filters: FrozenSet[str]) -> Subscription:
+        subscription = Subscription(asyncio.Queue(maxsize=self.queue_size), **filters)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Queue an event for every matching subscriber without waiting."""
+        if not self._subscriptions:
+            return
+        event = BrokerEvent(next(self._ids), event_type, data)
+        for subscription in self._subscriptions:
+            if subscription.matches(event):
+                subscription.offer(event)
+
+    def close(self) -> None:
+        """End every open stream, e.g. on shutdown."""
+        for subscription in list(self._subscriptions):
+            subscription.offer(None)
+        self._subscriptions.clear()
+
+
+event_broker = EventBroker(queue_size=settings.EVENT_STREAM_QUEUE_SIZE)
@@ -0,0 +1,60 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Iterable
+from app.clients.session_manager import SonicWallSessionManager
+from app.clients.sonicwall import STATUS_METHODS
+
+
+async def _query_appliance(
+    sessions: SonicWallSessionManager,
+    appliance: str,
+    section: str,
+    semaphore: asyncio.Semaphore,
+    timeout: float
+) -> Dict:
+    async with semaphore:
+        # The timeout covers login and the call, not time spent queued
+        started = time.perf_counter()
+        try:
+            data = await asyncio.wait_for(_read(sessions, appliance, section), timeout)
+            result = {"status": "ok", "data": data}
+            if data is None:
+                result = {"status": "error", "error": "No data returned"}
+        except asyncio.TimeoutError:
+            result = {"status": "timeout", "error": f"No answer within {timeout:g}s"}
+        except Exception as e:
+            result = {"status": "error", "error": str(e) or type(e).__name__}
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return {"appliance": appliance, **result}
+
+
+async def _read(sessions: SonicWallSessionManager, appliance: str, section: str):
+    client = await sessions.get_client(appliance)
+    if client is None:
+        raise RuntimeError("Authentication failed")
+    return await getattr(client, STATUS_METHODS[section])()
+
+
+async def fan_out(
+    sessions: SonicWallSessionManager,
+    appliances: Iterable[str],
+    section: str,
+    concurrency: int = 10,
+    timeout: float = 15.0
+) -> AsyncIterator[Dict]:
+    """
+    Read one status section from every appliance concurrently, at most
+    `concurrency` at a time, yielding each result as soon as it is ready.
+    A slow or unreachable appliance only costs its own `timeout`.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.create_task(_query_appliance(sessions, appliance, section, semaphore, timeout))
+        for appliance in appliances
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Optional
+from app.core.config import settings
+from app.db.session import engine
+from app.db.partitions import create_log_storage, maintain_log_partitions
+from app.clients.logs import LogCheckpoint
+from app.clients.session_manager import SonicWallSessionManager, sonicwall_sessions
+from app.services.event_broker import EventBroker, event_broker
+from app.services.log_writer import LogBatchWriter, get_high_water
+
+logger = logging.getLogger(__name__)
+
+
+class LogCollector:
+    """
+    Periodically streams new firewall logs into the database.
+
+    Each run reads the window since the checkpoint (with overlap) and pushes
+    events through a LogBatchWriter. On startup the checkpoint resumes from
+    the newest stored event; the writer's upsert absorbs the overlap.
+    Daily log partitions are created ahead of time and expired ones dropped
+    at most once per LOG_PARTITION_MAINTENANCE_INTERVAL.
+
+    New events are also published to `broker` for live subscribers.
+    Set `manage_storage` to False when partitions are maintained elsewhere
+    (e.g. by one collection worker for the whole fleet).
+    """
+
+    def __init__(
+        self,
+        sessions: SonicWallSessionManager,
+        writer: LogBatchWriter,
+        interval: float = 300.0,
+        broker: Optional[EventBroker] = None,
+        manage_storage: bool = True
+    ):
+        self.sessions = sessions
+        self.writer = writer
+        self.interval = interval
+        self.broker = broker
+        self.manage_storage = manage_storage
+        self.checkpoint: Optional[LogCheckpoint] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_maintenance: Optional[float] = None
+
+    async def _maintain_storage(self) -> None:
+        if not self.manage_storage:
+            return
+        engine = self.writer.engine
+        if self._last_maintenance is None:
+            lookback_days = math.ceil(settings.SONICWALL_LOG_INITIAL_LOOKBACK / 86400)
+            await asyncio.to_thread(create_log_storage, engine, lookback_days)
+        elif time.monotonic() - self._last_maintenance < settings.LOG_PARTITION_MAINTENANCE_INTERVAL:
+            return
+        await asyncio.to_thread(
+            maintain_log_partitions,
+            engine,
+            settings.LOG_RETENTION_DAYS,
+            settings.LOG_PARTITION_DAYS_AHEAD
+        )
+        self._last_maintenance = time.monotonic()
+
+    async def collect(self) -> int:
+        """Run one collection window, returning the number of new rows."""
+        await self._maintain_storage()
+        # A checkpoint resumed from the database doesn't know which ids in
+        # the overlap were already stored, so don't re-announce them
+        publish_after = None
+        if self.checkpoint is None:
+            high_water = await asyncio.to_thread(
+                get_high_water, self.writer.engine, self.writer.appliance
+            )
+            self.checkpoint = LogCheckpoint(high_water=high_water)
+            publish_after = high_water
+        client = await self.sessions.get_client(self.writer.appliance or None)
+        if client is None:
+            return 0
+
+        # The window advances a copy of the checkpoint, which replaces it
+        # only once every event read has been flushed; after any failure the
+        # window is read again and the upsert absorbs what was stored
+        checkpoint = self.checkpoint.copy()
+        written_before = self.writer.rows_written
+        try:
+            async for event in client.stream_logs(checkpoint):
+                await self.writer.add(event)
+                if self.broker is not None and (publish_after is None or event["timestamp"] > publish_after):
+                    self.broker.publish("log", {"appliance": self.writer.appliance, **event})
+        finally:
+            await self.writer.flush()
+        self.checkpoint = checkpoint
+        return self.writer.rows_written - written_before
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                written = await self.collect()
+                logger.info("Collected %d new log events", written)
+            except Exception:
+                logger.exception("Log collection failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"log-collector-{self.writer.appliance}")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+def create_log_collector(
+    sessions: SonicWallSessionManager,
+    appliance: str,
+    broker: Optional[EventBroker] = None,
+    manage_storage: bool = True
+) -> LogCollector:
+    """A log collector for one appliance, configured from settings."""
+    return LogCollector(
+        sessions,
+        LogBatchWriter(
+            engine,
+            appliance=appliance,
+            batch_size=settings.LOG_WRITE_BATCH_SIZE,
+            flush_interval=settings.LOG_WRITE_FLUSH_INTERVAL,
+            method=settings.LOG_WRITE_METHOD,
+            rollups=settings.METRICS_ROLLUP_ENABLED
+        ),
+        interval=settings.SONICWALL_LOG_POLL_INTERVAL,
+        broker=broker,
+        manage_storage=manage_storage
+    )
+
+
+log_collector = create_log_collector(sonicwall_sessions, settings.SONICWALL_HOST, broker=event_broker)
@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
+from app.core.encoding import json_default
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+INTEGER_FIELDS = {"log_id", "src_port", "dst_port"}
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _export_csv(rows: Iterable[Dict[str, Any]], fields: List[str], chunk_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for chunk in _chunks(rows, chunk_size):
+        for row in chunk:
+            writer.writerow([
+                row[name].isoformat() if isinstance(row[name], datetime) else row[name]
+                for name in fields
+            ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _export_ndjson(rows: Iterable[Dict[str, Any]], fields: List[str], chunk_size: int) -> Iterator[bytes]:
+    for chunk in _chunks(rows, chunk_size):
+        yield "".join(
+            json.dumps({name: row[name] for name in fields}, default=json_default) + "\n"
+            for row in chunk
+        ).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream that hands written bytes back in pieces."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet footers hold absolute offsets, so report the total written
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def _parquet_schema(fields: List[str]):
+    types = []
+    for name in fields:
+        if name == "timestamp":
+            types.append(pa.field(name, pa.timestamp("us", tz="UTC")))
+        elif name in INTEGER_FIELDS:
+            types.append(pa.field(name, pa.int64()))
+        else:
+            types.append(pa.field(name, pa.string()))
+    return pa.schema(types)
+
+
+def _export_parquet(rows: Iterable[Dict[str, Any]], fields: List[str], chunk_size: int) -> Iterator[bytes]:
+    schema = _parquet_schema(fields)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        # One row group per chunk keeps memory at one chunk
+        for chunk in _chunks(rows, chunk_size):
+            columns = {name: [row[name] for row in chunk] for name in fields}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_rows(
+    rows: Iterable[Dict[str, Any]],
+    fields: List[str],
+    export_format: str,
+    chunk_size: int = 10000
+) -> Iterator[bytes]:
+    """Encode rows as CSV, NDJSON or Parquet, `chunk_size` rows at a time."""
+    if export_format == "csv":
+        return _export_csv(rows, fields, chunk_size)
+    if export_format == "ndjson":
+        return _export_ndjson(rows, fields, chunk_size)
+    if export_format == "parquet":
+        return _export_parquet(rows, fields, chunk_size)
+    raise ValueError(f"Unknown export format: {export_format}")
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a byte stream incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,153 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import Select, and_, func, literal_column, or_, select, tuple_
+from sqlalchemy.orm import Session
+from app.models.log_event import LogEvent, SEARCH_DOCUMENT
+
+# Dashboard time range presets
+TIME_RANGES = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+
+# Columns that can be requested through `fields`
+QUERYABLE_FIELDS = [
+    "appliance", "log_id", "timestamp", "category", "priority", "severity",
+    "src_int", "dst_int", "src_ip", "src_port", "dst_ip", "dst_port",
+    "ip_protocol", "user_name", "application", "notes", "message"
+]
+
+# Keyset ordering: newest first, ties broken by appliance and log id
+CURSOR_COLUMNS = ["timestamp", "appliance", "log_id"]
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Query bounds without an offset are taken to be UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class InvalidLogQuery(ValueError):
+    """Raised for malformed filters, fields or cursors."""
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    payload = [row["timestamp"].isoformat(), row["appliance"], row["log_id"]]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str, int]:
+    try:
+        timestamp, appliance, log_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(timestamp), str(appliance), int(log_id)
+    except (ValueError, TypeError):
+        raise InvalidLogQuery("Invalid cursor")
+
+
+@dataclass
+class LogQuery:
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    severities: List[str] = field(default_factory=list)
+    categories: List[str] = field(default_factory=list)
+    appliance: Optional[str] = None
+    src_ip: Optional[str] = None
+    dst_ip: Optional[str] = None
+    port: Optional[int] = None
+    application: Optional[str] = None
+    search: Optional[str] = None
+    fields: List[str] = field(default_factory=lambda: list(QUERYABLE_FIELDS))
+
+    @classmethod
+    def from_params(
+        cls,
+        time_range: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fields: Optional[str] = None,
+        **filters: Any
+    ) -> "LogQuery":
+        """Build a query from API parameters; `time_range` is a TIME_RANGES key."""
+        start, end = as_utc(start), as_utc(end)
+        if time_range is not None:
+            if time_range not in TIME_RANGES:
+                raise InvalidLogQuery(f"Unknown time range: {time_range}")
+            end = end or datetime.now(timezone.utc)
+            start = end - TIME_RANGES[time_range]
+
+        selected = list(QUERYABLE_FIELDS)
+        if fields:
+            selected = [name.strip() for name in fields.split(",") if name.strip()]
+            unknown = set(selected) - set(QUERYABLE_FIELDS)
+            if unknown:
+                raise InvalidLogQuery(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        for key in ("severities", "categories"):
+            value = filters.get(key)
+            filters[key] = [v.strip() for v in value.split(",") if v.strip()] if value else []
+        return cls(start=start, end=end, fields=selected, **filters)
+
+
+def build_log_select(query: LogQuery, cursor: Optional[str] = None) -> Select:
+    """
+    SELECT only the requested columns (plus the keyset columns), newest
+    first, resuming strictly after `cursor`.
+    """
+    columns = list(dict.fromkeys(query.fields + CURSOR_COLUMNS))
+    conditions = []
+    if query.start is not None:
+        conditions.append(LogEvent.timestamp >= query.start)
+    if query.end is not None:
+        conditions.append(LogEvent.timestamp < query.end)
+    if query.severities:
+        conditions.append(LogEvent.severity.in_([s.upper() for s in query.severities]))
+    if query.categories:
+        conditions.append(LogEvent.category.in_(query.categories))
+    if query.appliance:
+        conditions.append(LogEvent.appliance == query.appliance)
+    if query.src_ip:
+        conditions.append(LogEvent.src_ip == query.src_ip)
+    if query.dst_ip:
+        conditions.append(LogEvent.dst_ip == query.dst_ip)
+    if query.port is not None:
+        conditions.append(or_(LogEvent.src_port == query.port, LogEvent.dst_port == query.port))
+    if query.application:
+        conditions.append(LogEvent.application == query.application)
+    if query.search:
+        conditions.append(
+            literal_column(SEARCH_DOCUMENT).op("@@")(
+                func.websearch_to_tsquery("english", query.search)
+            )
+        )
+    if cursor is not None:
+        conditions.append(
+            tuple_(LogEvent.timestamp, LogEvent.appliance, LogEvent.log_id)
+            < tuple_(*decode_cursor(cursor))
+        )
+
+    return (
+        select(*(getattr(LogEvent, name) for name in columns))
+        .where(and_(*conditions))
+        .order_by(
+            LogEvent.timestamp.desc(),
+            LogEvent.appliance.desc(),
+            LogEvent.log_id.desc()
+        )
+    )
+
+
+def iter_log_rows(
+    db: Session,
+    statement: Select,
+    batch_size: int = 1000
+) -> Iterator[Dict[str, Any]]:
+    """Stream rows through a server-side cursor, `batch_size` at a time."""
+    result = db.execute(statement.execution_options(yield_per=batch_size))
+    for row in result.mappings():
+        yield dict(row)
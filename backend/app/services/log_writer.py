@@ -0,0 +1,182 @@
+import asyncio
+import io
+import logging
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+from psycopg2.extras import execute_values
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from app.db.partitions import create_log_partitions
+from app.models.log_event import LogEvent
+from app.services.metrics_service import LOG_ROLLUP_SQL
+
+logger = logging.getLogger(__name__)
+
+# Columns written by the batch writer, in COPY order
+LOG_COLUMNS = [
+    "appliance", "log_id", "timestamp", "category", "priority", "severity",
+    "src_int", "dst_int", "src_ip", "src_port", "dst_ip", "dst_port",
+    "ip_protocol", "user_name", "application", "notes", "message"
+]
+
+# Primary key of the partitioned log table
+UPSERT_KEY = ["appliance", "log_id", "timestamp"]
+
+_STAGE_COLUMNS = ", ".join(LOG_COLUMNS)
+
+
+def merge_stage_sql(rollups: bool) -> str:
+    """
+    Move staged rows into log_events, skipping ones already stored, and
+    optionally roll the newly inserted rows up into metric_rollups in the
+    same statement. Returns the number of inserted rows.
+    """
+    rollup_cte = f", rolled_up AS ({LOG_ROLLUP_SQL})" if rollups else ""
+    return (
+        f"WITH inserted AS ("
+        f"INSERT INTO log_events ({_STAGE_COLUMNS}) "
+        f"SELECT {_STAGE_COLUMNS} FROM log_events_stage "
+        f"ON CONFLICT ({', '.join(UPSERT_KEY)}) DO NOTHING "
+        f"RETURNING appliance, timestamp, severity)"
+        f"{rollup_cte} "
+        f"SELECT count(*) FROM inserted"
+    )
+
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value: Any) -> str:
+    """Encode one value for COPY ... FROM STDIN text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def event_to_row(appliance: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a normalized log event (see app.clients.logs) to a table row."""
+    row = {column: event.get(column) for column in LOG_COLUMNS}
+    row["appliance"] = appliance
+    row["log_id"] = event["id"]
+    return row
+
+
+class LogBatchWriter:
+    """
+    Buffers log events and writes them to Postgres in batches.
+
+    A batch is written when `batch_size` rows are buffered or
+    `flush_interval` seconds have passed since the last write. Rows are
+    upserted on (appliance, log_id, timestamp) with DO NOTHING, so
+    re-reading the overlap between collection windows never creates
+    duplicates.
+
+    Batches are loaded into a temporary staging table, with COPY
+    (method="copy") or a multi-row INSERT (method="insert"), then merged
+    into log_events by one statement that also updates the metric rollups
+    when `rollups` is set. Database work runs in a worker thread to keep
+    the event loop free.
+
+    Partitions are maintained for a window around today, but a resumed,
+    backfilled or clock-skewed batch can fall outside it, so the daily
+    partitions a batch needs are created before it is merged. Days already
+    covered are remembered to keep the DDL off the common path.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        appliance: str,
+        batch_size: int = 5000,
+        flush_interval: float = 5.0,
+        method: str = "copy",
+        rollups: bool = False
+    ):
+        if method not in ("copy", "insert"):
+            raise ValueError(f"Unknown log write method: {method}")
+        self.engine = engine
+        self.appliance = appliance
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.method = method
+        self.rollups = rollups
+        self.rows_written = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._partition_days: Set[date] = set()
+
+    async def add(self, event: Dict[str, Any]) -> None:
+        self._buffer.append(event_to_row(self.appliance, event))
+        if (len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write buffered rows, returning how many were newly inserted."""
+        rows, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        if not rows:
+            return 0
+        inserted = await asyncio.to_thread(self._write, rows)
+        self.rows_written += inserted
+        logger.debug("Wrote %d of %d log rows for %s", inserted, len(rows), self.appliance)
+        return inserted
+
+    def _stage_copy(self, cursor, rows: List[Dict[str, Any]]) -> None:
+        data = io.StringIO()
+        for row in rows:
+            data.write("\t".join(_copy_value(row[column]) for column in LOG_COLUMNS))
+            data.write("\n")
+        data.seek(0)
+        cursor.copy_expert(f"COPY log_events_stage ({_STAGE_COLUMNS}) FROM STDIN", data)
+
+    def _stage_insert(self, cursor, rows: List[Dict[str, Any]]) -> None:
+        execute_values(
+            cursor,
+            f"INSERT INTO log_events_stage ({_STAGE_COLUMNS}) VALUES %s",
+            [tuple(row[column] for column in LOG_COLUMNS) for row in rows],
+            page_size=len(rows)
+        )
+
+    def _ensure_partitions(self, rows: List[Dict[str, Any]]) -> None:
+        days = {row["timestamp"].astimezone(timezone.utc).date() for row in rows}
+        missing = sorted(days - self._partition_days)
+        if missing:
+            create_log_partitions(self.engine, missing)
+            self._partition_days.update(missing)
+
+    def _write(self, rows: List[Dict[str, Any]]) -> int:
+        self._ensure_partitions(rows)
+        raw = self.engine.raw_connection()
+        try:
+            with raw.cursor() as cursor:
+                cursor.execute(
+                    "CREATE TEMP TABLE log_events_stage "
+                    "(LIKE log_events INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                if self.method == "copy":
+                    self._stage_copy(cursor, rows)
+                else:
+                    self._stage_insert(cursor, rows)
+                cursor.execute(merge_stage_sql(self.rollups))
+                inserted = cursor.fetchone()[0]
+            raw.commit()
+            return inserted
+        except Exception:
+            raw.rollback()
+            # Expired partitions may have been dropped since they were created
+            self._partition_days.clear()
+            raise
+        finally:
+            raw.close()
+
+
+def get_high_water(engine: Engine, appliance: str) -> Optional[datetime]:
+    """Newest stored log timestamp for an appliance, used to resume collection."""
+    with engine.connect() as conn:
+        return conn.execute(
+            select(func.max(LogEvent.timestamp)).where(LogEvent.appliance == appliance)
+        ).scalar()
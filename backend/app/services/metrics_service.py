@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models.metric_rollup import MetricRollup
+
+# Rollup granularities, finest first, with the Postgres date_trunc unit
+GRANULARITIES = {
+    "1m": (timedelta(minutes=1), "minute"),
+    "1h": (timedelta(hours=1), "hour"),
+    "1d": (timedelta(days=1), "day"),
+}
+
+# Counter metrics derived from ingested logs: metric -> required severity
+# (None counts every event)
+LOG_METRICS = {
+    "log_events": None,
+    "threats_blocked": "ALERT",
+}
+
+
+
+def active_connections(data: Any) -> Optional[float]:
+    """Sum dpi_connections over the connection-status entries."""
+    entries = data if isinstance(data, list) else [data]
+    try:
+        return float(sum(int(entry["dpi_connections"]) for entry in entries))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# Gauges sampled from status snapshots: section -> (metric, extractor)
+STATUS_GAUGES: Dict[str, tuple[str, Callable[[Any], Optional[float]]]] = {
+    "connections": ("active_connections", active_connections),
+}
+
+# Every queryable metric and how its buckets become a value: counters report
+# the number of events, gauges the mean sample
+METRIC_KINDS: Dict[str, str] = {
+    **{metric: "counter" for metric in LOG_METRICS},
+    **{metric: "gauge" for metric, _ in STATUS_GAUGES.values()},
+}
+
+
+def _sql_text(value: Optional[str]) -> str:
+    return f"'{value}'" if value is not None else "NULL::text"
+
+
+# SQL rolling up rows returned by a data-modifying CTE named "inserted"
+# (columns appliance, timestamp, severity) into every granularity. It runs
+# in the same statement as the log insert, so only newly stored events are
+# counted and the rollup can never drift from the raw table.
+LOG_ROLLUP_SQL = """
+INSERT INTO metric_rollups (appliance, metric, granularity, bucket_start, count, total)
+SELECT i.appliance, m.metric, g.granularity,
+       date_trunc(g.unit, i.timestamp AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+       count(*), count(*)
+FROM inserted i
+CROSS JOIN (VALUES {granularities}) AS g(granularity, unit)
+JOIN (VALUES {metrics}) AS m(metric, severity)
+  ON m.severity IS NULL OR m.severity = i.severity
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (appliance, metric, granularity, bucket_start) DO UPDATE
+SET count = metric_rollups.count + EXCLUDED.count,
+    total = metric_rollups.total + EXCLUDED.total
+RETURNING 1
+""".format(
+    granularities=", ".join(f"('{name}', '{unit}')" for name, (_, unit) in GRANULARITIES.items()),
+    metrics=", ".join(
+        f"('{metric}', {_sql_text(severity)})" for metric, severity in LOG_METRICS.items()
+    )
+)
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its UTC bucket."""
+    timestamp = timestamp.astimezone(timezone.utc)
+    if granularity == "1m":
+        return timestamp.replace(second=0, microsecond=0)
+    if granularity == "1h":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def record_gauge(engine: Engine, appliance: str, metric: str, timestamp: datetime, value: float) -> None:
+    """Fold one gauge sample (e.g. active connections) into every granularity."""
+    rows = [
+        {
+            "appliance": appliance,
+            "metric": metric,
+            "granularity": granularity,
+            "bucket_start": bucket_start(timestamp, granularity),
+            "count": 1,
+            "total": value,
+            "minimum": value,
+            "maximum": value,
+        }
+        for granularity in GRANULARITIES
+    ]
+    statement = insert(MetricRollup).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["appliance", "metric", "granularity", "bucket_start"],
+        set_={
+            "count": MetricRollup.count + statement.excluded.count,
+            "total": MetricRollup.total + statement.excluded.total,
+            "minimum": func.least(MetricRollup.minimum, statement.excluded.minimum),
+            "maximum": func.greatest(MetricRollup.maximum, statement.excluded.maximum),
+        }
+    )
+    with engine.begin() as conn:
+        conn.execute(statement)
+
+
+def choose_granularity(start: datetime, end: datetime, max_points: int) -> str:
+    """The finest granularity whose bucket count for the range fits in max_points."""
+    span = end - start
+    for name, (width, _) in GRANULARITIES.items():
+        if span / width <= max_points:
+            return name
+    return list(GRANULARITIES)[-1]
+
+
+def get_metric_series(
+    db: Session,
+    metric: str,
+    start: datetime,
+    end: datetime,
+    granularity: str,
+    appliance: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Read one rollup series, combined across appliances unless one is given.
+    Each point carries `value`: the event count for counters, the mean
+    sample for gauges.
+    """
+    conditions = [
+        MetricRollup.metric == metric,
+        MetricRollup.granularity == granularity,
+        MetricRollup.bucket_start >= bucket_start(start, granularity),
+        MetricRollup.bucket_start < end,
+    ]
+    if appliance:
+        conditions.append(MetricRollup.appliance == appliance)
+    statement = (
+        select(
+            MetricRollup.bucket_start,
+            func.sum(MetricRollup.count).label("count"),
+            func.sum(MetricRollup.total).label("total"),
+            func.min(MetricRollup.minimum).label("minimum"),
+            func.max(MetricRollup.maximum).label("maximum"),
+        )
+        .where(*conditions)
+        .group_by(MetricRollup.bucket_start)
+        .order_by(MetricRollup.bucket_start)
+    )
+    points = []
+    for row in db.execute(statement).mappings():
+        point = dict(row)
+        if METRIC_KINDS.get(metric) == "gauge":
+            point["value"] = point["total"] / point["count"] if point["count"] else None
+        else:
+            point["value"] = float(point["count"])
+        points.append(point)
+    return points
@@ -0,0 +1,125 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.models.auth_nonce import AuthNonce
+
+NONCE_BYTES = 32
+
+# Outcomes of NonceStore.use()
+VALID = "valid"
+STALE = "stale"  # issued by us, but expired: the client should retry with a new nonce
+INVALID = "invalid"  # never issued (or forgotten), or a replayed nonce-count
+
+
+def new_nonce() -> str:
+    return hashlib.sha256(os.urandom(NONCE_BYTES)).hexdigest()
+
+
+class MemoryNonceStore:
+    """
+    Nonces issued by this process. A nonce stays usable for `lifetime`
+    seconds for any number of requests, as long as each request carries a
+    higher nonce-count than the last one accepted (RFC 7616 section 3.4).
+    At most `max_entries` nonces are remembered; the oldest are forgotten
+    first, and requests using them are rejected. Calls never wait, so the
+    store is used directly on the event loop and needs no locking.
+    """
+
+    # Whether calls wait on the database, so async callers run them in a thread
+    blocking = False
+
+    def __init__(self, lifetime: float = 300.0, max_entries: int = 10000):
+        self.lifetime = lifetime
+        self.max_entries = max_entries
+        # nonce -> [issued_at, last nonce-count]
+        self._nonces: "OrderedDict[str, list]" = OrderedDict()
+
+    def issue(self) -> str:
+        nonce = new_nonce()
+        self._nonces[nonce] = [time.monotonic(), 0]
+        while len(self._nonces) > self.max_entries:
+            self._nonces.popitem(last=False)
+        return nonce
+
+    def use(self, nonce: str, nc: int) -> str:
+        entry = self._nonces.get(nonce)
+        if entry is None:
+            return INVALID
+        issued_at, last_nc = entry
+        if time.monotonic() - issued_at >= self.lifetime:
+            del self._nonces[nonce]
+            return STALE
+        if nc <= last_nc:
+            return INVALID
+        entry[1] = nc
+        return VALID
+
+
+class DatabaseNonceStore:
+    """
+    Nonces shared by every API process through the auth_nonces table, so a
+    nonce issued by one worker is accepted by the others. Nonce-counts are
+    advanced with a single conditional UPDATE, so concurrent requests can't
+    both accept the same count. Expired rows are deleted as nonces are
+    issued.
+    """
+
+    blocking = True
+
+    def __init__(self, engine: Engine, lifetime: float = 300.0):
+        self.engine = engine
+        self.lifetime = lifetime
+        self._table_ready = False
+
+    def _ensure_table(self) -> None:
+        if not self._table_ready:
+            AuthNonce.__table__.create(self.engine, checkfirst=True)
+            self._table_ready = True
+
+    def issue(self) -> str:
+        self._ensure_table()
+        nonce = new_nonce()
+        now = datetime.now(timezone.utc)
+        with self.engine.begin() as conn:
+            conn.execute(delete(AuthNonce).where(AuthNonce.issued_at < now - timedelta(seconds=self.lifetime)))
+            conn.execute(insert(AuthNonce).values(nonce=nonce, issued_at=now, last_nc=0))
+        return nonce
+
+    def use(self, nonce: str, nc: int) -> str:
+        self._ensure_table()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.lifetime)
+        with self.engine.begin() as conn:
+            accepted = conn.execute(
+                update(AuthNonce)
+                .where(AuthNonce.nonce == nonce, AuthNonce.last_nc < nc, AuthNonce.issued_at >= cutoff)
+                .values(last_nc=nc)
+                .returning(AuthNonce.nonce)
+            ).first()
+            if accepted is not None:
+                return VALID
+            issued_at = conn.execute(
+                select(AuthNonce.issued_at).where(AuthNonce.nonce == nonce)
+            ).scalar()
+        if issued_at is None:
+            return INVALID
+        if issued_at.tzinfo is None:
+            issued_at = issued_at.replace(tzinfo=timezone.utc)
+        return STALE if issued_at < cutoff else INVALID
+
+
+def create_nonce_store():
+    if settings.AUTH_NONCE_BACKEND == "database":
+        from app.db.session import engine
+        return DatabaseNonceStore(engine, lifetime=settings.AUTH_NONCE_LIFETIME)
+    return MemoryNonceStore(
+        lifetime=settings.AUTH_NONCE_LIFETIME,
+        max_entries=settings.AUTH_NONCE_MAX_ENTRIES
+    )
+
+
+nonce_store = create_nonce_store()
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from pydantic import BaseModel, ValidationError
+from app.clients.sonicwall import SonicWallClient, STATUS_METHODS
+from app.services.status_collector import status_collector
+from app.schemas.security import (
+    SecurityServicesStatus,
+    GatewayAntiVirusStatus,
+    IntrusionPreventionStatus,
+    BotnetStatus,
+    AntiSpywareStatus,
+    ContentFilteringStatus,
+    SecurityOverview,
+    SecurityOverviewSection
+)
+
+SECTION_SCHEMAS = {
+    "services": SecurityServicesStatus,
+    "gateway_av": GatewayAntiVirusStatus,
+    "ips": IntrusionPreventionStatus,
+    "botnet": BotnetStatus,
+    "anti_spyware": AntiSpywareStatus,
+    "content_filtering": ContentFilteringStatus,
+}
+
+ClientProvider = Callable[[], Awaitable[SonicWallClient]]
+
+async def read_status(section: str, get_client: ClientProvider) -> Optional[Dict]:
+    """
+    Serve the background collector's latest snapshot for a section,
+    falling back to a live call until the first poll has succeeded.
+    """
+    snapshot = status_collector.get_snapshot(section)
+    if snapshot is not None:
+        return snapshot.data
+    client = await get_client()
+    return await getattr(client, STATUS_METHODS[section])()
+
+async def _fetch_section(
+    section: str, get_client: ClientProvider
+) -> Tuple[Optional[BaseModel], SecurityOverviewSection]:
+    """Read and validate one status section, timing the call."""
+    started = time.perf_counter()
+    data: Optional[BaseModel] = None
+    error: Optional[str] = None
+    try:
+        raw = await read_status(section, get_client)
+        if raw is None:
+            error = "No data returned by the firewall"
+        else:
+            data = SECTION_SCHEMAS[section](**raw)
+    except ValidationError as e:
+        error = f"Response does not match schema: {e.error_count()} error(s)"
+    except Exception as e:
+        error = getattr(e, "detail", None) or str(e)
+
+    snapshot = status_collector.get_snapshot(section)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return data, SecurityOverviewSection(
+        status="error" if error else "ok",
+        elapsed_ms=round(elapsed_ms, 2),
+        fetched_at=snapshot.fetched_at if snapshot else None,
+        error=error
+    )
+
+async def get_security_overview(get_client: ClientProvider) -> SecurityOverview:
+    """
+    Read every status section concurrently, from snapshots where available
+    and over the shared session otherwise. A failing section is reported in
+    `sections` without affecting the others.
+    """
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(_fetch_section(section, get_client) for section in SECTION_SCHEMAS)
+    )
+
+    payload: Dict[str, Any] = {"sections": {}}
+    for section, (data, info) in zip(SECTION_SCHEMAS, results):
+        payload[section] = data
+        payload["sections"][section] = info
+    payload["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return SecurityOverview(**payload)
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from sqlalchemy import bindparam, update
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.db.session import engine
+from app.models.session import Session as SessionModel
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCache:
+    """
+    Short-lived LRU of sessions known to be valid, by session id. An entry
+    lives for `ttl` seconds or until the session expires, whichever comes
+    first. Ending a session drops it here at once; other processes notice
+    within `ttl`. Only used on the event loop, so it needs no locking.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # session id -> (user id, monotonic time the entry stops being trusted)
+        self._entries: "OrderedDict[str, tuple[int, float]]" = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[int]:
+        """User id of a cached valid session."""
+        item = self._entries.get(session_id)
+        if item is None:
+            return None
+        user_id, valid_until = item
+        if time.monotonic() >= valid_until:
+            del self._entries[session_id]
+            return None
+        self._entries.move_to_end(session_id)
+        return user_id
+
+    def put(self, session_id: str, user_id: int, expires_at: datetime) -> None:
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        lifetime = min(self.ttl, remaining)
+        if lifetime <= 0:
+            return
+        self._entries[session_id] = (user_id, time.monotonic() + lifetime)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached session of a user."""
+        for session_id in [sid for sid, (uid, _) in self._entries.items() if uid == user_id]:
+            del self._entries[session_id]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SessionActivityWriter:
+    """
+    Write-behind for sessions.last_activity. Validations only record the
+    time in memory; every `interval` seconds the latest time per session is
+    written in one batched UPDATE, so busy sessions cost one write per
+    interval instead of one per request.
+    """
+
+    def __init__(self, engine: Engine, interval: float = 30.0):
+        self.engine = engine
+        self.interval = interval
+        self._pending: Dict[str, datetime] = {}
+        # touch() runs on the event loop while flush() runs in a worker
+        # thread (asyncio.to_thread), so swapping the pending map is locked
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def touch(self, session_id: str) -> None:
+        with self._lock:
+            self._pending[session_id] = datetime.now(timezone.utc)
+
+    def flush(self) -> int:
+        """Write pending activity; returns the number of sessions updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        statement = (
+            update(SessionModel.__table__)
+            .where(SessionModel.__table__.c.id == bindparam("session_id"))
+            .values(last_activity=bindparam("seen_at"))
+        )
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(statement, [
+                    {"session_id": session_id, "seen_at": seen_at}
+                    for session_id, seen_at in pending.items()
+                ])
+        except Exception:
+            # Keep the times for the next flush unless newer ones arrived
+            with self._lock:
+                for session_id, seen_at in pending.items():
+                    self._pending.setdefault(session_id, seen_at)
+            raise
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.warning("Failed to write session activity", exc_info=True)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="session-activity-writer")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        try:
+            await asyncio.to_thread(self.flush)
+        except Exception:
+            logger.warning("Failed to write session activity on shutdown", exc_info=True)
+
+
+session_cache = SessionCache(
+    ttl=settings.SESSION_CACHE_TTL,
+    max_entries=settings.SESSION_CACHE_MAX_ENTRIES
+)
+session_activity = SessionActivityWriter(engine, interval=settings.SESSION_ACTIVITY_FLUSH_INTERVAL)
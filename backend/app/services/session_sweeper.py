@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.models.session import Session as SessionModel
+
+logger = logging.getLogger(__name__)
+
+
+def create_session_indexes(engine: Engine) -> None:
+    """Create the partial indexes on sessions if they are missing."""
+    for index in SessionModel.__table__.indexes:
+        index.create(engine, checkfirst=True)
+
+
+class SessionSweeper:
+    """
+    Periodically marks expired sessions inactive, `batch_size` rows per
+    statement. Rows locked by a login in progress are skipped (and picked up
+    next time), so sweeping never blocks logins, and several API processes
+    can sweep at once.
+    """
+
+    def __init__(self, engine: Engine, interval: float = 60.0, batch_size: int = 5000):
+        self.engine = engine
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def sweep(self) -> int:
+        """Deactivate every expired session; returns how many were."""
+        table = SessionModel.__table__
+        total = 0
+        while True:
+            expired = (
+                select(table.c.id)
+                .where(table.c.is_active == True, table.c.expires_at <= datetime.now(timezone.utc))
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            with self.engine.begin() as conn:
+                swept = conn.execute(
+                    update(table).where(table.c.id.in_(expired)).values(is_active=False)
+                ).rowcount
+            total += swept
+            if swept < self.batch_size:
+                return total
+
+    async def _run(self) -> None:
+        indexed = False
+        while True:
+            try:
+                if not indexed:
+                    await asyncio.to_thread(create_session_indexes, self.engine)
+                    indexed = True
+                swept = await asyncio.to_thread(self.sweep)
+                if swept:
+                    logger.info("Expired %d sessions", swept)
+            except Exception:
+                logger.warning("Session sweep failed", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="session-sweeper")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.clients.sonicwall import STATUS_METHODS
+from app.clients.session_manager import SonicWallSessionManager, sonicwall_sessions
+from app.db.session import engine
+from app.services.event_broker import EventBroker, event_broker
+from app.services.metrics_service import STATUS_GAUGES, record_gauge
+from app.services.status_history import HISTORY_SECTIONS, create_status_history, record_status
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StatusSnapshot:
+    data: Dict
+    fetched_at: datetime
+    digest: str = ""
+
+
+def status_digest(data: Dict) -> str:
+    """Stable hash of a status response, used to detect changes."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class StatusCollector:
+    """
+    Polls every reporting status endpoint in the background and keeps the
+    latest successful response per section in memory, so API reads never
+    wait on the firewall. A failed poll keeps the previous snapshot.
+
+    When `engine` is given, sections listed in STATUS_GAUGES are also
+    sampled into the metric rollups for `appliance`. Sections whose
+    content changed since the last poll are published to `broker` and, for
+    HISTORY_SECTIONS, stored in the status history on `history_engine`.
+    In collection workers every snapshot is also handed to the API
+    processes through `relay_engine` (see app.services.collection_relay).
+    """
+
+    def __init__(
+        self,
+        sessions: SonicWallSessionManager,
+        interval: float = 30.0,
+        jitter: float = 0.0,
+        intervals: Optional[Dict[str, float]] = None,
+        engine: Optional[Engine] = None,
+        appliance: str = "",
+        broker: Optional[EventBroker] = None,
+        history_engine: Optional[Engine] = None,
+        relay_engine: Optional[Engine] = None
+    ):
+        self.sessions = sessions
+        self.interval = interval
+        self.jitter = jitter
+        self.intervals = intervals or {}
+        self.engine = engine
+        self.appliance = appliance
+        self.broker = broker
+        self.history_engine = history_engine
+        self.relay_engine = relay_engine
+        self._snapshots: Dict[str, StatusSnapshot] = {}
+        # Digest last stored in the history per section
+        self._history_digests: Dict[str, str] = {}
+        self._history_ready = False
+        self._relay_ready = False
+        self._tasks: List[asyncio.Task] = []
+
+    def get_snapshot(self, section: str) -> Optional[StatusSnapshot]:
+        return self._snapshots.get(section)
+
+    def put_snapshot(self, section: str, snapshot: StatusSnapshot) -> None:
+        """Take a snapshot collected elsewhere, e.g. by a collection worker."""
+        self._snapshots[section] = snapshot
+
+    def interval_for(self, section: str) -> float:
+        return self.intervals.get(section, self.interval)
+
+    async def collect(self, section: str) -> Optional[StatusSnapshot]:
+        """Poll one section now and store it if the firewall answered."""
+        client = await self.sessions.get_client(self.appliance or None)
+        if client is None:
+            return None
+        data = await getattr(client, STATUS_METHODS[section])(refresh=True)
+        if data is None:
+            return None
+        snapshot = StatusSnapshot(data, datetime.now(timezone.utc), status_digest(data))
+        previous = self._snapshots.get(section)
+        self._snapshots[section] = snapshot
+        if self.broker is not None and (previous is None or previous.digest != snapshot.digest):
+            self.broker.publish("status", {
+                "appliance": self.appliance,
+                "section": section,
+                "fetched_at": snapshot.fetched_at,
+                "data": data,
+            })
+        if self.engine is not None and section in STATUS_GAUGES:
+            await self._record_gauge(section, snapshot)
+        if (
+            self.history_engine is not None
+            and section in HISTORY_SECTIONS
+            and self._history_digests.get(section) != snapshot.digest
+        ):
+            await self._record_history(section, snapshot)
+        if self.relay_engine is not None:
+            await self._relay(section, snapshot)
+        return snapshot
+
+    async def _relay(self, section: str, snapshot: StatusSnapshot) -> None:
+        from app.services.collection_relay import create_relay_storage, store_snapshot
+        try:
+            if not self._relay_ready:
+                await asyncio.to_thread(create_relay_storage, self.relay_engine)
+                self._relay_ready = True
+            await asyncio.to_thread(store_snapshot, self.relay_engine, self.appliance, section, snapshot)
+        except Exception:
+            logger.exception("Relaying %s status failed", section)
+
+    async def _record_history(self, section: str, snapshot: StatusSnapshot) -> None:
+        # After a restart the first poll is compared with the stored history,
+        # so an unchanged section isn't written again
+        try:
+            if not self._history_ready:
+                await asyncio.to_thread(create_status_history, self.history_engine)
+                self._history_ready = True
+            await asyncio.to_thread(
+                record_status, self.history_engine, self.appliance, section,
+                snapshot.fetched_at, snapshot.digest, snapshot.data
+            )
+            self._history_digests[section] = snapshot.digest
+        except Exception:
+            logger.exception("Recording %s status history failed", section)
+
+    async def _record_gauge(self, section: str, snapshot: StatusSnapshot) -> None:
+        metric, extract = STATUS_GAUGES[section]
+        value = extract(snapshot.data)
+        if value is None:
+            logger.warning("No %s value in %s status", metric, section)
+            return
+        try:
+            await asyncio.to_thread(
+                record_gauge, self.engine, self.appliance, metric, snapshot.fetched_at, value
+            )
+        except Exception:
+            logger.exception("Recording %s failed", metric)
+
+    async def _poll(self, section: str) -> None:
+        # Spread the first polls out so sections don't all fire at once
+        await asyncio.sleep(random.uniform(0, self.jitter))
+        while True:
+            try:
+                if await self.collect(section) is None:
+                    logger.warning("Status poll for %s returned no data", section)
+            except Exception:
+                logger.exception("Status poll for %s failed", section)
+            await asyncio.sleep(self.interval_for(section) + random.uniform(0, self.jitter))
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._poll(section), name=f"status-poll-{self.appliance}-{section}")
+            for section in STATUS_METHODS
+        ]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def create_status_collector(
+    sessions: SonicWallSessionManager,
+    appliance: str,
+    broker: Optional[EventBroker] = None,
+    relay_engine: Optional[Engine] = None
+) -> StatusCollector:
+    """A status collector for one appliance, configured from settings."""
+    return StatusCollector(
+        sessions,
+        interval=settings.SONICWALL_POLL_INTERVAL,
+        jitter=settings.SONICWALL_POLL_JITTER,
+        intervals=settings.SONICWALL_POLL_INTERVALS,
+        engine=engine if settings.METRICS_ROLLUP_ENABLED else None,
+        appliance=appliance,
+        broker=broker,
+        history_engine=engine if settings.STATUS_HISTORY_ENABLED else None,
+        relay_engine=relay_engine
+    )
+
+
+status_collector = create_status_collector(sonicwall_sessions, settings.SONICWALL_HOST, broker=event_broker)
@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models.status_history import StatusHistory
+
+# Status sections whose changes are kept
+HISTORY_SECTIONS = ("services", "gateway_av", "ips", "anti_spyware")
+
+
+def create_status_history(engine: Engine) -> None:
+    StatusHistory.__table__.create(engine, checkfirst=True)
+
+
+def record_status(
+    engine: Engine,
+    appliance: str,
+    section: str,
+    observed_at: datetime,
+    digest: str,
+    data: Dict[str, Any]
+) -> bool:
+    """
+    Store a snapshot unless it matches the latest stored one for the
+    section. Returns True if a row was written.
+    """
+    with engine.begin() as conn:
+        latest = conn.execute(
+            select(StatusHistory.digest)
+            .where(StatusHistory.appliance == appliance, StatusHistory.section == section)
+            .order_by(StatusHistory.observed_at.desc())
+            .limit(1)
+        ).scalar()
+        if latest == digest:
+            return False
+        conn.execute(insert(StatusHistory).values(
+            appliance=appliance,
+            section=section,
+            observed_at=observed_at,
+            digest=digest,
+            data=data
+        ))
+    return True
+
+
+def changed_fields(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> List[str]:
+    if previous is None:
+        return sorted(current)
+    return sorted(key for key in previous.keys() | current.keys() if previous.get(key) != current.get(key))
+
+
+def get_status_history(
+    db: Session,
+    appliance: str,
+    section: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    field: Optional[str] = None,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    """
+    Stored changes of a section, newest first, each with the fields that
+    differ from the change before it. With `field`, only changes to that
+    field are returned, so `field=signature_database, limit=1` answers
+    "when did the signatures last update".
+    """
+    # Each change is paired with the one before it (even if that one is
+    # before `start`) so what changed can be told; filtering by field and
+    # the limit are applied in the database
+    conditions = [StatusHistory.appliance == appliance, StatusHistory.section == section]
+    if end is not None:
+        conditions.append(StatusHistory.observed_at < end)
+    window = {"order_by": StatusHistory.observed_at}
+    columns = [
+        StatusHistory.observed_at,
+        StatusHistory.digest,
+        StatusHistory.data,
+        func.lag(StatusHistory.data, type_=StatusHistory.data.type).over(**window).label("previous"),
+    ]
+    if field is not None:
+        value = StatusHistory.data[field].as_string()
+        columns += [value.label("value"), func.lag(value).over(**window).label("previous_value")]
+    changes = select(*columns).where(*conditions).subquery()
+
+    statement = select(changes.c.observed_at, changes.c.digest, changes.c.data, changes.c.previous)
+    if start is not None:
+        statement = statement.where(changes.c.observed_at >= start)
+    if field is not None:
+        statement = statement.where(changes.c.value.is_distinct_from(changes.c.previous_value))
+    statement = statement.order_by(changes.c.observed_at.desc()).limit(limit)
+
+    return [
+        {
+            "observed_at": row.observed_at,
+            "digest": row.digest,
+            "changed": changed_fields(row.previous, row.data),
+            "data": row.data,
+        }
+        for row in db.execute(statement)
+    ]
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Channel carrying the username of every changed or deleted user
+USER_CHANGES_CHANNEL = "user_changes"
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """What digest auth needs about a user, with HA1 precomputed."""
+
+    id: int
+    username: str
+    is_admin: bool
+    ha1: str
+
+
+class UserCache:
+    """
+    Bounded LRU of users by username, each entry valid for `ttl` seconds.
+    Entries are dropped when the user changes: immediately for ORM changes
+    in this process, and through Postgres NOTIFY for every other process
+    (and for changes made outside the ORM). The TTL bounds staleness if a
+    notification is ever missed.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[CachedUser, float]]" = OrderedDict()
+
+    def get(self, username: str) -> Optional[CachedUser]:
+        item = self._entries.get(username)
+        if item is None:
+            return None
+        user, expires_at = item
+        if time.monotonic() >= expires_at:
+            del self._entries[username]
+            return None
+        self._entries.move_to_end(username)
+        return user
+
+    def put(self, user: CachedUser) -> CachedUser:
+        if self.ttl > 0:
+            self._entries[user.username] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, username: Optional[str] = None) -> None:
+        """Drop one user, or everyone when no username is given."""
+        if username is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(username, None)
+
+
+user_cache = UserCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_CACHE_TTL
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target) -> None:
+    user_cache.invalidate(target.username)
+    # A rename leaves the old username cached too
+    history = inspect(target).attrs.username.history
+    for username in history.deleted or ():
+        user_cache.invalidate(username)
+
+
+async def install_user_change_trigger(engine: AsyncEngine) -> None:
+    """NOTIFY USER_CHANGES_CHANNEL on every UPDATE or DELETE of users."""
+    async with engine.begin() as conn:
+        await conn.execute(text(f"""
+            CREATE OR REPLACE FUNCTION notify_user_change() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('{USER_CHANGES_CHANNEL}', OLD.username);
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+        """))
+        await conn.execute(text("DROP TRIGGER IF EXISTS users_notify_change ON users"))
+        await conn.execute(text(
+            "CREATE TRIGGER users_notify_change AFTER UPDATE OR DELETE ON users "
+            "FOR EACH ROW EXECUTE FUNCTION notify_user_change()"
+        ))
+
+
+class UserChangeListener:
+    """
+    LISTENs for user changes on a connection held from the async engine and
+    invalidates the cache as notifications arrive on the event loop. While
+    the connection is down the whole cache is dropped, since notifications
+    may have been missed, and reconnection is retried.
+    """
+
+    def __init__(self, engine: AsyncEngine, cache: UserCache, retry_interval: float = 30.0):
+        self.engine = engine
+        self.cache = cache
+        self.retry_interval = retry_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def dispatch(self, payload: str) -> None:
+        """Apply one notification; an empty payload drops every user."""
+        self.cache.invalidate(payload or None)
+
+    async def _listen(self) -> None:
+        await install_user_change_trigger(self.engine)
+        async with self.engine.connect() as conn:
+            connection = (await conn.get_raw_connection()).driver_connection
+            lost = asyncio.get_running_loop().create_future()
+
+            def on_notify(connection, pid, channel, payload):
+                self.dispatch(payload)
+
+            def on_terminate(connection):
+                if not lost.done():
+                    lost.set_result(None)
+
+            await connection.add_listener(USER_CHANGES_CHANNEL, on_notify)
+            connection.add_termination_listener(on_terminate)
+            logger.info("Listening for user changes")
+            try:
+                await lost
+            finally:
+                # Never hand a LISTENing connection back to the pool
+                await conn.invalidate()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("User change listener unavailable, retrying in %ss", self.retry_interval, exc_info=True)
+            self.cache.invalidate()
+            await asyncio.sleep(self.retry_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="user-change-listener")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -1,63 +1,92 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 import uuid
-from sqlalchemy.orm import Session
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.models.session import Session as SessionModel
+from app.services.session_cache import session_activity, session_cache
 
 SESSION_DURATION = timedelta(hours=1)  # Session expires after 1 hour
 
-def get_user_by_username(db: Session, username: str):
-    return db.query(User).filter(User.username == username).first()
+# Advisory lock serializing admin logins; the namespace (first key) must
+# differ from app.worker.LOCK_NAMESPACE so the two never collide
+LOCK_NAMESPACE = 0x534E41
+ADMIN_LOGIN_LOCK = "admin-login"
 
-def is_another_admin_logged_in(db: Session, current_user_id: int) -> bool:
-    """Check if another admin user has an active session."""
-    active_admin_sessions = (
-        db.query(SessionModel)
-        .join(User)
-        .filter(User.is_admin == True)
-        .filter(User.id != current_user_id)
-        .filter(SessionModel.is_active == True)
-        .filter(SessionModel.expires_at > datetime.utcnow())
-        .first()
+# Checks that no other admin holds a live session and, only then, replaces
+# the user's sessions with a new one. Runs after taking ADMIN_LOGIN_LOCK in
+# the same transaction: the lock has to come from an earlier statement, as
+# a statement only sees rows committed before it started.
+ADMIN_LOGIN_SQL = text("""
+    WITH conflict AS (
+        SELECT 1
+        FROM sessions s
+        JOIN users u ON u.id = s.user_id
+        WHERE s.is_active
+          AND s.expires_at > now()
+          AND s.user_id <> :user_id
+          AND u.is_admin
+        LIMIT 1
+    ),
+    closed AS (
+        UPDATE sessions SET is_active = false
+        WHERE user_id = :user_id AND is_active
+          AND NOT EXISTS (SELECT 1 FROM conflict)
     )
-    return active_admin_sessions is not None
+    INSERT INTO sessions (id, user_id, is_active, expires_at)
+    SELECT :session_id, :user_id, true, CAST(:expires_at AS timestamptz)
+    WHERE NOT EXISTS (SELECT 1 FROM conflict)
+    RETURNING id
+""")
 
-def create_session(db: Session, user_id: int) -> SessionModel:
-    """Create a new session for the user."""
-    # First, deactivate any existing sessions for this user
-    db.query(SessionModel).filter(
-        SessionModel.user_id == user_id,
-        SessionModel.is_active == True
-    ).update({"is_active": False})
+async def get_user_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
 
-    # Create new session
-    session = SessionModel(
-        id=str(uuid.uuid4()),
-        user_id=user_id,
-        expires_at=datetime.utcnow() + SESSION_DURATION
-    )
-    db.add(session)
-    db.commit()
-    db.refresh(session)
-    return session
+async def login_admin_session(db: AsyncSession, user_id: int) -> Optional[str]:
+    """
+    Start a session for an admin unless another admin is logged in.
+    Returns the new session id, or None when another admin holds a live
+    session. Concurrent logins are serialized, so at most one wins.
+    """
+    await db.execute(text("SELECT pg_advisory_xact_lock(:namespace, hashtext(:name))"), {
+        "namespace": LOCK_NAMESPACE,
+        "name": ADMIN_LOGIN_LOCK,
+    })
+    session_id = (await db.execute(ADMIN_LOGIN_SQL, {
+        "session_id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "expires_at": datetime.now(timezone.utc) + SESSION_DURATION,
+    })).scalar()
+    await db.commit()
+    if session_id is not None:
+        session_cache.invalidate_user(user_id)
+    return session_id
 
-def terminate_session(db: Session, user_id: int) -> None:
+async def terminate_session(db: AsyncSession, user_id: int) -> None:
     """Terminate all active sessions for the user."""
-    db.query(SessionModel).filter(
-        SessionModel.user_id == user_id,
-        SessionModel.is_active == True
-    ).update({"is_active": False})
-    db.commit()
+    await db.execute(
+        update(SessionModel)
+        .where(SessionModel.user_id == user_id, SessionModel.is_active == True)
+        .values(is_active=False)
+    )
+    await db.commit()
+    session_cache.invalidate_user(user_id)
 
-def validate_session(db: Session, session_id: str) -> bool:
+async def validate_session(db: AsyncSession, session_id: str) -> bool:
     """Validate if a session is active and not expired."""
-    session = (
-        db.query(SessionModel)
-        .filter(
-            SessionModel.id == session_id,
-            SessionModel.is_active == True,
-            SessionModel.expires_at > datetime.utcnow()
-        )
-        .first()
-    )
-    return session is not None 
\ No newline at end of file
+    if session_cache.get(session_id) is None:
+        session = (await db.execute(
+            select(SessionModel.user_id, SessionModel.expires_at)
+            .where(
+                SessionModel.id == session_id,
+                SessionModel.is_active == True,
+                SessionModel.expires_at > datetime.now(timezone.utc)
+            )
+        )).first()
+        if session is None:
+            return False
+        session_cache.put(session_id, session.user_id, session.expires_at)
+    session_activity.touch(session_id)
+    return True
@@ -0,0 +1,294 @@
+"""
+Collection worker, run next to the API with:
+
+    python -m app.worker
+
+Each worker claims a shard of the registered appliances and runs their
+status and log collectors. Ownership is a session-level Postgres advisory
+lock per appliance, held on the worker's own connection: when a worker
+dies its connection closes, its locks are released and the remaining
+workers claim the appliances on their next rebalance. Workers heartbeat
+into collection_workers and each aims for ceil(appliances / live workers),
+releasing surplus appliances so that a newly started worker gets a share.
+
+Set COLLECTION_MODE=worker on the API processes so they stop collecting;
+they then serve the status snapshots and live events that workers relay
+through Postgres (see app.services.collection_relay).
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection, Engine
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.core.tracing import configure_tracing
+from app.clients.session_manager import SonicWallSessionManager
+from app.db.session import engine
+from app.db.partitions import create_log_storage, maintain_log_partitions
+from app.models.collection_worker import CollectionWorker as CollectionWorkerRow
+from app.services.appliance_service import refresh_appliances
+from app.services.collection_relay import RelayBroker, create_relay_storage
+from app.services.log_collector import create_log_collector
+from app.services.status_collector import create_status_collector
+
+logger = logging.getLogger(__name__)
+
+# First key of the two-key advisory locks taken by workers
+LOCK_NAMESPACE = 0x534E57
+# Pseudo-appliance whose lock holder maintains the log partitions
+STORAGE_LOCK = "log-storage-maintenance"
+
+
+def shard_target(appliances: int, workers: int) -> int:
+    """Appliances each worker should own for an even spread."""
+    return math.ceil(appliances / max(workers, 1))
+
+
+def preference(worker_id: str, appliance: str) -> int:
+    """Rendezvous hash, so each worker prefers a different, stable subset."""
+    digest = hashlib.sha256(f"{worker_id}|{appliance}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def plan_shard(
+    worker_id: str,
+    owned: Sequence[str],
+    registered: Sequence[str],
+    target: int
+) -> Tuple[List[str], List[str]]:
+    """
+    Return (appliances to release, appliances to try to claim in order).
+    Unregistered appliances are always released; beyond `target` the
+    least preferred ones go first.
+    """
+    by_preference = lambda name: preference(worker_id, name)
+    kept = sorted((name for name in owned if name in registered), key=by_preference, reverse=True)
+    release = [name for name in owned if name not in registered] + kept[target:]
+    candidates = sorted((name for name in registered if name not in owned), key=by_preference, reverse=True)
+    return release, candidates
+
+
+class ShardLocks:
+    """
+    Advisory locks held on one dedicated autocommit connection. Closing the
+    connection releases every lock it holds, which is what hands a dead
+    worker's appliances over.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._connection: Optional[Connection] = None
+        self._lock = threading.Lock()
+
+    def execute(self, statement, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Run a statement on the lock connection; returns its first column, if any."""
+        with self._lock:
+            if self._connection is None or self._connection.invalidated:
+                self._connection = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            result = self._connection.execute(statement, params or {})
+            return result.scalar() if result.returns_rows else None
+
+    def try_claim(self, name: str) -> bool:
+        return bool(self.execute(
+            text("SELECT pg_try_advisory_lock(:namespace, hashtext(:name))"),
+            {"namespace": LOCK_NAMESPACE, "name": name}
+        ))
+
+    def release(self, name: str) -> None:
+        self.execute(
+            text("SELECT pg_advisory_unlock(:namespace, hashtext(:name))"),
+            {"namespace": LOCK_NAMESPACE, "name": name}
+        )
+
+    def reset(self) -> None:
+        """Drop the connection and with it every lock."""
+        with self._lock:
+            connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                logger.exception("Closing the lock connection failed")
+
+
+class CollectionWorker:
+    def __init__(
+        self,
+        engine: Engine,
+        sessions: SonicWallSessionManager,
+        worker_id: Optional[str] = None,
+        heartbeat_interval: float = 10.0,
+        heartbeat_timeout: float = 30.0
+    ):
+        self.engine = engine
+        self.sessions = sessions
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.locks = ShardLocks(engine)
+        # Hands new log events to the API processes' live streams
+        self.relay = RelayBroker(engine)
+        self._collectors: Dict[str, List[Any]] = {}
+        self._owns_storage = False
+        self._last_maintenance: Optional[float] = None
+
+    @property
+    def appliances(self) -> List[str]:
+        return sorted(self._collectors)
+
+    def _heartbeat(self) -> int:
+        """Record this worker as alive and return the number of live workers."""
+        statement = insert(CollectionWorkerRow).values(
+            worker_id=self.worker_id,
+            hostname=socket.gethostname(),
+            pid=os.getpid(),
+            appliances=self.appliances,
+            heartbeat_at=func.now()
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["worker_id"],
+            set_={"appliances": statement.excluded.appliances, "heartbeat_at": func.now()}
+        )
+        self.locks.execute(statement)
+        # Forget workers that have been gone for a while
+        self.locks.execute(delete(CollectionWorkerRow).where(
+            CollectionWorkerRow.heartbeat_at < func.now() - timedelta(seconds=self.heartbeat_timeout * 10)
+        ))
+        return self.locks.execute(
+            select(func.count()).select_from(CollectionWorkerRow).where(
+                CollectionWorkerRow.heartbeat_at > func.now() - timedelta(seconds=self.heartbeat_timeout)
+            )
+        )
+
+    def _create_tables(self) -> None:
+        CollectionWorkerRow.__table__.create(self.engine, checkfirst=True)
+        create_relay_storage(self.engine)
+
+    def _deregister(self) -> None:
+        try:
+            self.locks.execute(delete(CollectionWorkerRow).where(CollectionWorkerRow.worker_id == self.worker_id))
+        finally:
+            self.locks.reset()
+
+    def _start(self, appliance: str) -> None:
+        collectors = []
+        if settings.SONICWALL_POLL_ENABLED:
+            collectors.append(create_status_collector(self.sessions, appliance, relay_engine=self.engine))
+        if settings.LOG_COLLECTION_ENABLED:
+            collectors.append(
+                create_log_collector(self.sessions, appliance, broker=self.relay, manage_storage=False)
+            )
+        for collector in collectors:
+            collector.start()
+        self._collectors[appliance] = collectors
+        logger.info("Worker %s claimed %s", self.worker_id, appliance)
+
+    async def _stop(self, appliance: str) -> None:
+        for collector in self._collectors.pop(appliance, []):
+            await collector.stop()
+        # The next owner logs in itself; don't keep a competing session open
+        await self.sessions.release(appliance)
+        logger.info("Worker %s released %s", self.worker_id, appliance)
+
+    async def _stop_all(self) -> None:
+        for appliance in self.appliances:
+            await self._stop(appliance)
+        self._owns_storage = False
+
+    async def _maintain_storage(self) -> None:
+        """One worker at a time creates and rotates the log partitions."""
+        if not settings.LOG_COLLECTION_ENABLED:
+            return
+        if not self._owns_storage:
+            self._owns_storage = await asyncio.to_thread(self.locks.try_claim, STORAGE_LOCK)
+            if not self._owns_storage:
+                return
+        if self._last_maintenance is None:
+            lookback_days = math.ceil(settings.SONICWALL_LOG_INITIAL_LOOKBACK / 86400)
+            await asyncio.to_thread(create_log_storage, self.engine, lookback_days)
+        elif time.monotonic() - self._last_maintenance < settings.LOG_PARTITION_MAINTENANCE_INTERVAL:
+            return
+        await asyncio.to_thread(
+            maintain_log_partitions,
+            self.engine,
+            settings.LOG_RETENTION_DAYS,
+            settings.LOG_PARTITION_DAYS_AHEAD
+        )
+        self._last_maintenance = time.monotonic()
+
+    async def rebalance(self) -> None:
+        """Heartbeat, then release or claim appliances to reach the target."""
+        workers = await asyncio.to_thread(self._heartbeat)
+        registered = [name for name in await refresh_appliances(self.sessions) if name]
+        target = shard_target(len(registered), workers)
+        release, candidates = plan_shard(self.worker_id, self.appliances, registered, target)
+
+        for appliance in release:
+            await self._stop(appliance)
+            await asyncio.to_thread(self.locks.release, appliance)
+        for appliance in candidates:
+            if len(self._collectors) >= target:
+                break
+            if await asyncio.to_thread(self.locks.try_claim, appliance):
+                self._start(appliance)
+
+        await self._maintain_storage()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        await asyncio.to_thread(self._create_tables)
+        self.relay.start()
+        logger.info("Collection worker %s started", self.worker_id)
+        try:
+            while not stop.is_set():
+                try:
+                    await self.rebalance()
+                except Exception:
+                    # Without the lock connection ownership can't be trusted
+                    logger.exception("Rebalance failed, releasing every appliance")
+                    await self._stop_all()
+                    await asyncio.to_thread(self.locks.reset)
+                try:
+                    await asyncio.wait_for(stop.wait(), self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._stop_all()
+            await self.relay.stop()
+            await asyncio.to_thread(self._deregister)
+            await self.sessions.close()
+            logger.info("Collection worker %s stopped", self.worker_id)
+
+
+async def _run_worker() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    worker = CollectionWorker(
+        engine,
+        SonicWallSessionManager(),
+        heartbeat_interval=settings.WORKER_HEARTBEAT_INTERVAL,
+        heartbeat_timeout=settings.WORKER_HEARTBEAT_TIMEOUT
+    )
+    await worker.run(stop)
+
+
+def main() -> None:
+    configure_logging()
+    configure_tracing()
+    asyncio.run(_run_worker())
+
+
+if __name__ == "__main__":
+    main()
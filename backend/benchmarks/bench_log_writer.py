@@ -0,0 +1,83 @@
+"""
+Sustained write throughput of LogBatchWriter against the configured Postgres.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_log_writer --rows 200000 --batch-size 5000
+
+Each method writes the same synthetic events twice: the first pass measures
+inserts, the second measures the duplicate-absorbing upsert path that the
+overlapping collection windows hit.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete
+from app.db.session import engine
+from app.db.partitions import create_log_storage
+from app.models.log_event import LogEvent
+from app.services.log_writer import LogBatchWriter
+
+APPLIANCE = "benchmark.invalid"
+
+
+def synthetic_events(count: int):
+    start = datetime.now(timezone.utc) - timedelta(hours=1)
+    for i in range(count):
+        yield {
+            "id": i,
+            "timestamp": start + timedelta(milliseconds=i),
+            "category": "Attack" if i % 10 == 0 else "Network",
+            "priority": "Alert" if i % 10 == 0 else "Information",
+            "severity": "ALERT" if i % 10 == 0 else "INFORMATION",
+            "src_int": "X1",
+            "dst_int": "X0",
+            "src_ip": f"10.0.{i % 256}.{i % 199}",
+            "src_port": 1024 + i % 60000,
+            "dst_ip": "192.168.1.10",
+            "dst_port": 443,
+            "ip_protocol": "tcp",
+            "user_name": None,
+            "application": "HTTPS",
+            "notes": "Rule 12\tallowed",
+            "message": f"Connection opened #{i}",
+        }
+
+
+async def run(method: str, rows: int, batch_size: int) -> None:
+    writer = LogBatchWriter(
+        engine, APPLIANCE, batch_size=batch_size, flush_interval=3600, method=method
+    )
+    for label in ("insert", "re-upsert"):
+        started = time.perf_counter()
+        for event in synthetic_events(rows):
+            await writer.add(event)
+        await writer.flush()
+        elapsed = time.perf_counter() - started
+        print(f"{method:>6} {label:>9}: {rows:,} rows in {elapsed:.2f}s "
+              f"= {rows / elapsed:,.0f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--methods", default="copy,insert")
+    args = parser.parse_args()
+
+    create_log_storage(engine)
+    for method in args.methods.split(","):
+        with engine.begin() as conn:
+            conn.execute(delete(LogEvent).where(LogEvent.appliance == APPLIANCE))
+        asyncio.run(run(method, args.rows, args.batch_size))
+    with engine.begin() as conn:
+        conn.execute(delete(LogEvent).where(LogEvent.appliance == APPLIANCE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from app import worker as worker_module
+from app.services import collection_relay, security_service, status_collector as status_collector_module
+from app.services.collection_relay import RELAY_CHANNEL, RelayListener, create_relay_storage, log_payload
+from app.services.event_broker import EventBroker
+from app.services.status_collector import StatusCollector
+from app.worker import CollectionWorker
+
+
+def relay_engine():
+    """SQLite standing in for Postgres, with NOTIFY payloads captured in order."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    notifications = []
+
+    @event.listens_for(engine, "connect")
+    def add_pg_notify(dbapi_connection, record):
+        dbapi_connection.create_function(
+            "pg_notify", 2, lambda channel, payload: notifications.append((channel, payload))
+        )
+
+    create_relay_storage(engine)
+    return engine, notifications
+
+
+class FakeClient:
+    def __init__(self):
+        self.botnet = {"botnet_database": "Downloaded"}
+
+    async def get_botnet_status(self, refresh=False):
+        return self.botnet
+
+
+class FakeSessions:
+    def __init__(self, client):
+        self.client = client
+
+    async def get_client(self, appliance=None):
+        return self.client
+
+    async def release(self, appliance):
+        pass
+
+
+async def test_worker_mode_feeds_api_snapshots_and_streams(monkeypatch):
+    engine, notifications = relay_engine()
+    monkeypatch.setattr(worker_module.settings, "SONICWALL_POLL_ENABLED", True)
+    monkeypatch.setattr(worker_module.settings, "LOG_COLLECTION_ENABLED", True)
+    monkeypatch.setattr(status_collector_module.settings, "METRICS_ROLLUP_ENABLED", False)
+    monkeypatch.setattr(status_collector_module.settings, "STATUS_HISTORY_ENABLED", False)
+
+    # Worker side: the collectors it starts for a claimed appliance
+    client = FakeClient()
+    worker = CollectionWorker(engine, FakeSessions(client), worker_id="worker-0")
+    worker._start("fw1")
+    status, logs = worker._collectors["fw1"]
+    for collector in (status, logs):
+        await collector.stop()
+    assert logs.broker is worker.relay
+
+    # API side: never polls, only listens
+    api_collector = StatusCollector(FakeSessions(None), appliance="fw1")
+    broker = EventBroker()
+    stream = broker.subscribe()
+    listener = RelayListener(None, engine, api_collector, broker)
+    await listener.reload()
+
+    await status.collect("botnet")
+    logs.broker.publish("log", {
+        "appliance": "fw1", "id": 7, "severity": "ALERT", "category": "Attack",
+        "timestamp": datetime(2024, 12, 13, 11, 0, tzinfo=timezone.utc), "message": "Possible port scan"
+    })
+    await worker.relay.flush()
+    for channel, payload in notifications:
+        assert channel == RELAY_CHANNEL
+        await listener.dispatch(payload)
+
+    status_event, log_event = [await stream.queue.get() for _ in range(2)]
+    assert status_event.type == "status" and status_event.data["data"] == client.botnet
+    assert log_event.type == "log" and log_event.data["id"] == 7
+    assert log_event.data["timestamp"] == datetime(2024, 12, 13, 11, 0, tzinfo=timezone.utc)
+
+    # API reads are served from the relayed snapshot, without the firewall
+    async def no_live_calls():
+        raise AssertionError("the firewall was contacted")
+
+    monkeypatch.setattr(security_service, "status_collector", api_collector)
+    assert await security_service.read_status("botnet", no_live_calls) == client.botnet
+
+    # An unchanged poll refreshes the snapshot without a second status event
+    notifications.clear()
+    await status.collect("botnet")
+    await listener.dispatch(notifications[0][1])
+    assert stream.queue.empty()
+    assert api_collector.get_snapshot("botnet").fetched_at == status.get_snapshot("botnet").fetched_at
+
+
+def test_oversized_log_events_are_truncated_to_fit():
+    payload = log_payload({"id": 1, "message": "x" * 20000, "notes": "y" * 20000})
+    assert payload is not None
+    assert len(payload.encode()) < collection_relay.NOTIFY_PAYLOAD_LIMIT
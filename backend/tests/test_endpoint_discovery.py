@@ -0,0 +1,71 @@
+import httpx
+from app.clients.discovery import EndpointDiscovery
+from app.clients.sonicwall import SonicWallClient
+
+CONTENT_FILTERING = {"database_version": "20240112"}
+
+
+def make_client(discovery, requests_seen, version_status=200):
+    def handler(request):
+        requests_seen.append(request.url.path)
+        if request.url.path == "/api/sonicos/version" and version_status != 200:
+            return httpx.Response(version_status)
+        if request.url.path == "/api/sonicos/version":
+            return httpx.Response(200, json={"firmware_version": "SonicOS 7.0.1-5145"})
+        if request.url.path == "/api/sonicos/security-services/content-filtering":
+            return httpx.Response(200, json=CONTENT_FILTERING)
+        return httpx.Response(404)
+
+    client = SonicWallClient(transport=httpx.MockTransport(handler))
+    client.base_url = "https://firewall.test"
+    client.cache = None
+    client.discovery = discovery
+    return client
+
+
+async def test_working_path_is_probed_once():
+    requests_seen = []
+    client = make_client(EndpointDiscovery(), requests_seen)
+
+    assert await client.get_content_filtering_status() == CONTENT_FILTERING
+    probes = len(requests_seen)
+    assert await client.get_content_filtering_status() == CONTENT_FILTERING
+    assert requests_seen[probes:] == ["/api/sonicos/security-services/content-filtering"]
+    await client.aclose()
+
+
+async def test_discovered_paths_persist_across_restarts(tmp_path):
+    store = str(tmp_path / "endpoints.json")
+    client = make_client(EndpointDiscovery(store_path=store), [])
+    await client.get_content_filtering_status()
+    await client.aclose()
+
+    requests_seen = []
+    restarted = make_client(EndpointDiscovery(store_path=store), requests_seen)
+    assert await restarted.get_content_filtering_status() == CONTENT_FILTERING
+    assert requests_seen == [
+        "/api/sonicos/version",
+        "/api/sonicos/security-services/content-filtering"
+    ]
+    await restarted.aclose()
+
+
+async def test_unavailable_capability_is_not_reprobed():
+    requests_seen = []
+    client = make_client(EndpointDiscovery(), requests_seen)
+
+    assert await client.get_geo_ip_status() is None
+    probes = len(requests_seen)
+    assert await client.get_geo_ip_status() is None
+    assert len(requests_seen) == probes
+    await client.aclose()
+
+
+async def test_failed_firmware_lookup_is_not_retried_every_call():
+    requests_seen = []
+    client = make_client(EndpointDiscovery(), requests_seen, version_status=404)
+
+    for _ in range(3):
+        assert await client.get_content_filtering_status() == CONTENT_FILTERING
+    assert requests_seen.count("/api/sonicos/version") == 1
+    await client.aclose()
@@ -0,0 +1,98 @@
+import asyncio
+from app.services.event_broker import EventBroker
+from app.services.status_collector import StatusCollector
+
+
+def log_event(severity, category="Network"):
+    return {"id": 1, "severity": severity, "category": category, "message": "hello"}
+
+
+async def test_subscribers_only_receive_matching_events():
+    broker = EventBroker()
+    alerts = broker.subscribe(types=frozenset({"log"}), severities=frozenset({"ALERT"}))
+    everything = broker.subscribe()
+
+    broker.publish("log", log_event("NOTICE"))
+    broker.publish("log", log_event("ALERT"))
+    broker.publish("status", {"section": "services", "data": {}})
+
+    assert alerts.queue.qsize() == 1
+    assert (await alerts.queue.get()).data["severity"] == "ALERT"
+    assert everything.queue.qsize() == 3
+
+
+async def test_slow_subscriber_drops_oldest_and_reports_lag():
+    broker = EventBroker(queue_size=2)
+    slow = broker.subscribe()
+    for i in range(5):
+        broker.publish("log", {"id": i})
+
+    assert slow.take_lagged() == 3
+    assert [(await slow.queue.get()).data["id"] for _ in range(2)] == [3, 4]
+    assert slow.take_lagged() == 0
+
+
+async def test_payload_is_serialized_once():
+    broker = EventBroker()
+    first, second = broker.subscribe(), broker.subscribe()
+    broker.publish("log", log_event("ALERT"))
+    event = await first.queue.get()
+    assert event is await second.queue.get()
+    assert '"severity": "ALERT"' in event.payload
+
+
+async def test_close_ends_every_stream():
+    broker = EventBroker()
+    subscription = broker.subscribe()
+    broker.close()
+    assert await asyncio.wait_for(subscription.queue.get(), 1) is None
+    assert broker.subscriber_count == 0
+
+
+async def test_status_collector_publishes_only_changes():
+    responses = iter([{"status": "ok"}, {"status": "ok"}, {"status": "expired"}])
+
+    class FakeClient:
+        async def get_gateway_av_status(self, refresh=False):
+            return next(responses)
+
+    class FakeSessions:
+        async def get_client(self, appliance=None):
+            return FakeClient()
+
+    broker = EventBroker()
+    subscription = broker.subscribe(sections=frozenset({"gateway_av"}))
+    collector = StatusCollector(FakeSessions(), appliance="fw1", broker=broker)
+    for _ in range(3):
+        await collector.collect("gateway_av")
+
+    assert subscription.queue.qsize() == 2
+    assert (await subscription.queue.get()).data["data"] == {"status": "ok"}
+    assert (await subscription.queue.get()).data["data"] == {"status": "expired"}
+
+
+async def test_stream_subscribes_only_while_streaming(monkeypatch):
+    from app.api.v1.endpoints import events as events_endpoint
+
+    broker = EventBroker()
+    monkeypatch.setattr(events_endpoint, "event_broker", broker)
+
+    class ConnectedRequest:
+        async def is_disconnected(self):
+            return False
+
+    # A response whose body is never iterated leaves nothing subscribed
+    response = await events_endpoint.stream_events(
+        ConnectedRequest(), types="log", severity=None, category=None, section=None
+    )
+    assert broker.subscriber_count == 0
+
+    stream = events_endpoint._sse_stream(ConnectedRequest(), types=frozenset({"log"}))
+    next_chunk = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    assert broker.subscriber_count == 1
+    broker.publish("log", {"id": 1})
+    assert (await next_chunk).startswith("id: 1\nevent: log")
+    await stream.aclose()
+    assert broker.subscriber_count == 0
+    await response.body_iterator.aclose()
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from app.clients.sonicwall import ApplianceConfig
+from app.clients.session_manager import SonicWallSessionManager
+from app.services.fleet_service import fan_out
+
+
+class FakeClient:
+    def __init__(self, name, delay, sessions):
+        self.name = name
+        self.delay = delay
+        self.sessions = sessions
+
+    async def get_gateway_av_status(self):
+        self.sessions.active += 1
+        self.sessions.peak = max(self.sessions.peak, self.sessions.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.sessions.active -= 1
+        if self.name == "broken":
+            raise RuntimeError("firewall busy")
+        return {"appliance": self.name}
+
+
+class FakeSessions:
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+
+    async def get_client(self, appliance):
+        return FakeClient(appliance, self.delays[appliance], self)
+
+
+async def test_results_stream_in_completion_order_with_timeouts():
+    sessions = FakeSessions({"slow": 0.3, "fast": 0.01, "broken": 0.05, "dead": 5})
+    started = time.monotonic()
+    results = [r async for r in fan_out(sessions, ["slow", "fast", "broken", "dead"], "gateway_av", timeout=0.5)]
+
+    assert [r["appliance"] for r in results] == ["fast", "broken", "slow", "dead"]
+    assert [r["status"] for r in results] == ["ok", "error", "ok", "timeout"]
+    assert results[1]["error"] == "firewall busy"
+    assert time.monotonic() - started < 1.5
+
+
+async def test_concurrency_is_bounded():
+    names = [f"fw{i}" for i in range(12)]
+    sessions = FakeSessions({name: 0.05 for name in names})
+    results = [r async for r in fan_out(sessions, names, "gateway_av", concurrency=3)]
+    assert len(results) == 12
+    assert sessions.peak == 3
+
+
+async def test_session_manager_keeps_one_client_per_appliance(monkeypatch):
+    from app.clients import session_manager as session_manager_module
+
+    class Client:
+        closed = 0
+
+        def __init__(self, appliance):
+            self.appliance = appliance
+
+        async def ensure_authenticated(self):
+            return True
+
+        async def close_session(self):
+            Client.closed += 1
+
+        async def aclose(self):
+            pass
+
+    monkeypatch.setattr(session_manager_module, "SonicWallClient", Client)
+    manager = SonicWallSessionManager(ApplianceConfig(name="default", host="fw0"))
+    await manager.update([ApplianceConfig(name="a", host="fw1"), ApplianceConfig(name="b", host="fw2")])
+
+    a, b = await manager.get_client("a"), await manager.get_client("b")
+    assert a.appliance.host == "fw1" and b.appliance.host == "fw2"
+    assert (await manager.get_client()).appliance.name == "default"
+    assert await manager.get_client("unknown") is None
+
+    # Reconfiguring an appliance logs out its old session
+    await manager.update([ApplianceConfig(name="a", host="fw9"), ApplianceConfig(name="b", host="fw2")])
+    assert Client.closed == 1
+    assert (await manager.get_client("a")).appliance.host == "fw9"
+    assert await manager.get_client("b") is b
+
+
+async def test_fleet_registry_is_reused_within_ttl(monkeypatch):
+    from app.services import appliance_service
+
+    loads = []
+
+    def load_appliance_configs():
+        loads.append(1)
+        return []
+
+    monkeypatch.setattr(appliance_service, "load_appliance_configs", load_appliance_configs)
+    monkeypatch.setattr(appliance_service, "_refreshed_at", None)
+
+    await appliance_service.registered_appliances()
+    await appliance_service.registered_appliances()
+    assert len(loads) == 1
+
+    # Registry changes made through the API reload it immediately
+    await appliance_service.refresh_appliances()
+    assert len(loads) == 2
+
+
+def test_registry_writes_run_off_the_event_loop(monkeypatch):
+    import threading
+    from fastapi.testclient import TestClient
+    from app.db.session import get_db
+    from app.main import app
+    from app.services import appliance_service
+
+    threads = {}
+
+    def create_appliance(db, appliance):
+        threads["write"] = threading.current_thread()
+        return {"id": 1, **appliance.dict()}
+
+    async def refresh_appliances():
+        threads["refresh"] = threading.current_thread()
+        return []
+
+    monkeypatch.setattr(appliance_service, "create_appliance", create_appliance)
+    monkeypatch.setattr(appliance_service, "refresh_appliances", refresh_appliances)
+    app.dependency_overrides[get_db] = lambda: None
+    try:
+        api = TestClient(app)
+        response = api.post(
+            "/api/v1/appliances",
+            headers={"Authorization": "Digest test"},
+            json={"name": "fw9", "host": "10.0.0.9", "username": "admin", "password": "secret"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 201
+    # The write ran in the threadpool, the refresh back on the event loop
+    assert threads["write"] is not threads["refresh"]
+
+
+async def test_fleet_lines_follow_fleet_result(monkeypatch):
+    import json
+    from app.api.v1.endpoints import fleet as fleet_endpoint
+
+    sessions = FakeSessions({"fast": 0.01, "broken": 0.02})
+    monkeypatch.setattr(fleet_endpoint, "sonicwall_sessions", sessions)
+    lines = [json.loads(line) async for line in fleet_endpoint._stream_results(["fast", "broken"], "gateway_av")]
+
+    assert lines[0]["appliance"] == "fast" and lines[0]["data"] == {"appliance": "fast"}
+    assert set(lines[1]) == {"appliance", "status", "elapsed_ms", "error"}
@@ -0,0 +1,46 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.services.log_export import export_rows, gzip_stream, parquet_available
+
+FIELDS = ["timestamp", "log_id", "severity", "message"]
+START = datetime(2024, 12, 13, tzinfo=timezone.utc)
+
+
+def rows(count):
+    for i in range(count):
+        yield {
+            "timestamp": START + timedelta(seconds=i),
+            "log_id": i,
+            "severity": "NOTICE",
+            "message": f"event, \"quoted\" #{i}"
+        }
+
+
+def test_csv_export_streams_in_chunks():
+    chunks = list(export_rows(rows(25), FIELDS, "csv", chunk_size=10))
+    assert len(chunks) == 3
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert parsed[0] == FIELDS
+    assert parsed[1] == [START.isoformat(), "0", "NOTICE", 'event, "quoted" #0']
+    assert len(parsed) == 26
+
+
+def test_ndjson_export_with_gzip():
+    data = b"".join(gzip_stream(export_rows(rows(5), FIELDS, "ndjson", chunk_size=2)))
+    lines = gzip.decompress(data).decode().splitlines()
+    assert [json.loads(line)["log_id"] for line in lines] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.skipif(not parquet_available(), reason="pyarrow not installed")
+def test_parquet_export_is_readable():
+    import pyarrow.parquet as pq
+
+    data = b"".join(export_rows(rows(25), FIELDS, "parquet", chunk_size=10))
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == 25
+    assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 3
+    assert table.column("log_id").to_pylist() == list(range(25))
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.services.log_query import (
+    InvalidLogQuery,
+    LogQuery,
+    build_log_select,
+    decode_cursor,
+    encode_cursor
+)
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trip():
+    row = {
+        "timestamp": datetime(2024, 12, 13, 11, 0, tzinfo=timezone.utc),
+        "appliance": "fw1",
+        "log_id": 42
+    }
+    assert decode_cursor(encode_cursor(row)) == (row["timestamp"], "fw1", 42)
+    with pytest.raises(InvalidLogQuery):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_pagination_instead_of_offset():
+    row = {"timestamp": datetime(2024, 12, 13, tzinfo=timezone.utc), "appliance": "fw1", "log_id": 1}
+    sql = compile_sql(build_log_select(LogQuery(), encode_cursor(row)).limit(101))
+    assert "(log_events.timestamp, log_events.appliance, log_events.log_id) <" in sql
+    assert "ORDER BY log_events.timestamp DESC" in sql
+    assert "OFFSET" not in sql
+
+
+def test_projection_and_filters():
+    query = LogQuery.from_params(
+        time_range="24h",
+        fields="message,severity",
+        severities="alert,notice",
+        port=443,
+        search="port scan"
+    )
+    sql = compile_sql(build_log_select(query))
+    select_list = sql.split("FROM")[0]
+    assert "log_events.message" in select_list
+    assert "log_events.src_ip" not in select_list
+    assert "log_events.src_port = " in sql and "log_events.dst_port = " in sql
+    assert "websearch_to_tsquery" in sql
+    assert query.severities == ["alert", "notice"]
+    assert query.start is not None
+
+
+def test_unknown_fields_and_ranges_are_rejected():
+    with pytest.raises(InvalidLogQuery):
+        LogQuery.from_params(fields="message,password")
+    with pytest.raises(InvalidLogQuery):
+        LogQuery.from_params(time_range="1y")
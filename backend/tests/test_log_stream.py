@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+import httpx
+from app.clients.logs import LogCheckpoint, normalize_log_entry, parse_log_time
+from app.clients.sonicwall import SonicWallClient
+
+WINDOW_END = datetime(2024, 12, 13, 12, 0, tzinfo=timezone.utc)
+
+
+def log_entry(log_id, minute, priority="Notice"):
+    return {
+        "time": f"UTC 12/13/2024 11:{minute:02d}:00",
+        "id": log_id,
+        "category": "Attack",
+        "priority": priority,
+        "src_int_": "X1",
+        "dst_int_": None,
+        "src_ip": "10.0.0.1",
+        "src_port": 5555,
+        "dst_ip": "10.0.0.2",
+        "dst_port": 443,
+        "ip_protocol": "tcp",
+        "user_name": None,
+        "application": None,
+        "notes": "",
+        "message": "Possible port scan"
+    }
+
+
+def paged_client(entries, page_size, pages_served):
+    def handler(request):
+        index = int(request.url.params["pageIndex"])
+        pages_served.append(index)
+        return httpx.Response(200, json=entries[index * page_size:(index + 1) * page_size])
+
+    client = SonicWallClient(transport=httpx.MockTransport(handler))
+    client.base_url = "https://firewall.test"
+    return client
+
+
+def test_normalize_log_entry():
+    event = normalize_log_entry(log_entry(7, 30, priority="Error"))
+    assert event["timestamp"] == datetime(2024, 12, 13, 11, 30, tzinfo=timezone.utc)
+    assert event["severity"] == "ALERT"
+    assert event["src_int"] == "X1"
+    assert "src_int_" not in event
+    assert normalize_log_entry({"id": 1, "time": "garbage"}) is None
+    assert parse_log_time("UTC 12/12/2024 15:02:28.000").second == 28
+
+
+async def test_stream_pages_until_short_page():
+    entries = [log_entry(i, i % 60) for i in range(25)]
+    pages_served = []
+    client = paged_client(entries, 10, pages_served)
+
+    checkpoint = LogCheckpoint()
+    events = [e async for e in client.stream_logs(checkpoint, end=WINDOW_END, page_size=10)]
+
+    assert [e["id"] for e in events] == list(range(25))
+    assert pages_served == [0, 1, 2]
+    assert checkpoint.high_water == datetime(2024, 12, 13, 11, 24, tzinfo=timezone.utc)
+    await client.aclose()
+
+
+async def test_overlapping_windows_are_deduplicated():
+    first = [log_entry(i, i) for i in range(10)]
+    client = paged_client(first, 100, [])
+    checkpoint = LogCheckpoint()
+    [e async for e in client.stream_logs(checkpoint, end=WINDOW_END)]
+    await client.aclose()
+
+    # The next window overlaps the last minutes of the first one
+    second = first[8:] + [log_entry(10, 10), log_entry(11, 11)]
+    client = paged_client(second, 100, [])
+    events = [e async for e in client.stream_logs(checkpoint, end=WINDOW_END)]
+    assert [e["id"] for e in events] == [10, 11]
+
+    # Only ids inside the overlap are retained after pruning
+    assert min(checkpoint.recent_ids.values()) >= checkpoint.high_water - timedelta(seconds=60)
+    await client.aclose()
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint = LogCheckpoint()
+    checkpoint.accept(normalize_log_entry(log_entry(3, 5)))
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint.save(path)
+    assert LogCheckpoint.load(path) == checkpoint
+
+
+async def test_seen_ids_are_pruned_page_by_page():
+    # Two hours of one event per minute, far longer than the 60s overlap
+    start = datetime(2024, 12, 13, 10, 0, tzinfo=timezone.utc)
+    entries = [
+        {**log_entry(i, 0), "time": (start + timedelta(minutes=i)).strftime("UTC %m/%d/%Y %H:%M:%S")}
+        for i in range(120)
+    ]
+    client = paged_client(entries, 10, [])
+    checkpoint = LogCheckpoint(high_water=start)
+
+    largest = 0
+    async for _ in client.stream_logs(checkpoint, end=WINDOW_END, page_size=10):
+        largest = max(largest, len(checkpoint.recent_ids))
+    # At most two pages (plus the overlap) are ever held, not all 120
+    assert largest <= 21
+    await client.aclose()
+
+
+async def test_checkpoint_only_advances_after_a_successful_flush():
+    from app.services.log_collector import LogCollector
+
+    client = paged_client([log_entry(i, i) for i in range(5)], 100, [])
+
+    class FailingWriter:
+        appliance = "fw1"
+        engine = None
+        rows_written = 0
+
+        async def add(self, event):
+            pass
+
+        async def flush(self):
+            raise RuntimeError("database unavailable")
+
+    class FakeSessions:
+        async def get_client(self, appliance=None):
+            return client
+
+    collector = LogCollector(FakeSessions(), FailingWriter(), manage_storage=False)
+    collector.checkpoint = LogCheckpoint()
+    try:
+        await collector.collect()
+    except RuntimeError:
+        pass
+    assert collector.checkpoint.high_water is None
+    assert collector.checkpoint.recent_ids == {}
+    await client.aclose()
+
+
+async def test_entries_with_invalid_ids_are_skipped():
+    assert normalize_log_entry({**log_entry(1, 0), "id": "abc"}) is None
+    assert normalize_log_entry({**log_entry(1, 0), "id": ""}) is None
+    assert normalize_log_entry({**log_entry(1, 0), "id": None}) is None
+    assert normalize_log_entry({**log_entry(1, 0), "id": "12"})["id"] == 12
+
+    entries = [log_entry(1, 1), {**log_entry(2, 2), "id": "garbage"}, log_entry(3, 3)]
+    client = paged_client(entries, 10, [])
+    checkpoint = LogCheckpoint()
+    events = [e async for e in client.stream_logs(checkpoint, end=WINDOW_END, page_size=10)]
+
+    assert [e["id"] for e in events] == [1, 3]
+    assert checkpoint.high_water == datetime(2024, 12, 13, 11, 3, tzinfo=timezone.utc)
+    await client.aclose()
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from app.services.log_writer import LOG_COLUMNS, _copy_value, event_to_row, merge_stage_sql
+
+
+def test_copy_values_are_escaped():
+    assert _copy_value(None) == "\\N"
+    assert _copy_value("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+    assert _copy_value(443) == "443"
+    assert _copy_value(datetime(2024, 12, 13, tzinfo=timezone.utc)) == "2024-12-13T00:00:00+00:00"
+
+
+def test_event_to_row_uses_appliance_and_log_id():
+    row = event_to_row("fw1", {"id": 42, "message": "hello", "severity": "NOTICE"})
+    assert list(row) == LOG_COLUMNS
+    assert row["appliance"] == "fw1"
+    assert row["log_id"] == 42
+    assert row["src_ip"] is None
+
+
+def test_merge_upserts_on_primary_key_and_rolls_up():
+    sql = merge_stage_sql(rollups=True)
+    assert "ON CONFLICT (appliance, log_id, timestamp) DO NOTHING" in sql
+    assert "INSERT INTO metric_rollups" in sql
+    assert "metric_rollups" not in merge_stage_sql(rollups=False)
+
+
+def test_partition_names_round_trip():
+    from datetime import date
+    from app.db.partitions import partition_name, _partition_day
+
+    assert partition_name(date(2024, 12, 13)) == "log_events_20241213"
+    assert _partition_day("log_events_20241213") == date(2024, 12, 13)
+    assert _partition_day("log_events_default") is None
+
+
+def test_writer_creates_partitions_for_each_batch_day(monkeypatch):
+    from datetime import date
+    from app.services import log_writer
+
+    created = []
+    monkeypatch.setattr(log_writer, "create_log_partitions", lambda engine, days: created.append(list(days)))
+    writer = log_writer.LogBatchWriter(engine=None, appliance="fw1")
+
+    # A backfilled batch reaching well before the maintained window
+    rows = [
+        {"timestamp": datetime(2024, 1, 2, 23, 59, tzinfo=timezone.utc)},
+        {"timestamp": datetime(2024, 12, 13, 1, 0, tzinfo=timezone.utc)},
+    ]
+    writer._ensure_partitions(rows)
+    writer._ensure_partitions(rows)
+    writer._ensure_partitions([{"timestamp": datetime(2024, 12, 14, tzinfo=timezone.utc)}])
+
+    assert created == [[date(2024, 1, 2), date(2024, 12, 13)], [date(2024, 12, 14)]]
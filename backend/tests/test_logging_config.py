@@ -0,0 +1,44 @@
+import logging
+import httpx
+from app.clients.sonicwall import SonicWallClient
+from app.core.logging_config import parse_levels, redact_headers, truncate_body
+
+
+class UnreadableResponse:
+    status_code = 200
+    headers = {}
+
+    @property
+    def text(self):
+        raise AssertionError("body decoded although debug logging is off")
+
+
+def test_parse_levels():
+    assert parse_levels("app.clients=debug, sqlalchemy.engine=WARNING") == {
+        "app.clients": "DEBUG",
+        "sqlalchemy.engine": "WARNING",
+    }
+
+
+def test_truncate_body():
+    assert truncate_body("short", limit=10) == "short"
+    assert truncate_body("x" * 25, limit=10) == "xxxxxxxxxx... [15 more characters]"
+
+
+def test_redact_headers():
+    headers = {"Authorization": "Digest response=abc", "Content-Type": "application/json"}
+    assert redact_headers(headers) == {"Authorization": "<redacted>", "Content-Type": "application/json"}
+
+
+async def test_response_logging_is_lazy_and_redacted(caplog):
+    client = SonicWallClient()
+    caplog.set_level(logging.INFO, logger="app.clients.sonicwall")
+    client._log_response("Botnet", UnreadableResponse())
+
+    caplog.set_level(logging.DEBUG, logger="app.clients.sonicwall")
+    response = httpx.Response(200, headers={"Set-Cookie": "session=secret"}, text="y" * 2000)
+    client._log_response("Botnet", response)
+    assert "secret" not in caplog.text
+    assert "<redacted>" in caplog.text
+    assert "more characters" in caplog.text
+    await client.aclose()
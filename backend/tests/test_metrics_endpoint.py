@@ -0,0 +1,62 @@
+import httpx
+from fastapi.testclient import TestClient
+from app.clients.cache import ResponseCache
+from app.main import app
+
+
+def sample(text, name, **labels):
+    for line in text.splitlines():
+        if line.startswith(name + "{") and all(f'{k}="{v}"' in line for k, v in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_metrics_endpoint_records_route_latency():
+    client = TestClient(app)
+    client.get("/api/v1/")
+    body = client.get("/metrics").text
+    assert sample(body, "http_request_duration_seconds_count", route="/api/v1/", status="200") >= 1
+    assert "/metrics" not in client.get("/api/openapi.json").json()["paths"]
+
+
+async def test_upstream_latency_and_cache_outcomes():
+    from prometheus_client import generate_latest
+    from app.clients.sonicwall import SonicWallClient
+
+    client = SonicWallClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"botnet_database": "Downloaded"})
+    ))
+    client.base_url = "https://firewall.test"
+    client._authenticated = True
+    client._last_used = float("inf")
+    client.cache = ResponseCache()
+
+    before = sample(generate_latest().decode(), "sonicwall_cache_requests_total", endpoint="botnet", result="hit") or 0
+    await client.get_botnet_status()
+    await client.get_botnet_status()
+    body = generate_latest().decode()
+    assert sample(body, "sonicwall_cache_requests_total", endpoint="botnet", result="hit") == before + 1
+    assert sample(
+        body, "sonicwall_upstream_request_seconds_count",
+        endpoint="/api/sonicos/reporting/botnet/status", status="200"
+    ) >= 1
+    await client.aclose()
+
+
+def test_failed_statements_are_counted():
+    import pytest
+    from prometheus_client import generate_latest
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.exc import OperationalError
+    from app.core.metrics import instrument_engine
+
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    before = sample(generate_latest().decode(), "db_query_errors_total", operation="SELECT") or 0
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info["query_started"] == []
+        conn.execute(text("SELECT 1"))
+
+    assert sample(generate_latest().decode(), "db_query_errors_total", operation="SELECT") == before + 1
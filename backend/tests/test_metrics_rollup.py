@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from app.services.metrics_service import (
+    LOG_ROLLUP_SQL,
+    active_connections,
+    bucket_start,
+    choose_granularity
+)
+
+
+def test_bucket_start_truncates_in_utc():
+    ts = datetime(2024, 12, 13, 10, 42, 17, 500, tzinfo=timezone(timedelta(hours=2)))
+    assert bucket_start(ts, "1m") == datetime(2024, 12, 13, 8, 42, tzinfo=timezone.utc)
+    assert bucket_start(ts, "1h") == datetime(2024, 12, 13, 8, tzinfo=timezone.utc)
+    assert bucket_start(ts, "1d") == datetime(2024, 12, 13, tzinfo=timezone.utc)
+
+
+def test_choose_granularity_keeps_long_ranges_small():
+    end = datetime(2024, 12, 13, tzinfo=timezone.utc)
+    assert choose_granularity(end - timedelta(hours=1), end, 1000) == "1m"
+    assert choose_granularity(end - timedelta(days=7), end, 1000) == "1h"
+    # 30 days of hourly buckets is 720 rows, not millions of events
+    assert choose_granularity(end - timedelta(days=30), end, 1000) == "1h"
+    assert choose_granularity(end - timedelta(days=30), end, 500) == "1d"
+    assert choose_granularity(end - timedelta(days=3650), end, 1000) == "1d"
+
+
+def test_log_rollup_covers_every_granularity_and_metric():
+    assert "('1m', 'minute'), ('1h', 'hour'), ('1d', 'day')" in LOG_ROLLUP_SQL
+    assert "('log_events', NULL::text), ('threats_blocked', 'ALERT')" in LOG_ROLLUP_SQL
+    assert "ON CONFLICT (appliance, metric, granularity, bucket_start) DO UPDATE" in LOG_ROLLUP_SQL
+
+
+def test_active_connections_sums_dpi_connections():
+    data = [{"dpi_connections": "120"}, {"dpi_connections": "30"}]
+    assert active_connections(data) == 150.0
+    assert active_connections({"dpi_connections": 7}) == 7.0
+    assert active_connections([{"appflow": True}]) is None
+
+
+def test_metric_endpoint_accepts_naive_bounds(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.api.v1.endpoints import metrics as metrics_endpoint
+    from app.db.session import get_db
+    from app.main import app
+
+    requested = {}
+
+    def get_metric_series(db, metric, start, end, granularity, appliance):
+        requested.update(start=start, end=end)
+        return []
+
+    monkeypatch.setattr(metrics_endpoint, "get_metric_series", get_metric_series)
+    app.dependency_overrides[get_db] = lambda: None
+    try:
+        response = TestClient(app).get(
+            "/api/v1/metrics/threats_blocked",
+            params={"start": "2024-01-01T00:00:00"},
+            headers={"Authorization": "Digest test"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert requested["start"] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_metric_endpoint_bounds_explicit_granularity(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.api.v1.endpoints import metrics as metrics_endpoint
+    from app.db.session import get_db
+    from app.main import app
+
+    monkeypatch.setattr(metrics_endpoint, "get_metric_series", lambda *args: [])
+    monkeypatch.setattr(metrics_endpoint.settings, "METRICS_MAX_POINTS", 1000)
+    app.dependency_overrides[get_db] = lambda: None
+    try:
+        api = TestClient(app)
+        statuses = {
+            granularity: api.get(
+                "/api/v1/metrics/threats_blocked",
+                params={"range": "30d", "granularity": granularity},
+                headers={"Authorization": "Digest test"}
+            ).status_code
+            for granularity in ("1m", "1h", "1d")
+        }
+    finally:
+        app.dependency_overrides.clear()
+
+    # 43,200 one-minute buckets exceed the bound; 720 hourly ones don't
+    assert statuses == {"1m": 422, "1h": 200, "1d": 200}
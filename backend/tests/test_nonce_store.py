@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine
+from app.core import security
+from app.services import nonce_store as nonces
+from app.services import user_service
+from app.services.nonce_store import DatabaseNonceStore, MemoryNonceStore
+from app.services.user_cache import user_cache
+from tests.test_user_cache import digest_credentials
+
+
+@pytest.fixture(params=["memory", "database"])
+def store(request):
+    if request.param == "memory":
+        return MemoryNonceStore(lifetime=300)
+    return DatabaseNonceStore(create_engine("sqlite://"), lifetime=300)
+
+
+def test_nonce_reused_with_increasing_count(store):
+    nonce = store.issue()
+
+    assert store.use(nonce, 1) == nonces.VALID
+    assert store.use(nonce, 2) == nonces.VALID
+    assert store.use(nonce, 5) == nonces.VALID
+    # Replays and out-of-order counts are rejected
+    assert store.use(nonce, 5) == nonces.INVALID
+    assert store.use(nonce, 3) == nonces.INVALID
+    assert store.use("never-issued", 1) == nonces.INVALID
+
+
+def test_expired_nonce_is_stale(store):
+    nonce = store.issue()
+    store.lifetime = 0
+
+    assert store.use(nonce, 1) == nonces.STALE
+
+
+def test_memory_store_forgets_oldest_nonces():
+    store = MemoryNonceStore(max_entries=2)
+    first, second, third = store.issue(), store.issue(), store.issue()
+
+    assert store.use(first, 1) == nonces.INVALID
+    assert store.use(second, 1) == nonces.VALID
+    assert store.use(third, 1) == nonces.VALID
+
+
+async def test_verify_digest_auth_checks_nonce(monkeypatch):
+    store = MemoryNonceStore()
+    monkeypatch.setattr(nonces, "nonce_store", store)
+    async def get_user_by_username(db, username):
+        return SimpleNamespace(id=1, username=username, password="secret", is_admin=True)
+
+    monkeypatch.setattr(user_service, "get_user_by_username", get_user_by_username)
+    user_cache.invalidate()
+    nonce = await security.generate_nonce()
+
+    assert await security.verify_digest_auth(digest_credentials("admin", "secret", nonce), db=None) is not None
+    assert await security.verify_digest_auth(digest_credentials("admin", "secret", nonce), db=None) is None
+    assert await security.verify_digest_auth(digest_credentials("admin", "secret", "forged"), db=None) is None
+    # A wrong password doesn't use up nonce-counts
+    assert await security.verify_digest_auth(digest_credentials("admin", "wrong", nonce, nc="00000002"), db=None) is None
+    assert await security.verify_digest_auth(digest_credentials("admin", "secret", nonce, nc="00000002"), db=None) is not None
+
+    store.lifetime = 0
+    with pytest.raises(security.StaleNonceError):
+        await security.verify_digest_auth(digest_credentials("admin", "secret", nonce, nc="00000003"), db=None)
+    user_cache.invalidate()
+
+
+async def test_stale_challenge():
+    assert (await security.generate_digest_challenge(stale=True)).endswith(", stale=true")
+    assert "stale" not in await security.generate_digest_challenge()
@@ -0,0 +1,143 @@
+import asyncio
+import time
+import httpx
+import pytest
+from app.clients import sonicwall as sonicwall_module
+from app.clients.resilience import CircuitBreaker, CircuitOpenError, TokenBucket
+from app.clients.sonicwall import SonicWallClient
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(sonicwall_module.settings, "SONICWALL_RETRIES", 2)
+    monkeypatch.setattr(sonicwall_module.settings, "SONICWALL_RETRY_BACKOFF", 0.001)
+
+
+def make_client(handler):
+    client = SonicWallClient(transport=httpx.MockTransport(handler))
+    client.base_url = "https://firewall.test"
+    client._authenticated = True
+    client._last_used = time.monotonic()
+    return client
+
+
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_token_bucket_backs_off_and_recovers():
+    bucket = TokenBucket(rate=10, capacity=10)
+    bucket.penalize()
+    bucket.penalize()
+    assert bucket.rate == 2.5
+    for _ in range(20):
+        bucket.reward()
+    assert bucket.rate == 10
+
+
+def test_breaker_opens_then_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_busy_firewall_is_retried(fast_retries):
+    statuses = iter([503, 500, 200])
+    client = make_client(lambda request: httpx.Response(next(statuses), json={"ok": True}))
+
+    response = await client._request("GET", "/api/sonicos/reporting/botnet/status")
+    assert response.status_code == 200
+    assert client.breaker.failures == 0
+    assert client.limiter.rate < client.limiter.max_rate
+    await client.aclose()
+
+
+async def test_writes_are_not_retried(fast_retries):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = make_client(handler)
+    response = await client._request("POST", "/api/sonicos/config/pending")
+    assert response.status_code == 503
+    assert len(calls) == 1
+    await client.aclose()
+
+
+async def test_open_circuit_serves_cached_data(fast_retries, monkeypatch):
+    monkeypatch.setattr(sonicwall_module.settings, "SONICWALL_RETRIES", 0)
+    healthy = True
+
+    def handler(request):
+        if healthy:
+            return httpx.Response(200, json={"botnet_database": "Downloaded"})
+        return httpx.Response(503)
+
+    client = make_client(handler)
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    assert await client.get_botnet_status() == {"botnet_database": "Downloaded"}
+
+    healthy = False
+    client.cache.invalidate()
+    client.cache.put(("botnet",), {"botnet_database": "Downloaded"})
+    assert await client.get_botnet_status(refresh=True) is None  # opens the circuit
+    assert client.breaker.is_open
+
+    # Even though the cached entry is stale, it is served instead of failing
+    client.cache.get_entry(("botnet",)).fetched_at -= 3600
+    assert await client.get_botnet_status() == {"botnet_database": "Downloaded"}
+    with pytest.raises(CircuitOpenError):
+        await client._request("GET", "/api/sonicos/reporting/botnet/status")
+    await client.aclose()
+
+
+async def test_cancelled_trial_does_not_wedge_breaker(monkeypatch):
+    client = make_client(lambda request: httpx.Response(200))
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    client.breaker.record_failure()
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(client, "_send", hang)
+    trial = asyncio.create_task(client._request("GET", "/api/sonicos/reporting/botnet/status"))
+    await asyncio.sleep(0.01)
+    assert not client.breaker.allow()  # the trial is in flight
+    trial.cancel()
+    await asyncio.gather(trial, return_exceptions=True)
+
+    assert client.breaker.allow()
+    await client.aclose()
+
+
+async def test_open_circuit_skips_login_handshake(monkeypatch):
+    monkeypatch.setattr(sonicwall_module.settings, "SONICWALL_RETRIES", 0)
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        raise httpx.ConnectError("unreachable")
+
+    client = make_client(handler)
+    client._authenticated = False
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+
+    results = await asyncio.gather(*(client.ensure_authenticated() for _ in range(5)))
+    assert not any(results)
+    assert client.breaker.state == CircuitBreaker.OPEN
+    assert calls == ["/api/sonicos/auth"]
+    await client.aclose()
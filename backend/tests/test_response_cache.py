@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from app.clients.cache import ResponseCache
+
+
+class Upstream:
+    """Counts calls and returns an incrementing value after a short delay."""
+
+    def __init__(self, delay: float = 0.05):
+        self.calls = 0
+        self.delay = delay
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"version": self.calls}
+
+
+async def test_fresh_entries_are_served_from_cache():
+    cache = ResponseCache(default_ttl=60)
+    upstream = Upstream()
+    assert await cache.get_or_fetch(("botnet",), upstream.fetch) == {"version": 1}
+    assert await cache.get_or_fetch(("botnet",), upstream.fetch) == {"version": 1}
+    assert upstream.calls == 1
+
+
+async def test_concurrent_misses_share_one_fetch():
+    cache = ResponseCache(default_ttl=60)
+    upstream = Upstream()
+    results = await asyncio.gather(
+        *(cache.get_or_fetch(("botnet",), upstream.fetch) for _ in range(50))
+    )
+    assert upstream.calls == 1
+    assert all(result == {"version": 1} for result in results)
+
+
+async def test_stale_entry_served_while_revalidating():
+    cache = ResponseCache(default_ttl=0.01, stale_ttl=60)
+    upstream = Upstream()
+    await cache.get_or_fetch(("ips",), upstream.fetch)
+    await asyncio.sleep(0.02)
+
+    # Expired: the old value comes back immediately, a refresh starts
+    assert await cache.get_or_fetch(("ips",), upstream.fetch) == {"version": 1}
+    await asyncio.sleep(0.1)
+    assert upstream.calls == 2
+    assert cache.get_entry(("ips",)).value == {"version": 2}
+
+
+async def test_per_endpoint_ttl():
+    cache = ResponseCache(default_ttl=60, ttls={"content_filtering": 0}, stale_ttl=0)
+    upstream = Upstream(delay=0)
+    await cache.get_or_fetch(("content_filtering",), upstream.fetch)
+    await cache.get_or_fetch(("content_filtering",), upstream.fetch)
+    assert upstream.calls == 2
+    assert cache.ttl_for(("botnet",)) == 60
+
+
+async def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.put(("a",), 1)
+    cache.put(("b",), 2)
+    await cache.get_or_fetch(("a",), Upstream().fetch)
+    cache.put(("c",), 3)
+    assert cache.get_entry(("b",)) is None
+    assert cache.get_entry(("a",)).value == 1
+
+
+async def test_failed_fetch_is_not_cached():
+    cache = ResponseCache()
+
+    async def failing():
+        return None
+
+    assert await cache.get_or_fetch(("botnet",), failing) is None
+    assert cache.get_entry(("botnet",)) is None
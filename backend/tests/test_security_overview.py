@@ -0,0 +1,81 @@
+import asyncio
+import time
+from app.services.security_service import get_security_overview
+
+GATEWAY_AV = {
+    "signature_database": "Downloaded",
+    "signature_database_timestamp": "UTC 12/12/2024 15:02:28.000",
+    "last_checked": "12/13/2024 16:29:02.864",
+    "gateway_anti_virus_expiration_date": "UTC 04/05/2026 00:00:00.000"
+}
+
+
+class FakeClient:
+    """Every status call takes 0.2s; botnet fails and IPS returns bad data."""
+
+    async def _slow(self, result):
+        await asyncio.sleep(0.2)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def get_security_services_status(self, refresh=False):
+        return await self._slow(None)
+
+    async def get_gateway_av_status(self, refresh=False):
+        return await self._slow(GATEWAY_AV)
+
+    async def get_intrusion_prevention_status(self, refresh=False):
+        return await self._slow({"signature_database": "Downloaded"})
+
+    async def get_botnet_status(self, refresh=False):
+        return await self._slow(RuntimeError("firewall busy"))
+
+    async def get_anti_spyware_status(self, refresh=False):
+        return await self._slow(None)
+
+    async def get_content_filtering_status(self, refresh=False):
+        return await self._slow({"database_version": "20240112"})
+
+
+async def provide_client():
+    return FakeClient()
+
+
+async def test_overview_fans_out_concurrently():
+    started = time.monotonic()
+    overview = await get_security_overview(provide_client)
+    assert time.monotonic() - started < 0.6
+    assert len(overview.sections) == 6
+
+
+async def test_overview_reports_errors_per_section():
+    overview = await get_security_overview(provide_client)
+
+    assert overview.gateway_av.signature_database == "Downloaded"
+    assert overview.sections["gateway_av"].status == "ok"
+    assert overview.content_filtering.database_version == "20240112"
+
+    assert overview.botnet is None
+    assert overview.sections["botnet"].error == "firewall busy"
+    assert overview.ips is None
+    assert overview.sections["ips"].status == "error"
+    assert overview.sections["services"].status == "error"
+
+
+async def test_snapshot_is_served_without_calling_the_firewall(monkeypatch):
+    from app.services import security_service
+    from app.services.status_collector import StatusCollector
+
+    class FakeSessions:
+        async def get_client(self, refresh=False):
+            return FakeClient()
+
+    collector = StatusCollector(FakeSessions())
+    monkeypatch.setattr(security_service, "status_collector", collector)
+    await collector.collect("gateway_av")
+
+    async def no_client():
+        raise AssertionError("firewall should not be contacted")
+
+    assert await security_service.read_status("gateway_av", no_client) == GATEWAY_AV
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.services import user_service
+from app.services.session_cache import SessionActivityWriter, SessionCache
+
+
+class AsyncAdapter:
+    """Just enough of AsyncSession over a sync Session (no async SQLite driver here)."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def execute(self, statement, params=None):
+        return self.db.execute(statement, params)
+
+    async def commit(self):
+        self.db.commit()
+
+
+def make_db(monkeypatch):
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    SessionModel.__table__.create(engine)
+    monkeypatch.setattr(user_service, "session_cache", SessionCache(ttl=60))
+    activity = SessionActivityWriter(engine)
+    monkeypatch.setattr(user_service, "session_activity", activity)
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: queries.append(statement))
+    return engine, activity, queries
+
+
+def add_session(db, session_id, user_id):
+    db.add(SessionModel(id=session_id, user_id=user_id, expires_at=datetime.now(timezone.utc) + timedelta(hours=1)))
+    db.commit()
+    return session_id
+
+
+def test_login_lock_namespace_differs_from_worker_locks():
+    from app import worker
+    assert user_service.LOCK_NAMESPACE != worker.LOCK_NAMESPACE
+
+
+async def test_validate_session_is_cached_until_terminated(monkeypatch):
+    engine, _, queries = make_db(monkeypatch)
+    with Session(engine) as db:
+        db.add(User(id=1, username="admin", password="secret", is_admin=True))
+        db.commit()
+        session_id = add_session(db, "s1", 1)
+
+        queries.clear()
+        assert await user_service.validate_session(AsyncAdapter(db), session_id)
+        assert await user_service.validate_session(AsyncAdapter(db), session_id)
+        assert await user_service.validate_session(AsyncAdapter(db), session_id)
+        assert len(queries) == 1
+
+        await user_service.terminate_session(AsyncAdapter(db), 1)
+        assert not await user_service.validate_session(AsyncAdapter(db), session_id)
+
+
+def test_cache_entry_never_outlives_session():
+    cache = SessionCache(ttl=60)
+    cache.put("gone", 1, datetime.now(timezone.utc) - timedelta(seconds=1))
+    cache.put("live", 1, datetime.now(timezone.utc) + timedelta(hours=1))
+
+    assert cache.get("gone") is None
+    assert cache.get("live") == 1
+
+
+async def test_activity_is_written_in_one_batch(monkeypatch):
+    engine, activity, queries = make_db(monkeypatch)
+    with Session(engine) as db:
+        db.add(User(id=1, username="admin", password="secret", is_admin=True))
+        db.add(User(id=2, username="ops", password="secret", is_admin=False))
+        db.commit()
+        first = add_session(db, "s1", 1)
+        second = add_session(db, "s2", 2)
+        for _ in range(5):
+            await user_service.validate_session(AsyncAdapter(db), first)
+            await user_service.validate_session(AsyncAdapter(db), second)
+
+        queries.clear()
+        assert activity.flush() == 2
+        assert len([q for q in queries if q.startswith("UPDATE")]) == 1
+        assert activity.flush() == 0
+
+        db.expire_all()
+        assert db.get(SessionModel, first).last_activity is not None
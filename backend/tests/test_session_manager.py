@@ -0,0 +1,113 @@
+import asyncio
+import time
+import httpx
+import pytest
+from app.clients import session_manager as session_manager_module
+from app.clients.sonicwall import SonicWallClient
+from app.clients.session_manager import SonicWallSessionManager
+
+
+class FakeClient:
+    """Stands in for SonicWallClient, counting logins and logouts."""
+
+    def __init__(self, appliance=None):
+        self.appliance = appliance
+        self.logins = 0
+        self.logouts = 0
+        self.authenticated = False
+        self._lock = asyncio.Lock()
+
+    async def ensure_authenticated(self) -> bool:
+        async with self._lock:
+            if not self.authenticated:
+                await asyncio.sleep(0.01)
+                self.logins += 1
+                self.authenticated = True
+        return True
+
+    async def close_session(self) -> bool:
+        self.logouts += 1
+        self.authenticated = False
+        return True
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(session_manager_module, "SonicWallClient", FakeClient)
+    return SonicWallSessionManager()
+
+
+async def test_concurrent_requests_share_one_login(manager):
+    clients = await asyncio.gather(*(manager.get_client() for _ in range(20)))
+    assert all(client is clients[0] for client in clients)
+    assert clients[0].logins == 1
+
+
+async def test_close_logs_out_once(manager):
+    client = await manager.get_client()
+    await manager.close()
+    await manager.close()
+    assert client.logouts == 1
+
+
+async def test_client_reauthenticates_once_on_401(monkeypatch):
+    statuses = iter([401, 200])
+    transport = httpx.MockTransport(lambda request: httpx.Response(next(statuses)))
+    client = SonicWallClient(transport=transport)
+    client.base_url = "https://firewall.test"
+    logins = []
+
+    async def fake_authenticate():
+        logins.append(1)
+        client._authenticated = True
+        client._auth_generation += 1
+        return True
+
+    monkeypatch.setattr(client, "authenticate", fake_authenticate)
+
+    response = await client._request("GET", "/api/sonicos/reporting/botnet/status")
+    assert response.status_code == 200
+    assert len(logins) == 1
+    await client.aclose()
+
+
+async def test_concurrent_calls_overlap():
+    async def slow_handler(request):
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"botnet_database": "Downloaded", "message": "ok"})
+
+    client = SonicWallClient(transport=httpx.MockTransport(slow_handler))
+    client.base_url = "https://firewall.test"
+    client.cache = None
+    client._authenticated = True
+    client._last_used = time.monotonic()
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(client.get_botnet_status() for _ in range(10)))
+    elapsed = time.monotonic() - started
+
+    assert all(result["botnet_database"] == "Downloaded" for result in results)
+    assert elapsed < 1.0
+    await client.aclose()
+
+
+def test_auth_endpoints_leave_shared_session_alone():
+    from fastapi.testclient import TestClient
+    from app.core.deps import get_sonicwall_client
+    from app.main import app
+
+    shared = FakeClient()
+    shared.authenticated = True
+    app.dependency_overrides[get_sonicwall_client] = lambda: shared
+    try:
+        api = TestClient(app)
+        assert api.post("/api/v1/auth/login").status_code == 200
+        assert api.delete("/api/v1/auth/logout").status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+
+    assert shared.logins == 0
+    assert shared.logouts == 0 and shared.authenticated
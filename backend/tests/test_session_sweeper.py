@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.services.session_sweeper import SessionSweeper, create_session_indexes
+
+
+def test_session_indexes_are_partial():
+    ddl = [
+        str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in SessionModel.__table__.indexes
+    ]
+    assert ddl and all(statement.endswith("WHERE is_active") for statement in ddl)
+
+
+def test_sweep_expires_sessions_in_batches():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    SessionModel.__table__.create(engine)
+    create_session_indexes(engine)
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        db.add(User(id=1, username="admin", password="secret", is_admin=True))
+        for i in range(5):
+            db.add(SessionModel(id=f"old-{i}", user_id=1, expires_at=now - timedelta(minutes=i + 1)))
+        db.add(SessionModel(id="live", user_id=1, expires_at=now + timedelta(hours=1)))
+        db.commit()
+
+    assert SessionSweeper(engine, batch_size=2).sweep() == 5
+
+    with Session(engine) as db:
+        active = [session.id for session in db.query(SessionModel).filter(SessionModel.is_active == True)]
+    assert active == ["live"]
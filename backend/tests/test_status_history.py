@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.models.status_history import StatusHistory
+from app.services.status_collector import StatusCollector
+from app.services.status_history import get_status_history, record_status
+
+
+def ips_status(signatures, last_checked):
+    return {
+        "signature_database": signatures,
+        "signature_database_timestamp": "",
+        "last_checked": last_checked,
+        "ips_service_expiration_date": "2027-01-01",
+    }
+
+
+def make_collector(engine, responses):
+    class FakeClient:
+        async def get_intrusion_prevention_status(self, refresh=False):
+            return next(responses)
+
+    class FakeSessions:
+        async def get_client(self, appliance=None):
+            return FakeClient()
+
+    return StatusCollector(FakeSessions(), appliance="fw1", history_engine=engine)
+
+
+def stored_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(StatusHistory)).scalar()
+
+
+async def test_collector_stores_only_changes():
+    # One shared in-memory database, as the collector writes from a thread
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    responses = iter([
+        ips_status("Downloaded", "10:00"),
+        ips_status("Downloaded", "10:00"),
+        ips_status("Downloaded", "10:30"),
+        ips_status("Downloaded", "10:30"),
+    ])
+    collector = make_collector(engine, responses)
+    for _ in range(4):
+        await collector.collect("ips")
+    assert stored_rows(engine) == 2
+
+    # A restarted collector compares its first poll with the stored history
+    restarted = make_collector(engine, iter([ips_status("Downloaded", "10:30")]))
+    await restarted.collect("ips")
+    assert stored_rows(engine) == 2
+
+
+def test_history_filters_changes_by_field():
+    engine = create_engine("sqlite://")
+    StatusHistory.__table__.create(engine)
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    statuses = [
+        ips_status("v1", "10:00"),
+        ips_status("v1", "11:00"),
+        ips_status("v2", "12:00"),
+        ips_status("v2", "13:00"),
+    ]
+    for hour, data in enumerate(statuses):
+        record_status(engine, "fw1", "ips", started + timedelta(hours=hour), str(hour), data)
+    # Unchanged content is not written again
+    assert not record_status(engine, "fw1", "ips", started + timedelta(hours=5), "3", statuses[-1])
+
+    with Session(engine) as db:
+        changes = get_status_history(db, "fw1", "ips")
+        assert [change["changed"] for change in changes[:3]] == [
+            ["last_checked"],
+            ["last_checked", "signature_database"],
+            ["last_checked"],
+        ]
+
+        updates = get_status_history(db, "fw1", "ips", field="signature_database")
+        assert [change["data"]["signature_database"] for change in updates] == ["v2", "v1"]
+        latest = get_status_history(db, "fw1", "ips", field="signature_database", limit=1)
+        assert [change["digest"] for change in latest] == ["2"]
+
+        # The change before the range tells what the first change in it changed
+        later = get_status_history(db, "fw1", "ips", start=started + timedelta(hours=2), field="signature_database")
+        assert [change["digest"] for change in later] == ["2"]
+
+
+def test_history_endpoint_accepts_mixed_naive_and_aware_bounds(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.api.v1.endpoints import security as security_endpoint
+    from app.db.session import get_db
+    from app.main import app
+
+    monkeypatch.setattr(security_endpoint, "get_status_history", lambda *args: [])
+    app.dependency_overrides[get_db] = lambda: None
+    try:
+        response = TestClient(app).get(
+            "/api/v1/security/ips/history",
+            params={"start": "2026-01-02T00:00:00", "end": "2026-01-01T00:00:00+00:00"},
+            headers={"Authorization": "Digest test"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 400
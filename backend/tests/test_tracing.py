@@ -0,0 +1,65 @@
+import httpx
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from sqlalchemy import create_engine, text
+from app.core.tracing import trace_engine
+
+exporter = InMemorySpanExporter()
+
+
+@pytest.fixture(autouse=True)
+def spans():
+    # The global provider can only be installed once per process
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        trace.set_tracer_provider(provider)
+    exporter.clear()
+    yield exporter
+
+
+def by_name(spans, name):
+    return next(span for span in spans.get_finished_spans() if span.name == name)
+
+
+async def test_login_and_upstream_calls_are_spans(spans):
+    from app.clients.sonicwall import SonicWallClient
+
+    def handler(request):
+        if request.url.path == "/api/sonicos/auth" and request.method == "GET":
+            return httpx.Response(401, headers={"WWW-Authenticate": 'Digest realm="fw", nonce="n", qop="auth"'})
+        return httpx.Response(200, json={"botnet_database": "Downloaded"})
+
+    client = SonicWallClient(transport=httpx.MockTransport(handler))
+    client.base_url = "https://firewall.test"
+    client.cache = None
+    assert await client.ensure_authenticated()
+    await client.get_botnet_status()
+
+    login = by_name(spans, "sonicwall authenticate")
+    for step in ("sonicwall auth challenge", "sonicwall auth response", "sonicwall start management"):
+        assert by_name(spans, step).parent.span_id == login.context.span_id
+    call = by_name(spans, "sonicwall GET /api/sonicos/reporting/botnet/status")
+    assert call.attributes["http.status_code"] == 200
+    assert call.attributes["sonicwall.endpoint"] == "/api/sonicos/reporting/botnet/status"
+    await client.aclose()
+
+
+def test_sql_statements_are_spans(spans):
+    engine = create_engine("sqlite://")
+    trace_engine(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert by_name(spans, "db SELECT").attributes["db.statement"] == "SELECT 1"
+
+
+def test_routes_are_named_by_template(spans):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    TestClient(app).get("/api/v1/logs/export", params={"format": "xml"})
+    span = by_name(spans, "GET /api/v1/logs/export")
+    assert span.attributes["http.status_code"] == 401
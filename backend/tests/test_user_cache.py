@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.core import security
+from app.models.user import User
+from app.services import user_service
+from app.services.user_cache import CachedUser, UserCache, UserChangeListener, user_cache
+
+
+def cached(username, ha1="ha1"):
+    return CachedUser(id=1, username=username, is_admin=True, ha1=ha1)
+
+
+def digest_credentials(username, password, nonce, nc="00000001", cnonce="xyz"):
+    ha1 = security.calculate_ha1(username, password)
+    ha2 = security.calculate_ha2("GET", "/")
+    response = security.calculate_response(ha1, nonce, nc, cnonce, "auth", ha2)
+    header = (
+        f'Digest username="{username}", nonce="{nonce}", nc={nc}, cnonce="{cnonce}", '
+        f'qop=auth, method=GET, uri="/", response="{response}"'
+    )
+    return HTTPAuthorizationCredentials(scheme="Digest", credentials=header)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = UserCache(max_entries=2, ttl=60)
+    cache.put(cached("a"))
+    cache.put(cached("b"))
+    cache.get("a")
+    cache.put(cached("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.services.user_cache.time.monotonic", lambda: now[0])
+    cache = UserCache(ttl=60)
+    cache.put(cached("a"))
+
+    now[0] += 59
+    assert cache.get("a") is not None
+    now[0] += 1
+    assert cache.get("a") is None
+
+
+async def test_verify_digest_auth_hits_database_once(monkeypatch):
+    lookups = []
+
+    async def get_user_by_username(db, username):
+        lookups.append(username)
+        return SimpleNamespace(id=7, username=username, password="secret", is_admin=True)
+
+    monkeypatch.setattr(user_service, "get_user_by_username", get_user_by_username)
+    user_cache.invalidate()
+
+    nonce = await security.generate_nonce()
+    for nc in ("00000001", "00000002"):
+        user = await security.verify_digest_auth(digest_credentials("admin", "secret", nonce, nc=nc), db=None)
+        assert user.id == 7 and user.is_admin
+
+    assert await security.verify_digest_auth(digest_credentials("admin", "wrong", nonce, nc="00000003"), db=None) is None
+    assert lookups == ["admin"]
+    user_cache.invalidate()
+
+
+def test_orm_changes_invalidate_user():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    user_cache.invalidate()
+    with Session(engine) as db:
+        db.add(User(username="admin", password="old"))
+        db.commit()
+        user_cache.put(cached("admin"))
+
+        user = db.query(User).one()
+        user.username = "root"
+        db.commit()
+        assert user_cache.get("admin") is None
+
+        user_cache.put(cached("root"))
+        db.delete(user)
+        db.commit()
+        assert user_cache.get("root") is None
+
+
+def test_listener_applies_notifications():
+    cache = UserCache()
+    cache.put(cached("a"))
+    cache.put(cached("b"))
+    listener = UserChangeListener(engine=None, cache=cache)
+
+    listener.dispatch("a")
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+    # An empty payload drops everything
+    listener.dispatch("")
+    assert cache.get("b") is None
@@ -0,0 +1,104 @@
+from app import worker as worker_module
+from app.worker import CollectionWorker, plan_shard, shard_target
+
+APPLIANCES = [f"fw{i}" for i in range(7)]
+
+
+class FakeLocks:
+    """Advisory locks shared by the workers of one test."""
+
+    def __init__(self, held, owner):
+        self.held = held
+        self.owner = owner
+
+    def try_claim(self, name):
+        if self.held.get(name, self.owner) != self.owner:
+            return False
+        self.held[name] = self.owner
+        return True
+
+    def release(self, name):
+        if self.held.get(name) == self.owner:
+            del self.held[name]
+
+    def reset(self):
+        for name in [n for n, owner in self.held.items() if owner == self.owner]:
+            del self.held[name]
+
+
+class FakeSessions:
+    async def release(self, appliance):
+        pass
+
+
+def make_workers(monkeypatch, count):
+    async def fake_refresh(sessions):
+        return [""] + APPLIANCES
+
+    monkeypatch.setattr(worker_module, "refresh_appliances", fake_refresh)
+    monkeypatch.setattr(worker_module.settings, "SONICWALL_POLL_ENABLED", False)
+    monkeypatch.setattr(worker_module.settings, "LOG_COLLECTION_ENABLED", False)
+    held, live = {}, []
+    workers = []
+    for i in range(count):
+        worker = CollectionWorker(None, FakeSessions(), worker_id=f"worker-{i}")
+        worker.locks = FakeLocks(held, worker.worker_id)
+        worker._heartbeat = lambda: len(live)
+        workers.append(worker)
+    return workers, live, held
+
+
+def test_shard_target_spreads_evenly():
+    assert shard_target(40, 3) == 14
+    assert shard_target(7, 0) == 7
+    assert shard_target(0, 2) == 0
+
+
+def test_plan_releases_unregistered_and_surplus():
+    release, candidates = plan_shard("w", ["gone", "a", "b", "c"], ["a", "b", "c", "d"], 2)
+    assert release[0] == "gone"
+    assert len(release) == 2
+    assert candidates == ["d"]
+
+
+async def test_workers_share_appliances_without_overlap(monkeypatch):
+    (first, second), live, held = make_workers(monkeypatch, 2)
+
+    live.append(first)
+    await first.rebalance()
+    assert first.appliances == sorted(APPLIANCES)
+
+    # A second worker joins: the first gives up its surplus, the second claims it
+    live.append(second)
+    await second.rebalance()
+    await first.rebalance()
+    await second.rebalance()
+    assert len(first.appliances) == 4 and len(second.appliances) == 3
+    assert set(first.appliances) | set(second.appliances) == set(APPLIANCES)
+    assert not set(first.appliances) & set(second.appliances)
+
+    # The first worker dies: its connection (and locks) go away
+    live.remove(first)
+    first.locks.reset()
+    await second.rebalance()
+    assert second.appliances == sorted(APPLIANCES)
+
+
+def test_heartbeat_registers_worker(tmp_path):
+    from sqlalchemy import create_engine, select
+    from app.models.collection_worker import CollectionWorker as CollectionWorkerRow
+
+    # A file, so the lock connection and the checks below are separate connections
+    engine = create_engine(f"sqlite:///{tmp_path / 'workers.db'}")
+    worker = CollectionWorker(engine, FakeSessions(), worker_id="worker-0")
+    worker._create_tables()
+    worker._create_tables()  # restarts find the tables in place
+
+    assert worker._heartbeat() == 1
+    assert worker._heartbeat() == 1
+    with engine.connect() as conn:
+        assert conn.execute(select(CollectionWorkerRow.worker_id)).scalars().all() == ["worker-0"]
+
+    worker._deregister()
+    with engine.connect() as conn:
+        assert conn.execute(select(CollectionWorkerRow.worker_id)).scalars().all() == []